@@ -0,0 +1,44 @@
+## BENCHMARK DEL MOTOR DE REGLAS DE CALIDAD
+# Compara los controles del notebook ETL hechos por separado (conteo de "SD" por columna, tipos de "Hora",
+# coordenadas faltantes, categorías de "Víctima" e Id duplicados, cada uno con su propia pasada) contra
+# calidad.validar con las reglas de calidad.REGLAS, evaluadas en una sola pasada por partición de 1_000_000
+# de filas (las particiones se repiten para llegar al tamaño pedido).
+# Uso: python benchmarks/bench_calidad.py [filas ...]   (por defecto 1_000_000 y 10_000_000)
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import sinteticos
+import calidad
+
+PARTICION = 1_000_000
+
+
+def controles_por_separado(df):
+    # Una pasada por cada control, como en las celdas del notebook
+    {c: (df[c] == "SD").sum() for c in df.columns}
+    df["Hora"].map(type).value_counts()
+    ((df["Pos x"] == 0) | (df["Pos y"] == 0)).sum()
+    df["Víctima"].unique()
+    df["Id"].duplicated().sum()
+
+
+def medir(funcion, *args):
+    inicio = time.perf_counter()
+    funcion(*args)
+    return time.perf_counter() - inicio
+
+
+def main(tamaños):
+    base = sinteticos.generar_homicidios(PARTICION)
+    print(f"{'filas':>12} {'controles por separado (s)':>27} {'validar (s)':>12} {'reglas':>7}")
+    for n in tamaños:
+        particiones = [base.iloc[:min(PARTICION, n - i)] for i in range(0, n, PARTICION)]
+        separado = sum(medir(controles_por_separado, p) for p in particiones)
+        fusionado = medir(calidad.validar, particiones)
+        print(f"{n:>12,} {separado:>27.2f} {fusionado:>12.2f} {len(calidad.REGLAS):>7}")
+
+
+if __name__ == "__main__":
+    main([int(x) for x in sys.argv[1:]] or [1_000_000, 10_000_000])
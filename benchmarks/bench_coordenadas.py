@@ -0,0 +1,91 @@
+## BENCHMARK DE LA LECTURA DE "XY (CABA)" Y LA CONVERSIÓN DE COORDENADAS
+# Compara leer los puntos WKT fila por fila con una expresión regular contra espacial.separar_wkt,
+# y mide la conversión en bloque entre coordenadas de CABA y lon/lat con su verificación.
+# Uso: python benchmarks/bench_coordenadas.py [filas ...]   (por defecto 1_000_000 y 10_000_000)
+import os
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import espacial
+
+# Por encima de este tamaño la versión original se estima a partir de una muestra
+FILAS_MAX_ORIGINAL = 1_000_000
+
+
+def generar_puntos(n, semilla=0):
+    '''
+    Genera una columna "XY (CABA)" con puntos WKT dentro de CABA y centinelas del ETL.
+
+    Parámetros:
+        n (int): Cantidad de filas.
+        semilla (int): Semilla del generador aleatorio.
+
+    Retorna:
+        tuple: La columna de texto y los arreglos (x, y) originales (NaN en los centinelas).
+    '''
+    rng = np.random.default_rng(semilla)
+    x = np.round(rng.uniform(93000, 110000, n), 8)
+    y = np.round(rng.uniform(91000, 110000, n), 8)
+    faltantes = rng.random(n) < 0.02
+    x[faltantes], y[faltantes] = np.nan, np.nan
+    texto = pc.binary_join_element_wise("Point (", pc.cast(pa.array(x), pa.string()), " ",
+                                        pc.cast(pa.array(y), pa.string()), ")", "")
+    serie = pd.Series(texto.to_numpy(zero_copy_only=False), dtype=object)
+    serie[faltantes] = "Point (. .)"
+    return serie, x, y
+
+
+def por_fila(serie):
+    # Lectura original: una expresión regular por fila en Python
+    patron = re.compile(r"Point \((\S+) (\S+)\)")
+    x, y = [], []
+    for valor in serie:
+        coincidencia = patron.match(valor) if isinstance(valor, str) else None
+        try:
+            x.append(float(coincidencia.group(1)))
+            y.append(float(coincidencia.group(2)))
+        except (AttributeError, ValueError):
+            x.append(np.nan)
+            y.append(np.nan)
+    return np.array(x), np.array(y)
+
+
+def medir(funcion, *args):
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    return time.perf_counter() - inicio, resultado
+
+
+def main(tamaños):
+    print(f"{'filas':>12} {'por fila (s)':>13} {'vectorizada (s)':>16} {'aceleración':>12} {'ida y vuelta (s)':>17}")
+    for n in tamaños:
+        serie, x, y = generar_puntos(n)
+        t_nuevo, (px, py) = medir(espacial.separar_wkt, serie)
+        assert np.array_equal(px, x, equal_nan=True) and np.array_equal(py, y, equal_nan=True)
+
+        muestra = serie if n <= FILAS_MAX_ORIGINAL else serie.iloc[:FILAS_MAX_ORIGINAL]
+        t_original, _ = medir(por_fila, muestra)
+        nota = ""
+        if n > FILAS_MAX_ORIGINAL:
+            t_original, nota = t_original * n / FILAS_MAX_ORIGINAL, " (estimado)"
+
+        # CABA -> lon/lat -> CABA y verificación de la distancia entre ambas
+        inicio = time.perf_counter()
+        lon, lat = espacial.caba_a_lonlat(px, py)
+        df = pd.DataFrame({"X (CABA)": px, "Y (CABA)": py, "Pos x": lon, "Pos y": lat})
+        verificacion = espacial.validar_coordenadas(df, tolerancia=0.01)
+        t_vuelta = time.perf_counter() - inicio
+        assert verificacion["Consistente"].dropna().all()
+
+        print(f"{n:>12,} {t_original:>13.2f} {t_nuevo:>16.2f} {t_original / t_nuevo:>11.0f}x {t_vuelta:>17.2f}{nota}")
+
+
+if __name__ == "__main__":
+    main([int(x) for x in sys.argv[1:]] or [1_000_000, 10_000_000])
@@ -0,0 +1,81 @@
+## BENCHMARK DE LA DETECCIÓN DE DUPLICADOS
+# Compara df.duplicated + sort_values (ver_duplicados original) contra duplicados.grupos_duplicados en memoria,
+# y mide duplicados.duplicados_por_bloques sobre bloques generados sin tener la tabla completa en memoria.
+# Uso: python benchmarks/bench_duplicados.py [filas ...]   (por defecto 1_000_000 y 10_000_000)
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import duplicados
+
+# Filas por bloque del modo por bloques
+TAMAÑO_BLOQUE = 1_000_000
+
+
+def generar_ids(n, semilla=0, inicio=0):
+    '''
+    Genera una columna "Id" con el formato "AAAA-NNNNNN" y alrededor de un 1% de repetidos.
+
+    Parámetros:
+        n (int): Cantidad de filas.
+        semilla (int): Semilla del generador aleatorio.
+        inicio (int): Primer número de Id (para generar bloques consecutivos).
+
+    Retorna:
+        pandas.DataFrame: La columna "Id".
+    '''
+    rng = np.random.default_rng(semilla)
+    numeros = np.arange(inicio, inicio + n)
+    repetidos = rng.random(n) < 0.01
+    numeros[repetidos] = rng.integers(0, inicio + n, repetidos.sum())
+    ids = pd.Series(2000 + numeros // 1_000_000).astype(str) + "-" + pd.Series(numeros % 1_000_000).astype(str).str.zfill(6)
+    return pd.DataFrame({"Id": ids})
+
+
+def bloques(n, semilla=0):
+    for numero, inicio in enumerate(range(0, n, TAMAÑO_BLOQUE)):
+        yield generar_ids(min(TAMAÑO_BLOQUE, n - inicio), semilla + numero, inicio)
+
+
+def original(df):
+    duplicated_rows = df[df.duplicated(subset="Id", keep=False)]
+    return duplicated_rows.sort_values(by="Id")
+
+
+def medir(funcion, *args):
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    return time.perf_counter() - inicio, resultado
+
+
+def verificar_nulos():
+    # Las filas con clave nula no forman un grupo de duplicados, ni en memoria ni por bloques
+    df = pd.DataFrame({"Id": ["2016-0001", None, "2016-0002", None, "2016-0001", np.nan],
+                       "Fecha": ["a", "b", "c", "b", "a", "b"]})
+    for columnas in ("Id", ["Id", "Fecha"]):
+        esperado = duplicados.grupos_duplicados(df, columnas)
+        encontrado = duplicados.duplicados_por_bloques([df.iloc[:3], df.iloc[3:]], columnas)
+        assert list(esperado.index) == [0, 4]
+        assert sorted(encontrado["fila"]) == [0, 4] and set(encontrado["tamaño_grupo"]) == {2}
+
+
+def main(tamaños):
+    verificar_nulos()
+    print(f"{'filas':>12} {'original (s)':>13} {'factorizado (s)':>15} {'por bloques (s)':>16} {'filas/s bloques':>16}")
+    for n in tamaños:
+        df = pd.concat(bloques(n), ignore_index=True)
+        t_original, esperado = medir(original, df)
+        t_nuevo, encontrado = medir(duplicados.grupos_duplicados, df, "Id")
+        assert set(esperado.index) == set(encontrado.index)
+        del df, esperado, encontrado
+
+        t_bloques, resultado = medir(duplicados.duplicados_por_bloques, bloques(n), "Id")
+        print(f"{n:>12,} {t_original:>13.2f} {t_nuevo:>15.2f} {t_bloques:>16.2f} {n / t_bloques:>16,.0f}")
+
+
+if __name__ == "__main__":
+    main([int(x) for x in sys.argv[1:]] or [1_000_000, 10_000_000])
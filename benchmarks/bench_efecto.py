@@ -0,0 +1,68 @@
+## BENCHMARK DEL TAMAÑO DEL EFECTO POR GRUPOS
+# Compara el cálculo por año de tools.cohen_por_año (una máscara por año) contra efecto.cohen_por_grupo,
+# y mide el bootstrap con 10.000 remuestreos sobre todos los grupos.
+# Uso: python benchmarks/bench_efecto.py [filas ...]   (por defecto 100_000 y 10_000_000)
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import efecto
+from tools import cohen
+
+REMUESTREOS = 10_000
+
+
+def generar_victimas(n, semilla=0, grupos=50):
+    '''
+    Genera víctimas sintéticas con año, comuna, sexo y edad.
+
+    Parámetros:
+        n (int): Cantidad de filas.
+        semilla (int): Semilla del generador aleatorio.
+        grupos (int): Cantidad de años distintos.
+
+    Retorna:
+        pandas.DataFrame: Las columnas "Año", "Comuna", "Sexo" y "Edad".
+    '''
+    rng = np.random.default_rng(semilla)
+    sexo = np.where(rng.random(n) < 0.77, "MASCULINO", "FEMENINO")
+    edad = np.clip(rng.normal(42, 19, n) + np.where(sexo == "FEMENINO", 8, 0), 1, 95).astype(int)
+    return pd.DataFrame({"Año": 2000 + rng.integers(0, grupos, n), "Comuna": rng.integers(1, 16, n),
+                         "Sexo": sexo, "Edad": edad})
+
+
+def por_mascaras(df):
+    # Lógica original de cohen_por_año, sin el gráfico
+    años_unicos = df["Año"].unique()
+    cohen_lista = []
+    for a in años_unicos:
+        grupo1 = df[((df["Sexo"] == 'MASCULINO') & (df["Año"] == a))]["Edad"]
+        grupo2 = df[((df["Sexo"] == 'FEMENINO') & (df["Año"] == a))]["Edad"]
+        cohen_lista.append(cohen(grupo1, grupo2))
+    return pd.Series(cohen_lista, index=años_unicos).sort_index()
+
+
+def medir(funcion, *args, **kwargs):
+    inicio = time.perf_counter()
+    resultado = funcion(*args, **kwargs)
+    return time.perf_counter() - inicio, resultado
+
+
+def main(tamaños):
+    print(f"{'filas':>12} {'máscaras (s)':>13} {'agrupado (s)':>13} {'aceleración':>12} {'bootstrap (s)':>14}")
+    for n in tamaños:
+        df = generar_victimas(n)
+        t_original, original = medir(por_mascaras, df)
+        t_nuevo, nuevo = medir(efecto.cohen_por_grupo, df)
+        assert np.allclose(original.to_numpy(), nuevo["Estadistico de Cohen"].to_numpy(), equal_nan=True)
+
+        t_bootstrap, _ = medir(efecto.cohen_por_grupo, df, remuestreos=REMUESTREOS)
+        print(f"{n:>12,} {t_original:>13.3f} {t_nuevo:>13.3f} {t_original / t_nuevo:>11.0f}x {t_bootstrap:>14.2f}")
+
+
+if __name__ == "__main__":
+    main([int(x) for x in sys.argv[1:]] or [100_000, 10_000_000])
@@ -0,0 +1,60 @@
+## BENCHMARK DEL MODO RÁPIDO DE LOS GRÁFICOS
+# Compara los gráficos de tools.graficos que calculan estadísticas sobre las filas (histograma con densidad,
+# cajas y barras con intervalos por bootstrap) dibujados con seaborn, con el modo rápido desde el DataFrame
+# (una pasada de conteo por edad) y con el modo rápido desde un cubo con la dimensión "Edad" (solo agregados;
+# la construcción del cubo se informa aparte). Los demás gráficos ya reciben datos agregados.
+# Uso: python benchmarks/bench_graficos_rapidos.py [filas ...]   (por defecto 10_000 y 1_000_000)
+import contextlib
+import io
+import os
+import sys
+import time
+import warnings
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import sinteticos
+import cubo
+import graficos_rapidos
+import tools
+
+GRAFICOS = ["distribucion_edad", "distribucion_edad_por_anio", "accidentes_por_anio_y_sexo",
+            "edad_y_rol_victimas", "distribucion_edad_por_victima"]
+
+# Cuboides base con la dimensión "Edad" que cubren las consultas de GRAFICOS
+CUBOIDES = [["Año", "Sexo", "Edad"], ["Rol", "Edad"], ["Víctima", "Edad"]]
+
+
+def medir(funcion, *args, **kwargs):
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        funcion(*args, **kwargs)
+    plt.close("all")
+    return time.perf_counter() - inicio
+
+
+def main(tamaños):
+    warnings.simplefilter("ignore")
+    print(f"{'filas':>11} {'gráfico':>30} {'seaborn (s)':>12} {'rápido (s)':>11} {'desde cubo (s)':>15}")
+    for n in tamaños:
+        df = sinteticos.generar_homicidios(n)
+        inicio = time.perf_counter()
+        cubo_edad = cubo.CuboAgregado.desde_dataframe(df, cuboides=CUBOIDES)
+        construccion = time.perf_counter() - inicio
+        for nombre in GRAFICOS:
+            funcion = getattr(tools, nombre)
+            graficos_rapidos.desactivar()
+            lento = medir(funcion, df)
+            graficos_rapidos.activar()
+            rapido = medir(funcion, df)
+            desde_cubo = medir(funcion, None, cubo=cubo_edad)
+            print(f"{n:>11,} {nombre:>30} {lento:>12.2f} {rapido:>11.2f} {desde_cubo:>15.2f}")
+        graficos_rapidos.desactivar()
+        print(f"{n:>11,} {'(construcción del cubo)':>30} {'':>12} {'':>11} {construccion:>15.2f}")
+
+
+if __name__ == "__main__":
+    main([int(x) for x in sys.argv[1:]] or [10_000, 1_000_000])
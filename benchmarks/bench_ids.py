@@ -0,0 +1,46 @@
+## BENCHMARK DEL ID EMPAQUETADO EN UN ENTERO
+# Compara la unión de VICTIMAS con HECHOS (merge por el texto del Id y sort_values, como hacía el pipeline,
+# contra el merge join ordenado de ids.unir_por_id) y la búsqueda de duplicados por Id (factorizando el
+# texto contra factorizando el código entero), y mide el costo de codificar y decodificar los Id.
+# Uso: python benchmarks/bench_ids.py [filas ...]   (por defecto 100_000 y 1_000_000)
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import numpy as np
+import sinteticos
+import duplicados
+import ids
+
+
+def medir(funcion, *args):
+    inicio = time.perf_counter()
+    funcion(*args)
+    return time.perf_counter() - inicio
+
+
+def main(tamaños):
+    print(f"{'filas':>10} {'operación':>12} {'texto (s)':>10} {'entero (s)':>11}")
+    for n in tamaños:
+        df = sinteticos.generar_homicidios(n)
+        hechos = df[["Id", "Comuna", "Tipo de calle", "Hora"]].drop_duplicates("Id")
+        victimas = df[["Id", "Rol", "Sexo", "Edad"]].sample(frac=1, random_state=0)
+        # Sin el Id como texto, grupos_duplicados factoriza el texto (así se comportaba antes)
+        texto = df.assign(Id=df["Id"].where(np.arange(len(df)) > 0, "SD"))
+        codigos = ids.codificar(df["Id"])
+        filas = {
+            "unión": (medir(lambda: victimas.merge(hechos, on="Id", how="left")
+                            .sort_values("Id", kind="stable", ignore_index=True)),
+                      medir(ids.unir_por_id, victimas, hechos)),
+            "duplicados": (medir(duplicados.grupos_duplicados, texto, "Id"),
+                           medir(duplicados.grupos_duplicados, df, "Id")),
+            "codificar": (float("nan"), medir(ids.codificar, df["Id"])),
+            "decodificar": (float("nan"), medir(ids.decodificar, codigos)),
+        }
+        for nombre, (con_texto, con_entero) in filas.items():
+            print(f"{n:>10,} {nombre:>12} {con_texto:>10.3f} {con_entero:>11.3f}")
+
+
+if __name__ == "__main__":
+    main([int(x) for x in sys.argv[1:]] or [100_000, 1_000_000])
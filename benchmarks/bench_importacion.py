@@ -0,0 +1,67 @@
+## BENCHMARK DEL TIEMPO DE IMPORTACIÓN DE tools
+# Mide, en procesos nuevos, cuánto cuesta importar tools y usar sus funciones del ETL frente a usar un
+# gráfico, y verifica el presupuesto: el camino del ETL no debe cargar matplotlib ni seaborn y debe
+# quedar por debajo de PRESUPUESTO segundos.
+# Uso: python benchmarks/bench_importacion.py [presupuesto en segundos]   (por defecto 1.0)
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Tiempo máximo (mediana) para importar tools y acceder a las funciones del ETL
+PRESUPUESTO = 1.0
+
+# Repeticiones de cada escenario (se informa la mediana)
+REPETICIONES = 5
+
+ESCENARIOS = {
+    "import tools": "import tools",
+    "ETL": "import tools; tools.convertir_a_time; tools.imputa_valor_frecuente; tools.ver_duplicados",
+    "estadística": "import tools; tools.cohen",
+    "gráficos": "import tools; tools.distribucion_edad",
+}
+
+# Programa que ejecuta cada proceso: mide el escenario e informa qué librerías de gráficos quedaron cargadas
+PROGRAMA = '''
+import sys, time
+inicio = time.perf_counter()
+{codigo}
+print(time.perf_counter() - inicio, "matplotlib" in sys.modules, "seaborn" in sys.modules)
+'''
+
+
+def medir(codigo):
+    '''
+    Ejecuta un escenario en procesos nuevos de Python.
+
+    Parámetros:
+        codigo (str): El código a medir.
+
+    Retorna:
+        tuple: La mediana de los segundos y si se cargaron matplotlib y seaborn.
+    '''
+    tiempos = []
+    for _ in range(REPETICIONES):
+        salida = subprocess.run([sys.executable, "-c", PROGRAMA.format(codigo=codigo)], cwd=RAIZ,
+                                capture_output=True, text=True, check=True).stdout.split()
+        tiempos.append(float(salida[0]))
+    return sorted(tiempos)[len(tiempos) // 2], salida[1] == "True", salida[2] == "True"
+
+
+def main(presupuesto):
+    print(f"{'escenario':>12} {'segundos':>9} {'matplotlib':>11} {'seaborn':>8}")
+    resultados = {}
+    for nombre, codigo in ESCENARIOS.items():
+        resultados[nombre] = medir(codigo)
+        segundos, con_matplotlib, con_seaborn = resultados[nombre]
+        print(f"{nombre:>12} {segundos:>9.3f} {str(con_matplotlib):>11} {str(con_seaborn):>8}")
+
+    segundos, con_matplotlib, con_seaborn = resultados["ETL"]
+    assert not (con_matplotlib or con_seaborn), "Las funciones del ETL cargaron las librerías de gráficos"
+    assert segundos <= presupuesto, f"El ETL tardó {segundos:.3f} s en importar (presupuesto: {presupuesto} s)"
+    print(f"Presupuesto cumplido: {segundos:.3f} s <= {presupuesto} s")
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else PRESUPUESTO)
@@ -0,0 +1,78 @@
+## BENCHMARK DEL MOTOR DE IMPUTACIÓN
+# Compara la imputación fila por fila original (df.apply con axis=1) contra imputacion.imputar.
+# Uso: python benchmarks/bench_imputacion.py [filas ...]   (por defecto 1_000_000 y 10_000_000)
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from imputacion import imputar
+
+# Por encima de este tamaño la versión original se estima a partir de una muestra
+FILAS_MAX_ORIGINAL = 1_000_000
+
+
+def generar_victimas(n, semilla=0):
+    '''
+    Genera un DataFrame sintético de víctimas con centinelas "SD" en Sexo, Rol, Víctima y Edad.
+
+    Parámetros:
+        n (int): Cantidad de filas.
+        semilla (int): Semilla del generador aleatorio.
+
+    Retorna:
+        pandas.DataFrame: Un DataFrame con las columnas "Sexo", "Rol", "Víctima" y "Edad".
+    '''
+    rng = np.random.default_rng(semilla)
+    sexo = rng.choice(["MASCULINO", "FEMENINO", "SD"], size=n, p=[0.76, 0.23, 0.01])
+    rol = rng.choice(["CONDUCTOR", "PEATON", "PASAJERO_ACOMPAÑANTE", "CICLISTA", "SD"],
+                     size=n, p=[0.46, 0.37, 0.13, 0.03, 0.01])
+    victima = rng.choice(["MOTO", "PEATON", "AUTO", "BICICLETA", "SD"], size=n, p=[0.42, 0.37, 0.14, 0.06, 0.01])
+    edad = rng.integers(1, 96, size=n).astype(object)
+    edad[rng.random(n) < 0.07] = "SD"
+    return pd.DataFrame({"Sexo": sexo, "Rol": rol, "Víctima": victima, "Edad": edad})
+
+
+def imputacion_original(df):
+    # Réplica de la implementación fila por fila que reemplazó el motor de imputación
+    for columna in ["Sexo", "Rol", "Víctima"]:
+        df[columna] = df[columna].replace("SD", pd.NA)
+        df[columna] = df[columna].fillna(df[columna].mode().iloc[0])
+    df["Edad"] = df["Edad"].replace("SD", pd.NA)
+    promedio_por_genero = df.groupby("Sexo")["Edad"].mean()
+    df["Edad"] = df.apply(lambda row: promedio_por_genero[row["Sexo"]] if pd.isna(row["Edad"]) else row["Edad"], axis=1)
+    df["Edad"] = df["Edad"].astype(int)
+
+
+def imputacion_vectorizada(df):
+    imputar(df, {"Sexo": "moda", "Rol": "moda", "Víctima": "moda", "Edad": ("media", "Sexo")})
+    df["Edad"] = df["Edad"].astype(int)
+
+
+def medir(funcion, df):
+    inicio = time.perf_counter()
+    funcion(df)
+    return time.perf_counter() - inicio
+
+
+def main(tamaños):
+    print(f"{'filas':>12} {'original (s)':>14} {'vectorizada (s)':>16} {'aceleración':>12}")
+    for n in tamaños:
+        base = generar_victimas(n)
+        t_nuevo = medir(imputacion_vectorizada, base.copy())
+
+        if n <= FILAS_MAX_ORIGINAL:
+            t_original, nota = medir(imputacion_original, base.copy()), ""
+        else:
+            # La versión original escala linealmente, así que extrapolamos desde una muestra
+            t_original = medir(imputacion_original, base.iloc[:FILAS_MAX_ORIGINAL].copy()) * n / FILAS_MAX_ORIGINAL
+            nota = " (estimado)"
+
+        print(f"{n:>12,} {t_original:>14.2f} {t_nuevo:>16.3f} {t_original / t_nuevo:>11.0f}x{nota}")
+
+
+if __name__ == "__main__":
+    main([int(x) for x in sys.argv[1:]] or [1_000_000, 10_000_000])
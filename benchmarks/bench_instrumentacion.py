@@ -0,0 +1,46 @@
+## BENCHMARK DEL COSTO DE LA INSTRUMENTACIÓN
+# Mide una función barata que se llama muchas veces (convertir_a_time aplicada valor por valor)
+# y una de una sola llamada sobre todo el DataFrame (ver_duplicados), sin instrumentación, instrumentada
+# sin medir memoria e instrumentada con tracemalloc, y verifica que al desactivarla tools vuelva a exponer
+# las funciones originales (costo nulo).
+# Uso: python benchmarks/bench_instrumentacion.py [filas ...]   (por defecto 10_000 y 100_000)
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import sinteticos
+import instrumentacion
+import tools
+
+
+def medir(funcion, *args):
+    inicio = time.perf_counter()
+    funcion(*args)
+    return time.perf_counter() - inicio
+
+
+def escenarios(df, horas):
+    return {"convertir_a_time": medir(lambda: horas.map(tools.convertir_a_time)),
+            "ver_duplicados": medir(tools.ver_duplicados, df, "Id")}
+
+
+def main(tamaños):
+    originales = {nombre: getattr(tools, nombre) for nombre in ("convertir_a_time", "ver_duplicados")}
+    print(f"{'filas':>10} {'función':>17} {'sin instrumentar (s)':>21} {'instrumentada (s)':>18} {'con memoria (s)':>16}")
+    for n in tamaños:
+        df = sinteticos.generar_homicidios(n)
+        horas = df["Hora"]
+        sin = escenarios(df, horas)
+        instrumentacion.activar(memoria=False)
+        con = escenarios(df, horas)
+        instrumentacion.activar(memoria=True)
+        con_memoria = escenarios(df, horas)
+        instrumentacion.desactivar()
+        assert all(getattr(tools, nombre) is funcion for nombre, funcion in originales.items())
+        for nombre in sin:
+            print(f"{n:>10,} {nombre:>17} {sin[nombre]:>21.3f} {con[nombre]:>18.3f} {con_memoria[nombre]:>16.3f}")
+
+
+if __name__ == "__main__":
+    main([int(x) for x in sys.argv[1:]] or [10_000, 100_000])
@@ -0,0 +1,79 @@
+## BENCHMARK DE LOS MOTORES DEL CUBO SOBRE EL DATASET PARTICIONADO
+# Compara cargar el dataset completo en pandas y agrupar (lo que hacen los gráficos con df) contra construir
+# el cubo desde el Parquet con los motores "pandas" (por lotes, un núcleo) y "arrow" (Acero, en paralelo).
+# Cada escenario corre en un proceso nuevo para medir su memoria máxima (RSS), que incluye los buffers de
+# Arrow (pico de VmHWM, solo Linux); las consultas de los gráficos se resuelven luego desde el cubo.
+# Uso: python benchmarks/bench_motores.py [filas ...]   (por defecto 1_000_000 y 5_000_000)
+import os
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import sinteticos
+import esquema
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Agrupaciones de accidentes_mensuales, victimas_por_dia_semana y victimas_sexo_rol_victima
+CONSULTAS = [["Año", "Mes"], ["Día semana"], ["Sexo"], ["Rol", "Sexo"], ["Víctima", "Sexo"]]
+
+# Cuboides base que cubren esas consultas (ver cubo.CUBOIDES)
+CUBOIDES = [["Año", "Mes"], ["Día semana"], ["Sexo", "Rol", "Víctima"]]
+DIMENSIONES = list(dict.fromkeys(sum(CONSULTAS, [])))
+
+ESCENARIOS = {
+    "pandas en memoria": '''
+df = tools.cargar_homicidios(ruta, DIMENSIONES + ["Cantidad víctimas"])
+resultados = [df.groupby(c, observed=True)["Cantidad víctimas"].sum() for c in CONSULTAS]''',
+    "cubo (pandas)": '''
+c = cubo.CuboAgregado.desde_parquet(ruta, motor="pandas", cuboides=CUBOIDES)
+resultados = [c.consultar(d, "Cantidad víctimas") for d in CONSULTAS]''',
+    "cubo (arrow)": '''
+c = cubo.CuboAgregado.desde_parquet(ruta, motor="arrow", cuboides=CUBOIDES)
+resultados = [c.consultar(d, "Cantidad víctimas") for d in CONSULTAS]''',
+}
+
+PROGRAMA = '''
+import time
+import cubo, tools
+ruta, CONSULTAS, DIMENSIONES, CUBOIDES = {ruta!r}, {consultas!r}, {dimensiones!r}, {cuboides!r}
+inicio = time.perf_counter()
+{codigo}
+segundos = time.perf_counter() - inicio
+# VmHWM es el pico de memoria residente de este proceso (ru_maxrss se hereda del proceso padre)
+with open("/proc/self/status") as estado:
+    pico = next(int(linea.split()[1]) for linea in estado if linea.startswith("VmHWM"))
+print(segundos, pico / 1024)
+'''
+
+
+def medir(codigo, ruta):
+    '''
+    Ejecuta un escenario en un proceso nuevo de Python.
+
+    Retorna:
+        tuple: Los segundos y la memoria máxima del proceso en MB.
+    '''
+    programa = PROGRAMA.format(ruta=ruta, consultas=CONSULTAS, dimensiones=DIMENSIONES,
+                              cuboides=CUBOIDES, codigo=codigo)
+    salida = subprocess.run([sys.executable, "-c", programa], cwd=RAIZ, capture_output=True, text=True,
+                            check=True).stdout.split()
+    return float(salida[0]), float(salida[1])
+
+
+def main(tamaños):
+    print(f"{'filas':>11} {'escenario':>18} {'segundos':>9} {'memoria máx. (MB)':>18}")
+    for n in tamaños:
+        with tempfile.TemporaryDirectory() as temporal:
+            ruta = os.path.join(temporal, "homicidios.parquet")
+            # Escribimos por bloques para no tener en memoria el dataset entero y su tabla de Arrow
+            bloques = (sinteticos.generar_homicidios(min(1_000_000, n - i), semilla=i) for i in range(0, n, 1_000_000))
+            esquema.escribir_parquet(bloques, ruta)
+            for nombre, codigo in ESCENARIOS.items():
+                segundos, memoria = medir(codigo, ruta)
+                print(f"{n:>11,} {nombre:>18} {segundos:>9.2f} {memoria:>18.0f}")
+
+
+if __name__ == "__main__":
+    main([int(x) for x in sys.argv[1:]] or [1_000_000, 5_000_000])
@@ -0,0 +1,62 @@
+## BENCHMARK DEL PERFILADO DE COLUMNAS
+# Compara la versión original de ver_tipo_datos (apply(type) por columna) contra perfilado.perfilar
+# en frío, con caché y en modo muestreado, sobre la hoja HECHOS replicada.
+# Uso: python benchmarks/bench_perfilado.py [repeticiones ...]   (por defecto 1_000 y 5_000)
+import os
+import sys
+import time
+
+import pandas as pd
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, RAIZ)
+import perfilado
+
+
+def ver_tipo_datos_original(df):
+    # Lógica original: tres pasadas separadas por columna y apply(type) fila por fila
+    my_dict = {"nombre_campo": [], "tipo_datos": [], "no_nulos_%": [], "nulos_%": [], "nulos": []}
+    for columna in df.columns:
+        porcentaje_no_nulos = (df[columna].count() / len(df)) * 100
+        my_dict["nombre_campo"].append(columna)
+        my_dict["tipo_datos"].append(df[columna].apply(type).unique())
+        my_dict["no_nulos_%"].append(round(porcentaje_no_nulos, 2))
+        my_dict["nulos_%"].append(round(100 - porcentaje_no_nulos, 2))
+        my_dict["nulos"].append(df[columna].isnull().sum())
+    return pd.DataFrame(my_dict)
+
+
+def medir(funcion, *args, **kwargs):
+    inicio = time.perf_counter()
+    resultado = funcion(*args, **kwargs)
+    return time.perf_counter() - inicio, resultado
+
+
+def verificar_conteo_tipos():
+    # En una columna float los nulos (NaN) son del mismo tipo que los valores: sus conteos se suman
+    columna = pd.Series([1.0, float("nan"), 2.0, 3.0] * 250 + [float("nan")] * 10)
+    assert perfilado.perfilar_columna(columna)["conteo_tipos"] == {float: len(columna)}
+    muestreado = perfilado.perfilar(pd.DataFrame({"x": columna}), muestra=500, usar_cache=False)
+    assert muestreado["conteo_tipos"].iloc[0] == {float: len(columna)}
+
+
+def main(repeticiones):
+    verificar_conteo_tipos()
+    hechos = pd.read_excel(os.path.join(RAIZ, "datasets", "homicidios.xlsx"), sheet_name="HECHOS")
+    print(f"{'filas':>12} {'original (s)':>13} {'frío (s)':>9} {'caché (s)':>10} {'muestra (s)':>12}")
+    for r in repeticiones:
+        df = pd.concat([hechos] * r, ignore_index=True)
+        t_original, original = medir(ver_tipo_datos_original, df)
+        perfilado.limpiar_cache()
+        t_frio, perfil = medir(perfilado.perfilar, df)
+        t_cache, _ = medir(perfilado.perfilar, df)
+        t_muestra, _ = medir(perfilado.perfilar, df, muestra=50_000)
+
+        assert (original["nulos"].to_numpy() == perfil["nulos"].to_numpy()).all()
+        assert all(list(a) == list(b) for a, b in zip(original["tipo_datos"], perfil["tipo_datos"]))
+        assert (perfil["conteo_tipos"].map(lambda c: sum(c.values())) == len(df)).all()
+        print(f"{len(df):>12,} {t_original:>13.2f} {t_frio:>9.2f} {t_cache:>10.2f} {t_muestra:>12.2f}")
+
+
+if __name__ == "__main__":
+    main([int(x) for x in sys.argv[1:]] or [1_000, 5_000])
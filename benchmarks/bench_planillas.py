@@ -0,0 +1,46 @@
+## BENCHMARK DE LA LECTURA DE homicidios.xlsx
+# Compara leer las hojas HECHOS y VICTIMAS con dos llamadas a pd.read_excel (como ETL.ipynb), contra
+# planillas.leer_hojas sin instantáneas (una sola pasada por el libro y escritura de las instantáneas)
+# y con las instantáneas ya guardadas (lectura con memory map, sin abrir el libro).
+# Uso: python benchmarks/bench_planillas.py [repeticiones]   (por defecto 3)
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import pandas as pd
+import planillas
+
+RUTA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "datasets", "homicidios.xlsx")
+HOJAS = ["HECHOS", "VICTIMAS"]
+
+
+def medir(funcion, repeticiones):
+    # El mínimo de varias ejecuciones
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos)
+
+
+def main(repeticiones):
+    with tempfile.TemporaryDirectory() as directorio:
+        def frio():
+            planillas.limpiar(directorio)
+            planillas.leer_hojas(RUTA, HOJAS, directorio)
+
+        escenarios = {
+            "read_excel por hoja": lambda: [pd.read_excel(RUTA, sheet_name=hoja) for hoja in HOJAS],
+            "leer_hojas (frío)": frio,
+            "leer_hojas (caché)": lambda: planillas.leer_hojas(RUTA, HOJAS, directorio),
+        }
+        print(f"{'escenario':>20} {'segundos':>9}")
+        for nombre, funcion in escenarios.items():
+            print(f"{nombre:>20} {medir(funcion, repeticiones):>9.3f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
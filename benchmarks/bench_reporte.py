@@ -0,0 +1,71 @@
+## BENCHMARK DEL REPORTE DEL EDA EN LOTE
+# Compara llamar a las funciones de gráficos de tools una tras otra (seaborn calcula sus estadísticas sobre
+# el DataFrame completo en cada llamada) contra reporte.generar_reporte con uno y con varios procesos.
+# Uso: python benchmarks/bench_reporte.py [filas ...]   (por defecto 717 (los datos reales) y 100_000)
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import reporte
+import tools
+
+RUTA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "datasets", "homicidios_cleaned.csv")
+
+
+def generar_victimas(n, semilla=0):
+    '''
+    Repite las víctimas reales hasta n filas, con edades perturbadas para que no sean copias exactas.
+
+    Parámetros:
+        n (int): Cantidad de filas.
+        semilla (int): Semilla del generador aleatorio.
+
+    Retorna:
+        pandas.DataFrame: Un DataFrame con las columnas de homicidios_cleaned.csv.
+    '''
+    df = pd.read_csv(RUTA)
+    rng = np.random.default_rng(semilla)
+    df = df.iloc[rng.integers(0, len(df), n)].reset_index(drop=True) if n != len(df) else df
+    df["Edad"] = np.clip(df["Edad"] + rng.integers(-2, 3, n), 1, 95)
+    return df
+
+
+def en_serie(df, directorio):
+    # Las funciones originales de tools, guardando cada figura en lugar de mostrarla
+    for nombre in reporte.GRAFICOS:
+        with contextlib.redirect_stdout(io.StringIO()):
+            getattr(tools, nombre)(df)
+        plt.savefig(os.path.join(directorio, f"{nombre}.png"), bbox_inches="tight")
+        plt.close("all")
+
+
+def medir(funcion, *args, **kwargs):
+    inicio = time.perf_counter()
+    resultado = funcion(*args, **kwargs)
+    return time.perf_counter() - inicio, resultado
+
+
+def main(tamaños):
+    print(f"{'filas':>12} {'en serie (s)':>13} {'1 proceso (s)':>14} {'pool (s)':>9} {'más lento (s)':>14} {'procesos':>9}")
+    for n in tamaños:
+        df = generar_victimas(n)
+        with tempfile.TemporaryDirectory() as directorio:
+            t_serie, _ = medir(en_serie, df, directorio)
+            t_uno, _ = medir(reporte.generar_reporte, df, directorio, formatos=("png",), procesos=1)
+            t_pool, resumen = medir(reporte.generar_reporte, df, directorio, formatos=("png",))
+        mas_lento = (resumen["preparacion (s)"] + resumen["dibujo (s)"]).max()
+        print(f"{n:>12,} {t_serie:>13.2f} {t_uno:>14.2f} {t_pool:>9.2f} {mas_lento:>14.2f} {os.cpu_count():>9}")
+
+
+if __name__ == "__main__":
+    main([int(x) for x in sys.argv[1:]] or [717, 100_000])
@@ -0,0 +1,113 @@
+## BENCHMARK DEL WEBSCRAPING DE LA POBLACIÓN
+# Compara recorrer todas las tablas de una página con html.parser (como WEBSCRAPING.ipynb) contra
+# scraping.extraer_tabla, y descargar varias páginas una tras otra contra scraping.descargar, usando
+# un servidor local con demora (sin acceso a internet).
+# Uso: python benchmarks/bench_scraping.py [tablas de relleno ...]   (por defecto 100 y 2_000)
+import asyncio
+import functools
+import http.server
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from html.parser import HTMLParser
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import scraping
+
+RUTA_FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "datasets", "fixtures", "CABA.html")
+
+# Páginas descargadas y demora del servidor por pedido (segundos)
+PAGINAS = 16
+DEMORA = 0.2
+
+
+class _TodasLasTablas(HTMLParser):
+    # Lectura original: interpreta la página completa y junta las celdas de todas las tablas
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tablas, self.celda = [], None
+
+    def handle_starttag(self, etiqueta, atributos):
+        if etiqueta == "table":
+            self.tablas.append([])
+        elif etiqueta == "tr" and self.tablas:
+            self.tablas[-1].append([])
+        elif etiqueta in ("th", "td") and self.tablas and self.tablas[-1]:
+            self.celda = []
+
+    def handle_endtag(self, etiqueta):
+        if etiqueta in ("th", "td") and self.celda is not None:
+            self.tablas[-1][-1].append("".join(self.celda).strip())
+            self.celda = None
+
+    def handle_data(self, datos):
+        if self.celda is not None:
+            self.celda.append(datos)
+
+
+def pagina_grande(tablas):
+    '''
+    Agrega tablas de relleno antes de la tabla buscada en la página guardada.
+
+    Parámetros:
+        tablas (int): Cantidad de tablas de relleno.
+
+    Retorna:
+        str: El HTML de la página.
+    '''
+    with open(RUTA_FIXTURE, encoding="utf-8") as archivo:
+        html = archivo.read()
+    relleno = "".join(f'<table class="wikitable"><tr><th>Dato {i}</th><td>{i}</td><td>{i * 7}</td></tr></table>\n'
+                      for i in range(tablas))
+    return html.replace('<h2>', relleno + '<h2>', 1)
+
+
+def por_tablas(html):
+    lector = _TodasLasTablas()
+    lector.feed(html)
+    return next(tabla for tabla in lector.tablas if tabla and scraping.TITULO_TABLA in tabla[0][0])
+
+
+class _ServidorLento(http.server.SimpleHTTPRequestHandler):
+    def do_GET(self):
+        time.sleep(DEMORA)
+        super().do_GET()
+
+    def log_message(self, *args):
+        pass
+
+
+def medir(funcion, *args):
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    return time.perf_counter() - inicio, resultado
+
+
+def main(tamaños):
+    print(f"{'tablas':>8} {'todas las tablas (s)':>21} {'solo la buscada (s)':>20} {'aceleración':>12}")
+    for n in tamaños:
+        html = pagina_grande(n)
+        t_original, original = medir(por_tablas, html)
+        t_nuevo, nuevo = medir(scraping.extraer_tabla, html)
+        assert original == nuevo
+        print(f"{n:>8,} {t_original:>21.4f} {t_nuevo:>20.4f} {t_original / t_nuevo:>11.0f}x")
+
+    servidor = http.server.ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(
+        _ServidorLento, directory=os.path.dirname(RUTA_FIXTURE)))
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    urls = {f"pagina_{i}": f"http://127.0.0.1:{servidor.server_port}/CABA.html?{i}" for i in range(PAGINAS)}
+
+    t_serie, _ = medir(lambda: [urllib.request.urlopen(url).read() for url in urls.values()])
+    with tempfile.TemporaryDirectory() as cache:
+        t_concurrente, _ = medir(asyncio.run, scraping.descargar(urls, directorio_cache=cache))
+        t_cache, _ = medir(asyncio.run, scraping.descargar(urls, directorio_cache=cache))
+    servidor.shutdown()
+    print(f"{PAGINAS} páginas con {DEMORA} s de demora: en serie {t_serie:.2f} s, concurrente {t_concurrente:.2f} s, "
+          f"revalidando la caché {t_cache:.2f} s")
+
+
+if __name__ == "__main__":
+    main([int(x) for x in sys.argv[1:]] or [100, 2_000])
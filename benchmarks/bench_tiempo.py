@@ -0,0 +1,129 @@
+## BENCHMARK DE LA CONVERSIÓN DE HORAS
+# Compara la conversión original valor por valor (strptime y la cadena de if/elif, antes en tools.etl) +
+# pd.to_datetime(...).apply(...) contra las funciones vectorizadas de tiempo.py, y verifica que
+# tools.convertir_a_time y tools.categoria_momento_dia (que ahora usan tiempo.py) den lo mismo.
+# Uso: python benchmarks/bench_tiempo.py [filas ...]   (por defecto 1_000_000 y 10_000_000)
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import tiempo
+import tools
+
+# Por encima de este tamaño la versión original se estima a partir de una muestra
+FILAS_MAX_ORIGINAL = 1_000_000
+
+
+def generar_horas(n, semilla=0):
+    '''
+    Genera una columna "Hora" con la mezcla de tipos de la hoja HECHOS.
+
+    Parámetros:
+        n (int): Cantidad de filas.
+        semilla (int): Semilla del generador aleatorio.
+
+    Retorna:
+        pandas.Series: Textos "HH:MM:SS", objetos time, datetime y el centinela "SD".
+    '''
+    rng = np.random.default_rng(semilla)
+    segundos = rng.integers(0, 86400, size=n)
+    base = pd.Series(pd.to_timedelta(segundos, unit="s")) + pd.Timestamp("1900-01-01")
+    valores = base.dt.strftime("%H:%M:%S").to_numpy(dtype=object)
+    tipo = rng.random(n)
+    es_time = tipo < 0.12
+    valores[es_time] = base[es_time].dt.time.to_numpy()
+    es_datetime = (tipo >= 0.12) & (tipo < 0.125)
+    valores[es_datetime] = [datetime(1899, 12, 30, t.hour, t.minute, t.second) for t in base[es_datetime]]
+    valores[tipo > 0.999] = "SD"
+    return pd.Series(valores, dtype=object)
+
+
+def convertir_a_time(h):
+    # Versión original de tools.convertir_a_time
+    if isinstance(h, str):
+        try:
+            return datetime.strptime(h, "%H:%M:%S").time()
+        except ValueError:
+            return None
+    elif isinstance(h, datetime):
+        return h.time()
+    return h
+
+
+def categoria_momento_dia(hora):
+    # Versión original de tools.categoria_momento_dia
+    if hora.hour >= 6 and hora.hour <= 10:
+        return "Mañana"
+    elif hora.hour >= 11 and hora.hour <= 13:
+        return "Mediodía"
+    elif hora.hour >= 14 and hora.hour <= 18:
+        return "Tarde"
+    elif hora.hour >= 19 and hora.hour <= 23:
+        return "Noche"
+    else:
+        return "Madrugada"
+
+
+def ruta_original(horas):
+    # ETL: convertir_a_time por fila; EDA: pd.to_datetime + apply para la categoría y la hora
+    convertidas = horas.apply(convertir_a_time)
+    como_texto = convertidas.astype(str).where(convertidas.notna(), None)
+    categorias = pd.to_datetime(como_texto, format="%H:%M:%S", errors="coerce").apply(categoria_momento_dia)
+    hora = pd.to_datetime(como_texto, format="%H:%M:%S", errors="coerce").apply(lambda x: x.hour)
+    return categorias, hora
+
+
+def ruta_vectorizada(horas):
+    segundos = tiempo.hora_a_segundos(horas)
+    return tiempo.momento_del_dia(segundos), tiempo.hora(segundos)
+
+
+def medir(funcion, horas):
+    inicio = time.perf_counter()
+    resultado = funcion(horas)
+    return time.perf_counter() - inicio, resultado
+
+
+def verificar_tools(horas):
+    # Las funciones de tools, con la columna entera o valor por valor, coinciden con las originales
+    muestra = horas.iloc[:2_000]
+    esperado = muestra.apply(convertir_a_time)
+    assert tools.convertir_a_time(muestra).equals(esperado)
+    assert [tools.convertir_a_time(h) for h in muestra] == esperado.tolist()
+    validas = esperado.notna()
+    categorias = esperado[validas].apply(categoria_momento_dia)
+    assert (tools.categoria_momento_dia(muestra)[validas].astype(str) == categorias).all()
+    assert [tools.categoria_momento_dia(h) for h in muestra[validas]] == categorias.tolist()
+    assert tools.categoria_momento_dia("SD") is None
+
+
+def main(tamaños):
+    print(f"{'filas':>12} {'original (s)':>14} {'vectorizada (s)':>16} {'aceleración':>12}")
+    for n in tamaños:
+        horas = generar_horas(n)
+        verificar_tools(horas)
+        t_nuevo, (categorias, hora) = medir(ruta_vectorizada, horas)
+
+        muestra = horas if n <= FILAS_MAX_ORIGINAL else horas.iloc[:FILAS_MAX_ORIGINAL]
+        t_original, (categorias_original, hora_original) = medir(ruta_original, muestra)
+        nota = ""
+        if n > FILAS_MAX_ORIGINAL:
+            # La versión original escala linealmente, así que extrapolamos desde la muestra
+            t_original, nota = t_original * n / FILAS_MAX_ORIGINAL, " (estimado)"
+
+        # Verificamos que ambas rutas coincidan en las filas con hora válida
+        validas = hora_original.notna().to_numpy()
+        m = len(muestra)
+        assert (hora[:m][validas] == hora_original[validas].astype(int).to_numpy()).all()
+        assert (np.asarray(categorias[:m])[validas] == categorias_original[validas].to_numpy()).all()
+
+        print(f"{n:>12,} {t_original:>14.2f} {t_nuevo:>16.3f} {t_original / t_nuevo:>11.0f}x{nota}")
+
+
+if __name__ == "__main__":
+    main([int(x) for x in sys.argv[1:]] or [1_000_000, 10_000_000])
@@ -0,0 +1,163 @@
+## GENERADOR DE DATOS SINTÉTICOS DE HOMICIDIOS
+# Genera tablas con el esquema y las distribuciones de los datos reales, de cualquier tamaño:
+#   generar_homicidios: como homicidios_cleaned.csv (una fila por víctima)
+#   generar_crudos:     como las hojas HECHOS y VICTIMAS de homicidios.xlsx, con sus centinelas "SD",
+#                       la columna HORA con tipos mezclados (time, str, datetime) y las coordenadas "."
+# Los atributos se muestrean por filas completas de los datos reales (conservando sus correlaciones y
+# sus valores "SD"); los Id, las fechas y las coordenadas se generan para que no sean copias exactas.
+import functools
+import os
+
+import numpy as np
+import pandas as pd
+
+import planillas
+
+DATASETS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "datasets")
+
+# Rango de fechas de los hechos
+FECHA_INICIO = "2016-01-01"
+FECHA_FIN = "2021-12-31"
+
+# Desvío (en grados) del ruido agregado a las coordenadas muestreadas
+RUIDO_COORDENADAS = 0.002
+
+# Columnas del nivel del hecho y de la víctima en homicidios_cleaned.csv
+COLUMNAS_HECHO = ["Lugar del hecho", "Tipo de calle", "Calle", "Cruce", "Dirección normalizada", "Comuna",
+                  "Participantes", "Víctima", "Acusado"]
+COLUMNAS_VICTIMA = ["Rol", "Sexo", "Edad"]
+
+
+@functools.lru_cache(maxsize=None)
+def _limpio():
+    return pd.read_csv(os.path.join(DATASETS, "homicidios_cleaned.csv"))
+
+
+@functools.lru_cache(maxsize=None)
+def _crudo(hoja):
+    return planillas.leer_hoja(os.path.join(DATASETS, "homicidios.xlsx"), hoja)
+
+
+def _cantidades(rng, n, distribucion):
+    # Víctimas por hecho muestreadas de la distribución real, recortadas para sumar exactamente n
+    valores, pesos = np.unique(distribucion, return_counts=True)
+    # Con un margen de 5% más hechos que la media esperada alcanza para sumar n víctimas
+    cantidades = rng.choice(valores, size=int(n / distribucion.mean() * 1.05) + 16, p=pesos / pesos.sum())
+    acumulado = np.cumsum(cantidades)
+    ultimo = int(np.searchsorted(acumulado, n))
+    cantidades = cantidades[:ultimo + 1].copy()
+    cantidades[-1] -= acumulado[ultimo] - n
+    return cantidades
+
+
+def _ids(fechas):
+    # "AAAA-NNNN" numerado dentro de cada año en orden de fecha
+    años = fechas.year.to_numpy()
+    orden = np.argsort(fechas.to_numpy(), kind="stable")
+    numero = np.empty(len(fechas), dtype=np.int64)
+    años_ordenados = años[orden]
+    inicio_año = np.searchsorted(años_ordenados, años_ordenados, side="left")
+    numero[orden] = np.arange(len(fechas)) - inicio_año + 1
+    return (pd.Series(años).astype("str") + "-" + pd.Series(numero).astype("str").str.zfill(4)).array
+
+
+def _fechas(rng, m):
+    inicio, fin = pd.Timestamp(FECHA_INICIO), pd.Timestamp(FECHA_FIN)
+    dias = rng.integers(0, (fin - inicio).days + 1, m)
+    return pd.DatetimeIndex(inicio + pd.to_timedelta(np.sort(dias), unit="D"))
+
+
+def _texto_fechas(fechas):
+    # Formateamos solo las fechas distintas (unos pocos miles) y las repartimos por código
+    codigos, unicas = pd.factorize(fechas)
+    return unicas.strftime("%Y-%m-%d").take(codigos).array
+
+
+def _coordenadas(rng, x, y):
+    # Ruido sobre las coordenadas muestreadas; las coordenadas 0 (faltantes) se mantienen en 0
+    faltantes = (x == 0) | (y == 0)
+    x = np.where(faltantes, 0.0, x + rng.normal(0, RUIDO_COORDENADAS, len(x)))
+    y = np.where(faltantes, 0.0, y + rng.normal(0, RUIDO_COORDENADAS, len(y)))
+    return np.round(x, 8), np.round(y, 8), faltantes
+
+
+def generar_homicidios(n, semilla=0):
+    '''
+    Genera n víctimas con el esquema y las distribuciones de homicidios_cleaned.csv.
+
+    Incluye los centinelas "SD" de las columnas de texto, las coordenadas 0 de los hechos sin
+    ubicación (con "X (CABA)" e "Y (CABA)" nulos) y hechos con varias víctimas que comparten
+    el Id.
+
+    Parámetros:
+        n (int): Cantidad de filas (víctimas).
+        semilla (int): Semilla del generador aleatorio.
+
+    Retorna:
+        pandas.DataFrame: Las columnas de homicidios_cleaned.csv, en el mismo orden.
+    '''
+    rng = np.random.default_rng(semilla)
+    real = _limpio()
+    hechos_reales = real.drop_duplicates("Id").reset_index(drop=True)
+
+    cantidades = _cantidades(rng, n, hechos_reales["Cantidad víctimas"].to_numpy())
+    m = len(cantidades)
+    fechas = _fechas(rng, m)
+    muestra = hechos_reales.iloc[rng.integers(0, len(hechos_reales), m)].reset_index(drop=True)
+    horas = real["Hora"].iloc[rng.integers(0, len(real), m)].reset_index(drop=True)
+    x, y, faltantes = _coordenadas(rng, muestra["Pos x"].to_numpy(), muestra["Pos y"].to_numpy())
+    # El punto en coordenadas de CABA se toma del hecho muestreado (sin ruido)
+    x_caba = np.where(faltantes, np.nan, muestra["X (CABA)"].to_numpy(dtype=float))
+    y_caba = np.where(faltantes, np.nan, muestra["Y (CABA)"].to_numpy(dtype=float))
+
+    hechos = pd.DataFrame({"Id": _ids(fechas), "Cantidad víctimas": cantidades, "Fecha": _texto_fechas(fechas),
+                           "Año": fechas.year.astype(np.int64), "Mes": fechas.month.astype(np.int64),
+                           "Día": fechas.day.astype(np.int64), "Hora": horas.array,
+                           "Hora entera": horas.str.slice(0, 2).astype(np.int64).to_numpy(),
+                           **{c: muestra[c].array for c in COLUMNAS_HECHO},
+                           "X (CABA)": x_caba, "Y (CABA)": y_caba, "Pos x": x, "Pos y": y})
+
+    # Una fila por víctima: repetimos cada hecho según su cantidad y muestreamos los atributos de la víctima
+    df = hechos.iloc[np.repeat(np.arange(m), cantidades)].reset_index(drop=True)
+    victimas = real[COLUMNAS_VICTIMA].iloc[rng.integers(0, len(real), n)].reset_index(drop=True)
+    for columna in COLUMNAS_VICTIMA:
+        df[columna] = victimas[columna].array
+    return df[real.columns]
+
+
+def generar_crudos(n, semilla=0):
+    '''
+    Genera las hojas HECHOS y VICTIMAS de homicidios.xlsx con n víctimas, tal como las lee pandas.
+
+    HECHOS conserva la columna HORA con valores time, textos y datetime, HH con "SD", las
+    coordenadas "." y los nulos de Cruce y Calle; VICTIMAS conserva los "SD" de SEXO, ROL y EDAD.
+
+    Parámetros:
+        n (int): Cantidad de víctimas.
+        semilla (int): Semilla del generador aleatorio.
+
+    Retorna:
+        tuple: Los DataFrames (hechos, victimas) con los nombres de columna originales.
+    '''
+    rng = np.random.default_rng(semilla)
+    hechos_reales, victimas_reales = _crudo("HECHOS"), _crudo("VICTIMAS")
+
+    cantidades = _cantidades(rng, n, hechos_reales["N_VICTIMAS"].to_numpy())
+    m = len(cantidades)
+    fechas = _fechas(rng, m)
+    muestra = hechos_reales.iloc[rng.integers(0, len(hechos_reales), m)].reset_index(drop=True)
+    ids = _ids(fechas)
+
+    hechos = muestra.copy()
+    hechos["ID"], hechos["N_VICTIMAS"], hechos["FECHA"] = ids, cantidades, fechas
+    hechos["AAAA"], hechos["MM"], hechos["DD"] = (fechas.year.astype(np.int64), fechas.month.astype(np.int64),
+                                                  fechas.day.astype(np.int64))
+
+    muestra_victimas = victimas_reales.iloc[rng.integers(0, len(victimas_reales), n)].reset_index(drop=True)
+    victimas = muestra_victimas.copy()
+    repeticion = np.repeat(np.arange(m), cantidades)
+    victimas["ID_hecho"] = ids.take(repeticion)
+    victimas["FECHA"] = fechas[repeticion]
+    for columna, parte in [("AAAA", "year"), ("MM", "month"), ("DD", "day")]:
+        victimas[columna] = getattr(victimas["FECHA"].dt, parte).astype(np.int64)
+    return hechos, victimas
@@ -0,0 +1,331 @@
+## SUITE DE BENCHMARKS DE tools Y DEL ETL
+# Mide el tiempo y la memoria máxima de cada función de tools (etl, estadistica y graficos) y de las etapas
+# de limpieza y unión del pipeline sobre datos sintéticos (ver sinteticos.py), y los compara con las líneas
+# de base guardadas en baselines.json: un caso es una regresión si su tiempo o su memoria superan a la base
+# por más del umbral. El proceso termina con código 1 si hay regresiones. Las bases guardadas cubren los
+# tamaños por defecto (10_000 y 1_000_000 filas); para otros tamaños hay que registrarlas con --guardar.
+# Uso: python benchmarks/suite.py [--filas 10000 1000000] [--casos texto ...] [--umbral 1.25]
+#                                 [--guardar] [--sin-memoria] [--repeticiones 3]
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import sinteticos
+import cache_figuras
+import perfilado
+import pipeline
+import tools
+
+RUTA_BASES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+
+# Cociente máximo entre la medición y la base antes de considerarla una regresión
+UMBRAL = 1.25
+
+# Diferencias por debajo de estos mínimos se consideran ruido aunque superen el umbral
+MINIMO_SEGUNDOS = 0.05
+MINIMO_MB = 5
+
+# Repeticiones medidas de cada caso (se toma el menor tiempo), después de una ejecución de calentamiento
+REPETICIONES = 3
+
+# Casos registrados: nombre -> (grupo, preparación, máximo de filas)
+CASOS = {}
+
+
+def caso(nombre, grupo, filas_max=None):
+    '''
+    Registra un caso de la suite.
+
+    La función decorada recibe los datos sintéticos y devuelve una función sin argumentos que
+    ejecuta lo que se mide: las copias y otras preparaciones quedan fuera de la medición.
+
+    Parámetros:
+        nombre (str): El nombre del caso (el de la función de tools o la etapa del pipeline).
+        grupo (str): "etl", "estadistica", "graficos" o "pipeline".
+        filas_max (int): Tamaño máximo para el que se ejecuta el caso (None: sin límite).
+    '''
+    def registrar(preparar):
+        CASOS[nombre] = (grupo, preparar, filas_max)
+        return preparar
+    return registrar
+
+
+class Datos:
+    '''
+    Datos sintéticos de un tamaño, generados una sola vez y compartidos por los casos.
+    '''
+
+    def __init__(self, n, semilla=0):
+        self.n = n
+        self.limpio = sinteticos.generar_homicidios(n, semilla)
+        hechos, victimas = sinteticos.generar_crudos(n, semilla)
+        # Las etapas del pipeline reciben los bloques con las columnas ya normalizadas
+        self.hechos = pipeline.normalizar_columnas(pipeline.RENOMBRES_HECHOS)(hechos)
+        self.hechos = pipeline.descartar_columnas(["Altura"])(self.hechos)
+        self.victimas = pipeline.normalizar_columnas(pipeline.RENOMBRES_VICTIMAS)(victimas)
+        self.victimas = pipeline.descartar_columnas(pipeline.DESCARTES_VICTIMAS)(self.victimas)
+        self.temporal = tempfile.TemporaryDirectory(prefix="suite_")
+
+
+## CASOS: tools.etl
+
+@caso("ver_duplicados", "etl")
+def _(datos):
+    return lambda: tools.ver_duplicados(datos.limpio, "Id")
+
+
+@caso("ver_variables", "etl")
+def _(datos):
+    perfilado.limpiar_cache()
+    return lambda: tools.ver_variables(datos.limpio)
+
+
+@caso("ver_tipo_datos", "etl")
+def _(datos):
+    perfilado.limpiar_cache()
+    return lambda: tools.ver_tipo_datos(datos.limpio)
+
+
+@caso("convertir_a_time", "etl")
+def _(datos):
+    # Se aplica a toda la columna Hora cruda (tipos mezclados), como en ETL.ipynb
+    horas = datos.hechos["Hora"]
+    return lambda: tools.convertir_a_time(horas)
+
+
+@caso("categoria_momento_dia", "etl")
+def _(datos):
+    horas = pd.to_datetime(datos.limpio["Hora"], format="%H:%M:%S").dt.time
+    return lambda: tools.categoria_momento_dia(horas)
+
+
+@caso("imputa_valor_frecuente", "etl")
+def _(datos):
+    victimas = datos.victimas.copy()
+    return lambda: tools.imputa_valor_frecuente(victimas, "Sexo")
+
+
+@caso("imputa_edad_media_segun_sexo", "etl")
+def _(datos):
+    victimas = datos.victimas.copy()
+    return lambda: tools.imputa_edad_media_segun_sexo(victimas)
+
+
+@caso("cargar_homicidios", "etl")
+def _(datos):
+    import esquema
+
+    ruta = os.path.join(datos.temporal.name, "homicidios.parquet")
+    if not os.path.isdir(ruta):
+        esquema.escribir_parquet(datos.limpio, ruta)
+    return lambda: tools.cargar_homicidios(ruta, ["Año", "Sexo", "Edad"], [("Año", ">=", 2019)])
+
+
+## CASOS: tools.estadistica
+
+@caso("cohen", "estadistica")
+def _(datos):
+    grupo1 = datos.limpio.loc[datos.limpio["Sexo"] == "MASCULINO", "Edad"]
+    grupo2 = datos.limpio.loc[datos.limpio["Sexo"] == "FEMENINO", "Edad"]
+    return lambda: tools.cohen(grupo1, grupo2)
+
+
+@caso("kpis", "estadistica")
+def _(datos):
+    return lambda: tools.kpis(datos.limpio)
+
+
+## CASOS: tools.graficos (todos con la misma firma; los intervalos bootstrap de seaborn no escalan a 10M)
+
+def _grafico(nombre, filas_max=None):
+    @caso(nombre, "graficos", filas_max)
+    def _(datos):
+        funcion = getattr(tools, nombre)
+
+        def ejecutar():
+            funcion(datos.limpio)
+            plt.close("all")
+        return ejecutar
+
+
+for _nombre in tools.FUNCIONES["graficos"]:
+    _grafico(_nombre, 1_000_000 if _nombre == "accidentes_por_anio_y_sexo" else None)
+
+
+## CASOS: etapas del pipeline
+
+@caso("pipeline.limpiar_hechos", "pipeline")
+def _(datos):
+    hechos = datos.hechos.copy()
+    return lambda: pipeline.limpiar_hechos(hechos)
+
+
+@caso("pipeline.convertir_hora", "pipeline")
+def _(datos):
+    hechos = datos.hechos.copy()
+    return lambda: pipeline.convertir_hora(hechos)
+
+
+@caso("pipeline.imputacion", "pipeline")
+def _(datos):
+    hechos = pipeline.convertir_hora(pipeline.limpiar_hechos(datos.hechos.copy()))
+    victimas = datos.victimas.copy()
+
+    def ejecutar():
+        estadisticas = pipeline.EstadisticasImputacion()
+        estadisticas.actualizar_hechos(hechos)
+        estadisticas.actualizar_victimas(victimas)
+        pipeline.imputar_hechos(estadisticas)(hechos)
+        pipeline.imputar_victimas(estadisticas)(victimas)
+    return ejecutar
+
+
+@caso("pipeline.unir_por_particiones", "pipeline")
+def _(datos):
+    hechos = pipeline.convertir_hora(pipeline.limpiar_hechos(datos.hechos.copy()))
+    victimas = datos.victimas
+    tamaño = pipeline.TAMAÑO_BLOQUE
+    bloques_hechos = [hechos.iloc[i:i + tamaño] for i in range(0, len(hechos), tamaño)]
+    bloques_victimas = [victimas.iloc[i:i + tamaño] for i in range(0, len(victimas), tamaño)]
+
+    def ejecutar():
+        for _ in pipeline.unir_por_particiones(bloques_hechos, bloques_victimas, directorio=datos.temporal.name):
+            pass
+    return ejecutar
+
+
+## MEDICIÓN
+
+def medir(preparar, datos, repeticiones=REPETICIONES, con_memoria=True):
+    '''
+    Mide un caso: el menor tiempo entre las repeticiones y la memoria máxima de una ejecución aparte.
+
+    Antes de medir se hace una ejecución sin cronometrar, para que las importaciones diferidas, la
+    carga de fuentes de matplotlib y otras inicializaciones de la primera llamada no cuenten.
+    La memoria se mide con tracemalloc (incluye los arreglos de numpy y pandas, pero no los
+    buffers de Arrow) en una ejecución separada, para que el rastreo no afecte el tiempo.
+
+    Retorna:
+        tuple: Los segundos y los MB de memoria máxima (None si no se mide).
+    '''
+    preparar(datos)()
+    tiempos = []
+    for _ in range(max(repeticiones, 1)):
+        ejecutar = preparar(datos)
+        inicio = time.perf_counter()
+        ejecutar()
+        tiempos.append(time.perf_counter() - inicio)
+
+    memoria = None
+    if con_memoria:
+        ejecutar = preparar(datos)
+        tracemalloc.start()
+        try:
+            ejecutar()
+            memoria = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+        finally:
+            tracemalloc.stop()
+    return min(tiempos), memoria
+
+
+def comparar(segundos, memoria, base, umbral):
+    '''
+    Compara una medición con su base.
+
+    Retorna:
+        str: "nuevo" si no hay base, "REGRESIÓN" si el tiempo o la memoria superan a la base por
+        más del umbral (y de los mínimos de ruido), o "ok".
+    '''
+    if base is None:
+        return "nuevo"
+    lento = segundos > base["segundos"] * umbral and segundos - base["segundos"] > MINIMO_SEGUNDOS
+    pesado = (memoria is not None and base.get("memoria_mb") is not None
+              and memoria > base["memoria_mb"] * umbral and memoria - base["memoria_mb"] > MINIMO_MB)
+    return "REGRESIÓN" if lento or pesado else "ok"
+
+
+def cargar_bases(ruta=RUTA_BASES):
+    if not os.path.exists(ruta):
+        return {"maquina": None, "casos": {}}
+    with open(ruta, encoding="utf-8") as archivo:
+        return json.load(archivo)
+
+
+def guardar_bases(bases, ruta=RUTA_BASES):
+    bases["maquina"] = {"python": platform.python_version(), "pandas": pd.__version__,
+                        "procesador": platform.machine(), "cpus": os.cpu_count()}
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(bases, archivo, indent=2, ensure_ascii=False, sort_keys=True)
+        archivo.write("\n")
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Suite de benchmarks de tools y del ETL")
+    parser.add_argument("--filas", type=int, nargs="+", default=[10_000, 1_000_000])
+    parser.add_argument("--casos", nargs="+", help="Ejecutar solo los casos cuyo nombre contiene alguno de estos textos")
+    parser.add_argument("--umbral", type=float, default=UMBRAL)
+    parser.add_argument("--guardar", action="store_true", help="Guardar las mediciones como nuevas bases")
+    parser.add_argument("--sin-memoria", action="store_true", help="No medir la memoria máxima")
+    parser.add_argument("--repeticiones", type=int, default=REPETICIONES)
+    opciones = parser.parse_args(argumentos)
+
+    # Todas las funciones públicas de tools deben tener su caso
+    faltantes = sorted(set(tools.__all__) - set(CASOS))
+    if faltantes:
+        print(f"Funciones de tools sin caso en la suite: {faltantes}")
+
+    cache_figuras.desactivar()
+    warnings.simplefilter("ignore")
+    bases = cargar_bases()
+    nombres = [n for n in CASOS if not opciones.casos or any(t in n for t in opciones.casos)]
+    regresiones = 0
+
+    print(f"{'caso':>32} {'grupo':>12} {'filas':>11} {'segundos':>9} {'memoria MB':>11} {'base (s)':>9} {'cociente':>9}  estado")
+    for n in opciones.filas:
+        datos = Datos(n)
+        for nombre in nombres:
+            grupo, preparar, filas_max = CASOS[nombre]
+            if filas_max is not None and n > filas_max:
+                print(f"{nombre:>32} {grupo:>12} {n:>11,} {'':>9} {'':>11} {'':>9} {'':>9}  omitido (> {filas_max:,} filas)")
+                continue
+            with contextlib.redirect_stdout(io.StringIO()):
+                segundos, memoria = medir(preparar, datos, opciones.repeticiones, not opciones.sin_memoria)
+
+            clave = f"{nombre}@{n}"
+            base = bases["casos"].get(clave)
+            estado = comparar(segundos, memoria, base, opciones.umbral)
+            regresiones += estado == "REGRESIÓN"
+            texto_memoria = f"{memoria:>11.1f}" if memoria is not None else f"{'-':>11}"
+            texto_base = f"{base['segundos']:>9.3f} {segundos / base['segundos']:>9.2f}" if base else f"{'-':>9} {'-':>9}"
+            print(f"{nombre:>32} {grupo:>12} {n:>11,} {segundos:>9.3f} {texto_memoria} {texto_base}  {estado}")
+
+            if opciones.guardar:
+                bases["casos"][clave] = {"segundos": round(segundos, 4),
+                                         "memoria_mb": round(memoria, 1) if memoria is not None else None}
+        datos.temporal.cleanup()
+        del datos
+
+    if opciones.guardar:
+        guardar_bases(bases)
+        print(f"Bases guardadas en {RUTA_BASES}")
+    if regresiones:
+        print(f"{regresiones} regresiones (umbral {opciones.umbral}x)")
+    return 1 if regresiones else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,332 @@
+## CACHÉ EN DISCO DE LOS GRÁFICOS DE tools.graficos
+# Importaciones
+import functools
+import hashlib
+import io
+import os
+import pickle
+import sys
+import tempfile
+
+import graficos_rapidos
+import perfilado
+
+
+# Carpeta y tamaño máximo por defecto de la caché
+DIRECTORIO = os.path.join(os.path.expanduser("~"), ".cache", "homicidios_viales", "figuras")
+TAMAÑO_MAXIMO = 200 * 1024 ** 2
+
+# Versión de las claves: se incrementa cuando cambia algo que afecta a las figuras y que la clave no ve
+VERSION = 1
+
+# Módulos cuyo código fuente forma parte de la clave, además del de la función decorada: los
+# ayudantes que llaman los gráficos (_barplot, _cajas, ...) y el modo rápido
+MODULOS = ("tools.graficos", "graficos_rapidos")
+
+# Tipos de parámetros que forman parte de la clave; con cualquier otro (un cubo, un índice) no se usa la caché
+_TIPOS_SIMPLES = (type(None), bool, int, float, str, tuple)
+
+_cache = None
+_huellas_modulos = {}
+
+
+class _Duplicar(io.TextIOBase):
+    # Escribe en la salida original y guarda una copia de lo impreso
+    def __init__(self, original):
+        self.original = original
+        self.copia = io.StringIO()
+
+    def write(self, texto):
+        self.copia.write(texto)
+        return self.original.write(texto)
+
+    def flush(self):
+        self.original.flush()
+
+
+class CacheFiguras:
+    '''
+    Caché de figuras direccionada por contenido, guardada en disco.
+
+    Cada entrada se identifica por el nombre y el código de la función, el código fuente de los
+    módulos de gráficos, sus parámetros (incluidos los valores por defecto) y la huella del
+    contenido de las columnas que usa, y guarda la imagen PNG, el texto impreso y el valor
+    devuelto. Cuando el tamaño total supera el máximo se descartan las entradas usadas
+    hace más tiempo (LRU por fecha de último uso).
+
+    Atributos:
+        directorio (str): La carpeta de la caché.
+        tamaño_maximo (int): El tamaño máximo en bytes.
+        aciertos, fallos, desalojos (int): Contadores de la sesión.
+    '''
+
+    def __init__(self, directorio=DIRECTORIO, tamaño_maximo=TAMAÑO_MAXIMO):
+        self.directorio = directorio
+        self.tamaño_maximo = tamaño_maximo
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        os.makedirs(directorio, exist_ok=True)
+
+    def _rutas(self, clave):
+        return os.path.join(self.directorio, f"{clave}.png"), os.path.join(self.directorio, f"{clave}.pkl")
+
+    def leer(self, clave):
+        '''
+        Devuelve la entrada guardada (un diccionario con "png", "salida" y "resultado") o None.
+        '''
+        ruta_png, ruta_datos = self._rutas(clave)
+        try:
+            with open(ruta_datos, "rb") as archivo:
+                entrada = pickle.load(archivo)
+            png = None
+            if entrada.pop("con_imagen"):
+                with open(ruta_png, "rb") as archivo:
+                    png = archivo.read()
+        except (OSError, pickle.UnpicklingError, EOFError, KeyError):
+            self.fallos += 1
+            return None
+        # Marcamos la entrada como usada recientemente
+        os.utime(ruta_datos)
+        self.aciertos += 1
+        return dict(entrada, png=png)
+
+    def guardar(self, clave, png, salida, resultado):
+        '''
+        Guarda una entrada y descarta las más antiguas si se supera el tamaño máximo.
+
+        Retorna:
+            bool: False si el resultado no se puede serializar (la entrada no se guarda).
+        '''
+        try:
+            datos = pickle.dumps({"con_imagen": png is not None, "salida": salida, "resultado": resultado})
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return False
+        ruta_png, ruta_datos = self._rutas(clave)
+        # Escribimos en archivos temporales y los renombramos para no dejar entradas a medias
+        for ruta, contenido in [(ruta_png, png), (ruta_datos, datos)]:
+            if contenido is None:
+                continue
+            descriptor, temporal = tempfile.mkstemp(dir=self.directorio, suffix=".tmp")
+            with os.fdopen(descriptor, "wb") as archivo:
+                archivo.write(contenido)
+            os.replace(temporal, ruta)
+        self.desalojar()
+        return True
+
+    def entradas(self):
+        '''
+        Devuelve las entradas guardadas como tuplas (último uso, bytes, clave), de la más antigua a la más reciente.
+        '''
+        tamaños, usos = {}, {}
+        for nombre in os.listdir(self.directorio):
+            clave, extension = os.path.splitext(nombre)
+            if extension not in (".png", ".pkl"):
+                continue
+            try:
+                informacion = os.stat(os.path.join(self.directorio, nombre))
+            except FileNotFoundError:
+                continue
+            tamaños[clave] = tamaños.get(clave, 0) + informacion.st_size
+            if extension == ".pkl":
+                usos[clave] = informacion.st_mtime
+        return sorted((usos.get(clave, 0.0), tamaño, clave) for clave, tamaño in tamaños.items())
+
+    def desalojar(self):
+        '''
+        Descarta las entradas usadas hace más tiempo hasta quedar por debajo del tamaño máximo.
+        '''
+        entradas = self.entradas()
+        total = sum(tamaño for _, tamaño, _ in entradas)
+        for _, tamaño, clave in entradas:
+            if total <= self.tamaño_maximo:
+                break
+            for ruta in self._rutas(clave):
+                if os.path.exists(ruta):
+                    os.remove(ruta)
+            total -= tamaño
+            self.desalojos += 1
+
+    def limpiar(self):
+        '''
+        Borra todas las entradas de la caché.
+        '''
+        for _, _, clave in self.entradas():
+            for ruta in self._rutas(clave):
+                if os.path.exists(ruta):
+                    os.remove(ruta)
+
+    def estadisticas(self):
+        '''
+        Retorna:
+            dict: Aciertos, fallos, tasa de aciertos, desalojos, entradas y bytes ocupados.
+        '''
+        entradas = self.entradas()
+        consultas = self.aciertos + self.fallos
+        return {"aciertos": self.aciertos, "fallos": self.fallos,
+                "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+                "desalojos": self.desalojos, "entradas": len(entradas),
+                "bytes": sum(tamaño for _, tamaño, _ in entradas)}
+
+
+def activar(directorio=DIRECTORIO, tamaño_maximo=TAMAÑO_MAXIMO):
+    '''
+    Activa la caché de figuras para los gráficos de tools.graficos.
+
+    Parámetros:
+        directorio (str): La carpeta de la caché (por defecto en ~/.cache/homicidios_viales/figuras).
+        tamaño_maximo (int): El tamaño máximo en bytes.
+
+    Retorna:
+        CacheFiguras: La caché activa.
+    '''
+    global _cache
+    _cache = CacheFiguras(directorio, tamaño_maximo)
+    return _cache
+
+
+def desactivar():
+    '''
+    Desactiva la caché: los gráficos vuelven a dibujarse siempre (las entradas en disco se conservan).
+    '''
+    global _cache
+    _cache = None
+
+
+def estadisticas():
+    '''
+    Retorna:
+        dict: Las estadísticas de la caché activa, o None si está desactivada.
+    '''
+    return _cache.estadisticas() if _cache is not None else None
+
+
+def _huella_modulo(nombre):
+    # Huella del código fuente de un módulo cargado; se vuelve a leer solo si el archivo cambió
+    ruta = getattr(sys.modules.get(nombre), "__file__", None)
+    if ruta is None:
+        return "ausente"
+    informacion = os.stat(ruta)
+    clave = (ruta, informacion.st_mtime_ns, informacion.st_size)
+    if clave not in _huellas_modulos:
+        with open(ruta, "rb") as archivo:
+            _huellas_modulos[clave] = hashlib.blake2b(archivo.read(), digest_size=16).hexdigest()
+    return _huellas_modulos[clave]
+
+
+def _estilo():
+    # Los rcParams que difieren de los valores por defecto de matplotlib: el tema, la paleta (el ciclo
+    # de colores) y el contexto de seaborn se guardan ahí. El backend no cambia la figura
+    import matplotlib as mpl
+
+    cambiados = {clave: valor for clave, valor in mpl.rcParams.items()
+                 if clave != "backend" and valor != mpl.rcParamsDefault.get(clave)}
+    return repr(sorted(cambiados.items()))
+
+
+def clave_figura(funcion, df, columnas, parametros):
+    '''
+    Calcula la clave de una figura: función, parámetros y contenido de las columnas que usa.
+
+    Además del código de la función entran en la clave VERSION, el código fuente de su módulo y
+    de MODULOS (un cambio en un ayudante o en el modo rápido invalida las figuras), los valores
+    por defecto de la función, que no aparecen en parametros cuando no se pasan, y el estilo
+    global de matplotlib (ver _estilo), de modo que después de sns.set_theme o de cambiar
+    mpl.rcParams las figuras se vuelven a dibujar. Las columnas que no están en df (por ejemplo,
+    variables derivadas sin materializar) se registran como ausentes, así que materializarlas
+    cambia la clave.
+
+    Parámetros:
+        funcion (function): La función de gráficos.
+        df (pandas.DataFrame): El DataFrame de entrada.
+        columnas (tuple): Las columnas que lee la función.
+        parametros (dict): Los demás parámetros de la llamada (solo tipos simples).
+
+    Retorna:
+        str: La clave hexadecimal.
+    '''
+    resumen = hashlib.blake2b(digest_size=20)
+    # El código de la función: si se modifica el gráfico, las entradas anteriores dejan de servir
+    codigo = funcion.__code__
+    resumen.update(f"{funcion.__module__}.{funcion.__qualname__}".encode())
+    resumen.update(codigo.co_code)
+    resumen.update(repr(codigo.co_consts).encode())
+    resumen.update(f"version={VERSION}".encode())
+    for modulo in sorted({funcion.__module__, *MODULOS}):
+        resumen.update(f"{modulo}={_huella_modulo(modulo)}".encode())
+    resumen.update(repr((funcion.__defaults__, funcion.__kwdefaults__)).encode())
+    resumen.update(repr(sorted(parametros.items())).encode())
+    # El modo rápido dibuja la misma figura con otras primitivas (y sin intervalos por bootstrap)
+    resumen.update(f"rapido={graficos_rapidos.activo()}".encode())
+    resumen.update(_estilo().encode())
+    for columna in columnas:
+        huella = perfilado.huella_columna(df[columna]) if columna in df.columns else "ausente"
+        resumen.update(f"{columna}={huella}".encode())
+    return resumen.hexdigest()
+
+
+def _mostrar(png):
+    # En un notebook mostramos la imagen guardada; fuera de IPython no hay nada que mostrar
+    modulo = sys.modules.get("IPython")
+    if png is None or modulo is None or modulo.get_ipython() is None:
+        return
+    from IPython.display import Image, display
+
+    display(Image(data=png))
+
+
+def _dibujar_y_capturar(funcion, args, kwargs):
+    # Ejecutamos la función capturando la figura que muestra y el texto que imprime
+    import matplotlib.pyplot as plt
+
+    capturas = []
+    mostrar_original = plt.show
+
+    def mostrar(*a, **k):
+        buffer = io.BytesIO()
+        plt.gcf().savefig(buffer, format="png", bbox_inches="tight")
+        capturas.append(buffer.getvalue())
+        return mostrar_original(*a, **k)
+
+    salida = _Duplicar(sys.stdout)
+    stdout_original, sys.stdout, plt.show = sys.stdout, salida, mostrar
+    try:
+        resultado = funcion(*args, **kwargs)
+    finally:
+        sys.stdout, plt.show = stdout_original, mostrar_original
+    return resultado, (capturas[-1] if capturas else None), salida.copia.getvalue()
+
+
+def con_cache(*columnas):
+    '''
+    Decorador que guarda en la caché de figuras el resultado de una función de gráficos.
+
+    La función debe recibir el DataFrame como primer argumento. Si la caché está activa y la
+    entrada existe, se muestra la imagen guardada, se vuelve a imprimir el texto y se devuelve
+    el valor guardado sin ejecutar la función (ni pandas ni matplotlib). Si algún parámetro no
+    es de un tipo simple (un cubo o un índice ya construido) o df es None, se dibuja sin caché.
+
+    Parámetros:
+        columnas (str): Las columnas de df que lee la función.
+    '''
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(df, *args, **kwargs):
+            cache = _cache
+            parametros = dict(zip(funcion.__code__.co_varnames[1:], args), **kwargs)
+            if cache is None or df is None or not all(isinstance(v, _TIPOS_SIMPLES) for v in parametros.values()):
+                return funcion(df, *args, **kwargs)
+
+            clave = clave_figura(funcion, df, columnas, parametros)
+            entrada = cache.leer(clave)
+            if entrada is not None:
+                sys.stdout.write(entrada["salida"])
+                _mostrar(entrada["png"])
+                return entrada["resultado"]
+
+            resultado, png, salida = _dibujar_y_capturar(funcion, (df,) + args, kwargs)
+            cache.guardar(clave, png, salida, resultado)
+            return resultado
+
+        return envoltura
+    return decorador
@@ -0,0 +1,351 @@
+## REGLAS DE CALIDAD DE DATOS EN UNA SOLA PASADA
+# Cada regla es una condición vectorizada que devuelve una máscara booleana con las filas que la violan.
+# validar recorre los datos por particiones (un DataFrame, un iterable de bloques, un CSV leído por bloques
+# o el dataset Parquet leyendo solo las columnas que usan las reglas) y evalúa todas las reglas sobre cada
+# partición mientras está en memoria. Las conversiones que comparten varias reglas (la hora a segundos, los
+# textos a números, el Id a su código entero) se calculan una sola vez por partición.
+# Importaciones
+import numpy as np
+import pandas as pd
+
+import espacial
+import ids
+import tiempo
+from espacial import LIMITES_LAT, LIMITES_LON
+from imputacion import CENTINELAS
+
+
+# Cantidad de filas por partición al leer un CSV
+TAMAÑO_PARTICION = 1_000_000
+
+# Columnas del resumen de validar
+COLUMNAS_RESUMEN = ["regla", "descripcion", "columnas", "filas", "violaciones", "violaciones_%"]
+
+
+class Regla:
+    '''
+    Una regla de calidad.
+
+    Atributos:
+        nombre (str): El nombre de la regla (único dentro de una validación).
+        columnas (tuple): Las columnas que usa; son las que se leen y se muestran en las muestras.
+        evaluar (function): Recibe una Particion y devuelve un arreglo booleano, True en las filas
+            que violan la regla.
+        descripcion (str): La condición que deben cumplir las filas.
+    '''
+
+    def __init__(self, nombre, columnas, evaluar, descripcion=""):
+        self.nombre = nombre
+        self.columnas = (columnas,) if isinstance(columnas, str) else tuple(columnas)
+        self.evaluar = evaluar
+        self.descripcion = descripcion
+
+    def __repr__(self):
+        return f"Regla({self.nombre!r}, {list(self.columnas)})"
+
+
+class Particion:
+    '''
+    Una partición de los datos con las conversiones de sus columnas guardadas, para que las
+    reglas que usan la misma columna no la conviertan más de una vez.
+
+    Atributos:
+        df (pandas.DataFrame): Los datos de la partición.
+    '''
+
+    def __init__(self, df):
+        self.df = df
+        self._cache = {}
+
+    def _memo(self, clave, calcular):
+        if clave not in self._cache:
+            self._cache[clave] = calcular()
+        return self._cache[clave]
+
+    def valores(self, columna):
+        '''
+        Retorna:
+            pandas.Series: La columna tal como está.
+        '''
+        return self.df[columna]
+
+    def numeros(self, columna):
+        '''
+        Retorna:
+            numpy.ndarray: La columna como float64 (los textos no numéricos, como "SD", pasan a NaN).
+        '''
+        def calcular():
+            serie = self.df[columna]
+            if serie.dtype.kind in "biuf":
+                return serie.to_numpy(dtype=float)
+            return pd.to_numeric(serie, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+        return self._memo(("numeros", columna), calcular)
+
+    def segundos(self, columna):
+        '''
+        Retorna:
+            numpy.ndarray: Las horas en segundos desde la medianoche (tiempo.SIN_HORA si no son válidas).
+        '''
+        return self._memo(("segundos", columna), lambda: tiempo.hora_a_segundos(self.df[columna]))
+
+    def codigos_id(self, columna):
+        '''
+        Retorna:
+            numpy.ndarray: El código entero de cada Id (ver ids.py), -1 si el Id no es válido.
+        '''
+        return self._memo(("codigos_id", columna), lambda: ids.codificar(self.df[columna], invalido=-1))
+
+    def en(self, columna, permitidos):
+        '''
+        Retorna:
+            numpy.ndarray: Si cada valor está entre los permitidos (las columnas categóricas se
+            comparan por sus categorías, sin recorrer las filas).
+        '''
+        serie = self.df[columna]
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            categorias = np.append(serie.cat.categories.isin(permitidos), False)
+            # El código -1 (nulo) cae en el False agregado al final
+            return categorias[serie.cat.codes.to_numpy()]
+        return serie.isin(permitidos).to_numpy()
+
+
+def regla(nombre, columnas, condicion, descripcion=""):
+    '''
+    Crea una regla a partir de una condición sobre el DataFrame de la partición.
+
+    Parámetros:
+        nombre (str): El nombre de la regla.
+        columnas (str o list): Las columnas que usa la condición.
+        condicion (function): Recibe un pandas.DataFrame y devuelve una máscara booleana, True en
+            las filas que cumplen la regla.
+        descripcion (str): La condición en palabras.
+
+    Retorna:
+        Regla: La regla.
+    '''
+    return Regla(nombre, columnas, lambda particion: ~np.asarray(condicion(particion.df), dtype=bool), descripcion)
+
+
+def formato_id(columna="Id"):
+    '''
+    Regla: el Id tiene la forma "AAAA-NNNN" (ver ids.PATRON).
+    '''
+    return Regla(f"formato {columna}", columna, lambda p: p.codigos_id(columna) < 0,
+                 f'"{columna}" con la forma AAAA-NNNN')
+
+
+def referencia(columna, claves, nombre=None):
+    '''
+    Regla de integridad referencial: cada Id debe existir entre las claves (por ejemplo, cada
+    víctima de VICTIMAS debe tener su hecho en HECHOS).
+
+    Parámetros:
+        columna (str): La columna con los Id.
+        claves (iterable): Los Id válidos, por ejemplo hechos["Id"].
+        nombre (str): El nombre de la regla.
+
+    Retorna:
+        Regla: La regla.
+    '''
+    claves = pd.Series(claves)
+    claves = np.unique(ids.codificar(claves[ids.es_valido(claves)]))
+
+    def evaluar(particion):
+        codigos = particion.codigos_id(columna)
+        posiciones = np.minimum(np.searchsorted(claves, codigos), max(len(claves) - 1, 0))
+        return ~(claves[posiciones] == codigos) if len(claves) else np.ones(len(codigos), dtype=bool)
+    return Regla(nombre or f"referencia {columna}", columna, evaluar, f'"{columna}" existe en la tabla referida')
+
+
+def rango(columna, minimo=None, maximo=None, nulos=False):
+    '''
+    Regla: el valor numérico está entre minimo y maximo (incluidos).
+
+    Parámetros:
+        columna (str): La columna.
+        minimo, maximo (float): Los límites; None para no limitar.
+        nulos (bool): Si se aceptan los nulos y los valores no numéricos (como "SD").
+
+    Retorna:
+        Regla: La regla.
+    '''
+    def evaluar(particion):
+        valores = particion.numeros(columna)
+        with np.errstate(invalid="ignore"):
+            fuera = np.zeros(len(valores), dtype=bool)
+            if minimo is not None:
+                fuera |= valores < minimo
+            if maximo is not None:
+                fuera |= valores > maximo
+        return fuera | (np.isnan(valores) & (not nulos))
+    limites = f"{'-∞' if minimo is None else minimo} a {'∞' if maximo is None else maximo}"
+    return Regla(f"rango {columna}", columna, evaluar, f'"{columna}" entre {limites}')
+
+
+def categorias(columna, permitidas, nulos=False):
+    '''
+    Regla: el valor pertenece al conjunto de categorías permitidas.
+
+    Parámetros:
+        columna (str): La columna.
+        permitidas (iterable): Los valores permitidos.
+        nulos (bool): Si se aceptan los nulos.
+
+    Retorna:
+        Regla: La regla.
+    '''
+    permitidas = list(permitidas)
+
+    def evaluar(particion):
+        fuera = ~particion.en(columna, permitidas)
+        return fuera & particion.valores(columna).notna().to_numpy() if nulos else fuera
+    return Regla(f"categorías {columna}", columna, evaluar, f'"{columna}" en {{{", ".join(map(str, permitidas))}}}')
+
+
+def sin_centinelas(columna, centinelas=CENTINELAS):
+    '''
+    Regla: la columna no tiene valores "sin dato" (por ejemplo "SD").
+    '''
+    centinelas = list(centinelas)
+    return Regla(f"sin centinelas {columna}", columna, lambda p: p.en(columna, centinelas),
+                 f'"{columna}" sin {", ".join(centinelas)}')
+
+
+def hora_valida(columna="Hora"):
+    '''
+    Regla: la hora es un "HH:MM:SS", time, datetime o Timestamp válido (ver tiempo.hora_a_segundos).
+    '''
+    return Regla(f"hora válida {columna}", columna, lambda p: p.segundos(columna) == tiempo.SIN_HORA,
+                 f'"{columna}" es una hora válida')
+
+
+def hora_consistente(columna="Hora", columna_entera="Hora entera"):
+    '''
+    Regla: la hora entera coincide con la hora de la columna de horas (si esta es válida).
+    '''
+    def evaluar(particion):
+        segundos = particion.segundos(columna)
+        return (segundos != tiempo.SIN_HORA) & (particion.numeros(columna_entera) != segundos // 3600)
+    return Regla(f"hora consistente {columna_entera}", (columna, columna_entera), evaluar,
+                 f'"{columna_entera}" es la hora de "{columna}"')
+
+
+def dentro_de_caja(columnas=espacial.COLUMNAS_COORDENADAS, lon=LIMITES_LON, lat=LIMITES_LAT, faltantes=True):
+    '''
+    Regla: la coordenada está dentro de la caja de CABA.
+
+    Parámetros:
+        columnas (tuple): Las columnas de longitud y latitud.
+        lon, lat (tuple): Los límites (mínimo, máximo) de cada una.
+        faltantes (bool): Si se aceptan las coordenadas faltantes (el ETL guarda 0 cuando el
+            punto es "Point (. .)"; ver espacial.coordenadas_validas).
+
+    Retorna:
+        Regla: La regla.
+    '''
+    def evaluar(particion):
+        x, y = particion.numeros(columnas[0]), particion.numeros(columnas[1])
+        with np.errstate(invalid="ignore"):
+            fuera = ~((x >= lon[0]) & (x <= lon[1]) & (y >= lat[0]) & (y <= lat[1]))
+        return fuera & espacial.coordenadas_validas(x, y) if faltantes else fuera
+    return Regla(f"caja CABA {columnas[0]}/{columnas[1]}", columnas, evaluar,
+                 f"coordenadas dentro de lon {lon} y lat {lat}")
+
+
+def unico(columnas):
+    '''
+    Regla: la combinación de columnas no se repite. Se evalúa dentro de cada partición (con el
+    dataset particionado por año alcanza para el Id de HECHOS); para todo el historial ver
+    duplicados.py.
+    '''
+    columnas = [columnas] if isinstance(columnas, str) else list(columnas)
+    return Regla(f"único {', '.join(columnas)}", columnas,
+                 lambda p: p.df.duplicated(columnas, keep="first").to_numpy(), "sin repetir en la partición")
+
+
+# Reglas de homicidios_cleaned (después de la imputación y de agrupar las víctimas en "OTRO")
+REGLAS = [
+    formato_id("Id"),
+    hora_valida("Hora"),
+    hora_consistente("Hora", "Hora entera"),
+    rango("Edad", 0, 110),
+    rango("Comuna", 1, 15),
+    rango("Mes", 1, 12),
+    rango("Día", 1, 31),
+    dentro_de_caja(),
+    categorias("Rol", ["CICLISTA", "CONDUCTOR", "PASAJERO_ACOMPAÑANTE", "PEATON"]),
+    categorias("Sexo", ["FEMENINO", "MASCULINO"]),
+    categorias("Tipo de calle", ["AUTOPISTA", "AVENIDA", "CALLE", "GRAL PAZ"]),
+    categorias("Cruce", ["NO", "SI"]),
+    categorias("Víctima", ["AUTO", "BICICLETA", "CARGAS", "MOTO", "MOVIL", "OTRO", "PASAJEROS", "PEATON", "SD"]),
+    categorias("Acusado", ["AUTO", "BICICLETA", "CARGAS", "MOTO", "MULTIPLE", "OBJETO FIJO", "OTRO", "PASAJEROS",
+                           "SD", "TREN"]),
+]
+
+
+def _particiones(datos, columnas):
+    # Un DataFrame, un iterable de DataFrames, un CSV (por bloques) o un dataset Parquet (por lotes)
+    if isinstance(datos, pd.DataFrame):
+        yield datos
+    elif isinstance(datos, str) and datos.endswith(".csv"):
+        yield from pd.read_csv(datos, usecols=lambda c: c in columnas, chunksize=TAMAÑO_PARTICION)
+    elif isinstance(datos, str):
+        import pyarrow.dataset as ds
+        import esquema
+        dataset = ds.dataset(datos, format="parquet", partitioning=esquema.PARTICIONADO)
+        for lote in dataset.to_batches(columns=[c for c in dataset.schema.names if c in columnas],
+                                       batch_size=TAMAÑO_PARTICION):
+            yield lote.to_pandas()
+    else:
+        yield from datos
+
+
+def validar(datos, reglas=None, muestra=5):
+    '''
+    Evalúa las reglas de calidad sobre los datos en una sola pasada por particiones.
+
+    Parámetros:
+        datos (pandas.DataFrame, iterable o str): Los datos: un DataFrame, un iterable de
+            DataFrames, la ruta de un CSV o la carpeta del dataset Parquet. De los archivos solo
+            se leen las columnas que usan las reglas.
+        reglas (list): Las reglas (ver Regla). Por defecto, REGLAS.
+        muestra (int): La cantidad máxima de filas que violan cada regla que se guardan.
+
+    Retorna:
+        tuple: Un pandas.DataFrame con una fila por regla (columnas de COLUMNAS_RESUMEN) y un
+        diccionario con las filas de muestra de cada regla violada (sus columnas, con el número
+        de fila global como índice).
+
+    Ejemplo:
+        resumen, muestras = validar(victimas, [referencia("Id", hechos["Id"]), rango("Edad", 0, 110, nulos=True)])
+    '''
+    reglas = REGLAS if reglas is None else list(reglas)
+    nombres = [r.nombre for r in reglas]
+    if len(set(nombres)) != len(nombres):
+        raise ValueError(f"Hay reglas con el mismo nombre: {nombres}")
+    columnas = {c for r in reglas for c in r.columnas}
+
+    violaciones = dict.fromkeys(nombres, 0)
+    muestras = {nombre: [] for nombre in nombres}
+    filas = 0
+    for df in _particiones(datos, columnas):
+        faltantes = [c for r in reglas for c in r.columnas if c not in df.columns]
+        if faltantes:
+            raise KeyError(f"Faltan las columnas {sorted(set(faltantes))}")
+        particion = Particion(df)
+        for r in reglas:
+            mascara = np.asarray(r.evaluar(particion), dtype=bool)
+            cantidad = int(np.count_nonzero(mascara))
+            violaciones[r.nombre] += cantidad
+            faltan = muestra - sum(len(m) for m in muestras[r.nombre])
+            if cantidad and faltan > 0:
+                posiciones = np.flatnonzero(mascara)[:faltan]
+                ejemplo = df.iloc[posiciones][list(r.columnas)]
+                muestras[r.nombre].append(ejemplo.set_axis(filas + posiciones).rename_axis("fila"))
+        filas += len(df)
+
+    resumen = pd.DataFrame({"regla": nombres, "descripcion": [r.descripcion for r in reglas],
+                            "columnas": [", ".join(r.columnas) for r in reglas], "filas": filas,
+                            "violaciones": [violaciones[n] for n in nombres]})
+    resumen["violaciones_%"] = 100 * resumen["violaciones"] / filas if filas else 0.0
+    return resumen, {n: pd.concat(m) for n, m in muestras.items() if m}
@@ -0,0 +1,173 @@
+## COMPACTACIÓN DE TIPOS DEL DATASET DE HOMICIDIOS
+# Reduce la memoria de homicidios_cleaned: los enteros pasan a int8/int16 y las columnas de texto con
+# pocos valores distintos a pandas.Categorical con un diccionario global y estable (guardado en
+# datasets/categorias.json). Como todas las particiones usan las mismas categorías, en el mismo orden,
+# pd.concat conserva el tipo categórico sin volver a codificar. Los valores nuevos se agregan al final
+# del diccionario, de modo que los códigos de los valores existentes nunca cambian.
+# Importaciones
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+import derivadas
+import tiempo
+
+
+RUTA_DICCIONARIO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "datasets", "categorias.json")
+
+# Columnas de texto codificadas con el diccionario global
+COLUMNAS_CATEGORICAS = ["Rol", "Sexo", "Tipo de calle", "Cruce", "Participantes", "Víctima", "Acusado"]
+
+# Las variables derivadas tienen categorías fijas (ver derivadas.py): (categorías, ordenadas)
+CATEGORIAS_DERIVADAS = {
+    "Tipo de día": (derivadas.TIPOS_DIA, False),
+    "Nombre día": (derivadas.DIAS_SEMANA, True),
+    "Categoria tiempo": (tiempo.MOMENTOS_DIA, True),
+}
+
+# Tipo de cada columna entera (los mismos que en ESQUEMA de esquema.py)
+ENTEROS = {"Edad": "int16", "Cantidad víctimas": "int16", "Año": "int16", "Mes": "int8", "Día": "int8",
+           "Hora entera": "int8", "Comuna": "int8", "Día semana": "int8", "Hora del día": "int8"}
+
+
+def cargar_diccionario(ruta=RUTA_DICCIONARIO):
+    '''
+    Lee el diccionario global de categorías.
+
+    Parámetros:
+        ruta (str): La ruta del archivo JSON.
+
+    Retorna:
+        dict: Para cada columna de COLUMNAS_CATEGORICAS, la lista de sus valores en orden de código.
+    '''
+    with open(ruta, encoding="utf-8") as archivo:
+        return json.load(archivo)
+
+
+def guardar_diccionario(diccionario, ruta=RUTA_DICCIONARIO):
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(diccionario, archivo, indent=2, ensure_ascii=False)
+        archivo.write("\n")
+
+
+def tipo_categorico(columna, diccionario):
+    '''
+    Retorna:
+        pandas.CategoricalDtype: El tipo categórico de la columna según el diccionario global (o las
+        categorías fijas si es una variable derivada).
+    '''
+    if columna in CATEGORIAS_DERIVADAS:
+        categorias, ordenadas = CATEGORIAS_DERIVADAS[columna]
+        return pd.CategoricalDtype(categorias, ordered=ordenadas)
+    return pd.CategoricalDtype(diccionario[columna])
+
+
+def extender_diccionario(df, diccionario):
+    '''
+    Agrega al final del diccionario los valores de df que todavía no tiene (ordenados entre sí).
+
+    Retorna:
+        bool: Si el diccionario cambió.
+    '''
+    cambio = False
+    for columna in COLUMNAS_CATEGORICAS:
+        if columna not in df.columns:
+            continue
+        serie = df[columna]
+        valores = serie.cat.categories[np.unique(serie.cat.codes[serie.cat.codes >= 0])] \
+            if isinstance(serie.dtype, pd.CategoricalDtype) else serie.dropna().unique()
+        conocidos = set(diccionario.setdefault(columna, []))
+        nuevos = sorted(str(v) for v in valores if str(v) not in conocidos)
+        if nuevos:
+            diccionario[columna].extend(nuevos)
+            cambio = True
+    return cambio
+
+
+def categorizar(serie, tipo):
+    '''
+    Convierte una columna al tipo categórico indicado; si ya es categórica solo se recodifica.
+
+    Los valores que no estén entre las categorías quedan como nulos (ver extender_diccionario).
+    '''
+    # La igualdad de tipos categóricos sin orden no tiene en cuenta el orden de las categorías
+    if serie.dtype == tipo and serie.cat.categories.equals(tipo.categories):
+        return serie
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        # set_categories recodifica por valor, sin convertir la columna a texto
+        return serie.cat.set_categories(tipo.categories).cat.set_categories(tipo.categories, ordered=tipo.ordered)
+    return serie.astype(tipo)
+
+
+def _entero(serie, tipo):
+    # Reducimos el entero solo si no hay nulos ni decimales y todos los valores entran en el tipo
+    if not pd.api.types.is_numeric_dtype(serie.dtype) or isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie
+    valores = serie.to_numpy()
+    if pd.api.types.is_float_dtype(serie.dtype) and (np.isnan(valores).any() or (valores % 1 != 0).any()):
+        return serie
+    limites = np.iinfo(tipo)
+    if len(valores) and (valores.min() < limites.min or valores.max() > limites.max):
+        return serie
+    return serie.astype(tipo)
+
+
+def compactar(df, diccionario=None, ruta=RUTA_DICCIONARIO, guardar=True, informar=False):
+    '''
+    Compacta los tipos de un DataFrame de homicidios sin modificar el original.
+
+    Los enteros de ENTEROS se reducen a int8/int16 (si tienen nulos o valores fuera de rango se
+    dejan como están), las columnas de COLUMNAS_CATEGORICAS pasan a Categorical con el diccionario
+    global y las variables derivadas categóricas recuperan sus categorías fijas y su orden. Las
+    demás columnas (Id, fechas, horas, calles y coordenadas) no cambian, así que todas las
+    funciones de tools funcionan igual sobre el resultado. Puede usarse como etapa del pipeline.
+
+    Parámetros:
+        df (pandas.DataFrame): El DataFrame de homicidios (o un bloque o partición).
+        diccionario (dict): El diccionario global. Por defecto se lee de ruta.
+        ruta (str): El archivo del diccionario.
+        guardar (bool): Si df trae valores nuevos, si se guarda el diccionario extendido en ruta.
+        informar (bool): Si se imprime la memoria antes y después.
+
+    Retorna:
+        pandas.DataFrame: El DataFrame compacto.
+    '''
+    if diccionario is None:
+        diccionario = cargar_diccionario(ruta)
+    if extender_diccionario(df, diccionario) and guardar:
+        guardar_diccionario(diccionario, ruta)
+
+    columnas = {}
+    for columna in df.columns:
+        if columna in ENTEROS:
+            columnas[columna] = _entero(df[columna], ENTEROS[columna])
+        elif columna in COLUMNAS_CATEGORICAS or columna in CATEGORIAS_DERIVADAS:
+            columnas[columna] = categorizar(df[columna], tipo_categorico(columna, diccionario))
+    compacto = df.assign(**columnas)
+
+    if informar:
+        antes, despues = df.memory_usage(deep=True).sum(), compacto.memory_usage(deep=True).sum()
+        print(f"Memoria: {antes / 1024 ** 2:.2f} MB -> {despues / 1024 ** 2:.2f} MB ({antes / despues:.1f} veces menos)")
+    return compacto
+
+
+def informe_memoria(antes, despues):
+    '''
+    Compara la memoria de cada columna antes y después de compactar.
+
+    Parámetros:
+        antes (pandas.DataFrame): El DataFrame original.
+        despues (pandas.DataFrame): El DataFrame compacto.
+
+    Retorna:
+        pandas.DataFrame: Por columna, los tipos, los MB antes y después y la reducción, con una
+        fila "Total" al final.
+    '''
+    informe = pd.DataFrame({"tipo_antes": antes.dtypes.astype(str), "tipo_despues": despues.dtypes.astype(str),
+                            "MB_antes": antes.memory_usage(deep=True, index=False) / 1024 ** 2,
+                            "MB_despues": despues.memory_usage(deep=True, index=False) / 1024 ** 2})
+    informe.loc["Total"] = ["", "", informe["MB_antes"].sum(), informe["MB_despues"].sum()]
+    informe["reduccion"] = informe["MB_antes"] / informe["MB_despues"]
+    return informe.rename_axis("columna")
@@ -0,0 +1,275 @@
+## CUBO DE AGREGACIÓN PARA LOS GRÁFICOS DEL EDA
+# El cubo puede construirse desde un DataFrame en memoria o desde el dataset Parquet particionado con
+# distintos motores (ver MOTORES): solo los cuboides agregados, de pocas filas, llegan a pandas.
+# Importaciones
+import numpy as np
+import pandas as pd
+
+import derivadas
+
+
+# Cuboides base por defecto: uno por cada grupo de dimensiones que se consultan juntas en los gráficos de
+# tools.graficos (accidentes_mensuales, victimas_por_dia_semana, accidentes_por_horas_del_dia,
+# victimas_sexo_rol_victima, ...). Un único cuboide con todas las dimensiones tendría casi una fila por hecho.
+CUBOIDES = [["Año", "Mes"], ["Día semana"], ["Hora del día"], ["Sexo", "Rol", "Víctima"], ["Acusado"],
+            ["Participantes"], ["Tipo de calle", "Cruce", "Comuna"]]
+
+# Dimensiones por las que agrupan los gráficos de tools.graficos
+DIMENSIONES = list(dict.fromkeys(sum(CUBOIDES, [])))
+
+# Medidas aditivas: cantidad de filas (víctimas) y suma de "Cantidad víctimas"
+MEDIDAS = ["Filas", "Cantidad víctimas"]
+
+
+def _plano(indice):
+    # Las claves categóricas se guardan como valores simples para poder combinar lotes
+    if isinstance(indice, pd.MultiIndex):
+        niveles = [indice.get_level_values(i) for i in range(indice.nlevels)]
+        niveles = [n.astype(object) if isinstance(n.dtype, pd.CategoricalDtype) else n for n in niveles]
+        return pd.MultiIndex.from_arrays(niveles, names=indice.names)
+    if isinstance(indice.dtype, pd.CategoricalDtype):
+        return indice.astype(object)
+    return indice
+
+
+def agregar(df, dimensiones):
+    '''
+    Calcula las medidas del cubo agrupando un DataFrame por las dimensiones indicadas.
+
+    Las dimensiones derivadas ("Día semana", "Hora del día", etc.) se leen de df si están
+    materializadas o se calculan sin modificarlo. Los valores nulos forman su propio grupo para
+    que los totales coincidan con la cantidad de filas.
+
+    Parámetros:
+        df (pandas.DataFrame): El DataFrame de homicidios (o un lote del mismo).
+        dimensiones (list): Columnas por las que agrupar.
+
+    Retorna:
+        pandas.DataFrame: Una fila por combinación de dimensiones con las columnas de MEDIDAS.
+    '''
+    claves = [derivadas.obtener_derivada(df, d) if d in derivadas.CALCULOS else df[d] for d in dimensiones]
+    valores = pd.DataFrame({"Filas": np.ones(len(df), dtype=np.int64),
+                            "Cantidad víctimas": df["Cantidad víctimas"].to_numpy(dtype=np.int64)},
+                           index=df.index)
+    if not claves:
+        return valores.sum().to_frame().T
+    tabla = valores.groupby(claves, observed=True, dropna=False).sum()
+    tabla.index = _plano(tabla.index)
+    return tabla
+
+
+def _enrollar(tabla, dimensiones):
+    # Pasa de un cuboide a otro con menos dimensiones sumando sobre las que sobran
+    if not dimensiones:
+        return tabla.sum().to_frame().T
+    return tabla.groupby(level=list(dimensiones), dropna=False).sum()
+
+
+def _sumar(a, b):
+    # Combina dos cuboides con las mismas dimensiones (los grupos nuevos se agregan)
+    if a.index.nlevels == 1 and a.index.name is None:
+        return a + b.to_numpy()
+    niveles = list(range(a.index.nlevels))
+    return pd.concat([a, b]).groupby(level=niveles, dropna=False).sum()
+
+
+def _base_pandas(dataset, dimensiones, filtro):
+    # Motor "pandas": recorre el dataset por lotes y suma los cuboides de cada lote (un solo núcleo)
+    columnas = list(dict.fromkeys(list(dimensiones) + ["Cantidad víctimas"]))
+    base = None
+    for lote in dataset.to_batches(columns=columnas, filter=filtro):
+        if lote.num_rows:
+            parcial = agregar(lote.to_pandas(), dimensiones)
+            base = parcial if base is None else _sumar(base, parcial)
+    return base
+
+
+def _base_arrow(dataset, dimensiones, filtro):
+    # Motor "arrow": plan de Acero (lectura, filtro y agregación por hash) que procesa los archivos en
+    # flujo y en paralelo con todos los núcleos, sin materializar la tabla completa
+    import pyarrow as pa
+    import pyarrow.acero as ac
+    import pyarrow.compute as pc
+
+    columnas = list(dict.fromkeys(list(dimensiones) + ["Cantidad víctimas"]))
+    # Las claves de diccionario se agrupan como texto: los archivos escritos antes del diccionario
+    # global (ver compactacion.py) pueden tener diccionarios distintos
+    proyeccion = [pc.field(c).cast(pa.string()) if pa.types.is_dictionary(dataset.schema.field(c).type)
+                  else pc.field(c) for c in columnas]
+    prefijo = "hash_" if dimensiones else ""
+    etapas = [ac.Declaration("scan", ac.ScanNodeOptions(dataset, columns=columnas, filter=filtro))]
+    if filtro is not None:
+        # El scan solo descarta archivos y grupos de filas; el filtro por fila lo aplica este nodo
+        etapas.append(ac.Declaration("filter", ac.FilterNodeOptions(filtro)))
+    etapas += [ac.Declaration("project", ac.ProjectNodeOptions(proyeccion, columnas)),
+               ac.Declaration("aggregate", ac.AggregateNodeOptions(
+                   [([], f"{prefijo}count_all", None, "Filas"),
+                    ("Cantidad víctimas", f"{prefijo}sum", None, "Cantidad víctimas")],
+                   keys=list(dimensiones)))]
+    tabla = ac.Declaration.from_sequence(etapas).to_table(use_threads=True)
+
+    base = tabla.to_pandas()
+    if not dimensiones:
+        return base[MEDIDAS].astype(np.int64) if base["Filas"].iloc[0] else None
+    if base.empty:
+        return None
+    # Mismo formato que el motor "pandas": claves ordenadas (nulos al final) y medidas int64
+    base = base.set_index(list(dimensiones)).sort_index()[MEDIDAS].astype(np.int64)
+    base.index = _plano(base.index)
+    return base
+
+
+# Motores para construir el cubo desde el dataset Parquet: nombre -> función(dataset, dimensiones,
+# filtro) que devuelve el cuboide base (o None si no hay filas)
+MOTORES = {
+    "pandas": _base_pandas,
+    "arrow": _base_arrow,
+}
+
+
+class CuboAgregado:
+    '''
+    Cubo de agregación mantenido de forma incremental sobre la tabla de víctimas.
+
+    Guarda uno o varios cuboides base y, a medida que se consultan, los cuboides de menos
+    dimensiones (rollups) que se obtienen del cuboide base más chico que las contiene. Cada
+    rollup consultado queda materializado, así que las consultas siguientes son una búsqueda
+    en un diccionario. Al agregar un lote, solo se agrega ese lote y se suma su resultado a los
+    cuboides base y a los rollups existentes, sin volver a recorrer el historial.
+
+    Con muchas dimensiones, un único cuboide base tiene casi tantas filas como hechos (cada
+    combinación de año, mes, hora, comuna, etc. es única) y no ahorra nada; por eso, por
+    defecto, se mantiene un cuboide base por cada grupo de CUBOIDES. Las consultas que
+    combinan dimensiones de cuboides distintos no pueden responderse.
+
+    Parámetros:
+        dimensiones (list): Las dimensiones de un único cuboide base. Se ignora si se indica cuboides.
+        cuboides (list): Lista de listas de dimensiones, una por cuboide base. Si no se indica
+            ninguno de los dos parámetros, CUBOIDES.
+    '''
+
+    def __init__(self, dimensiones=None, cuboides=None):
+        if cuboides is None:
+            cuboides = CUBOIDES if dimensiones is None else [dimensiones]
+        self.bases = {tuple(d): None for d in cuboides}
+        self.dimensiones = list(dict.fromkeys(d for dimensiones in self.bases for d in dimensiones))
+        self.cuboides = {}
+        self.consultas = {}
+        self.filas = 0
+
+    @classmethod
+    def desde_dataframe(cls, df, dimensiones=None, cuboides=None):
+        '''
+        Construye el cubo a partir de un DataFrame completo.
+        '''
+        cubo = cls(dimensiones, cuboides)
+        cubo.agregar(df)
+        return cubo
+
+    @classmethod
+    def desde_parquet(cls, ruta, dimensiones=None, filtros=None, motor="arrow", cuboides=None):
+        '''
+        Construye el cubo desde el dataset Parquet sin cargarlo completo en memoria.
+
+        Cada cuboide base se calcula con su propia lectura del dataset, que solo trae sus columnas.
+
+        Parámetros:
+            ruta (str): Carpeta raíz del dataset.
+            dimensiones (list): Las dimensiones de un único cuboide base.
+            filtros (list): Filtros en la forma de pyarrow, por ejemplo [("Año", ">=", 2019)].
+            motor (str): Una de las claves de MOTORES. "arrow" (por defecto) agrega en paralelo con
+                todos los núcleos; "pandas" recorre los lotes de a uno.
+            cuboides (list): Las dimensiones de cada cuboide base (ver CuboAgregado).
+
+        Retorna:
+            CuboAgregado: El cubo con los cuboides base calculados.
+        '''
+        if motor not in MOTORES:
+            raise ValueError(f"Motor desconocido: {motor!r}. Opciones: {list(MOTORES)}")
+        # pyarrow solo se requiere para leer el dataset columnar
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+        import esquema
+
+        dataset = ds.dataset(ruta, format="parquet", partitioning=esquema.PARTICIONADO,
+                             schema=esquema.ESQUEMA)
+        filtro = pq.filters_to_expression(filtros) if filtros else None
+        cubo = cls(dimensiones, cuboides)
+        for dimensiones_base in cubo.bases:
+            cubo.bases[dimensiones_base] = MOTORES[motor](dataset, list(dimensiones_base), filtro)
+        base = next(iter(cubo.bases.values()))
+        if base is not None:
+            cubo.filas = int(base["Filas"].sum())
+        return cubo
+
+    def _base_de(self, dimensiones):
+        # El cuboide base con menos dimensiones que contiene a todas las pedidas (el primero, si empatan)
+        candidatas = [b for b in self.bases if set(dimensiones) <= set(b)]
+        if not candidatas:
+            raise KeyError(f"Ningún cuboide base contiene las dimensiones {list(dimensiones)}: "
+                           f"{[list(b) for b in self.bases]}")
+        return min(candidatas, key=len)
+
+    def agregar(self, lote):
+        '''
+        Incorpora un lote de filas nuevas al cubo en tiempo proporcional al tamaño del lote.
+
+        Parámetros:
+            lote (pandas.DataFrame): Filas nuevas con las columnas de las dimensiones y "Cantidad víctimas".
+
+        Retorna:
+            CuboAgregado: El mismo cubo, para encadenar llamadas.
+        '''
+        if len(lote) == 0:
+            return self
+        parciales = {b: agregar(lote, list(b)) for b in self.bases}
+        for b, parcial in parciales.items():
+            self.bases[b] = parcial if self.bases[b] is None else _sumar(self.bases[b], parcial)
+        for dimensiones, tabla in self.cuboides.items():
+            self.cuboides[dimensiones] = _sumar(tabla, _enrollar(parciales[self._base_de(dimensiones)], dimensiones))
+        self.consultas.clear()
+        self.filas += len(lote)
+        return self
+
+    def consultar(self, dimensiones, medida="Filas"):
+        '''
+        Devuelve una medida agrupada por un subconjunto de las dimensiones del cubo.
+
+        Parámetros:
+            dimensiones (list): Dimensiones del resultado, en el orden deseado.
+            medida (str): "Filas" o "Cantidad víctimas".
+
+        Retorna:
+            pandas.Series: La medida indexada por las dimensiones pedidas (no debe modificarse).
+        '''
+        dimensiones = tuple(dimensiones)
+        clave = (dimensiones, medida)
+        if clave in self.consultas:
+            return self.consultas[clave]
+
+        faltantes = [d for d in dimensiones if d not in self.dimensiones]
+        if faltantes:
+            raise KeyError(f"Dimensiones fuera del cubo: {faltantes}")
+        if medida not in MEDIDAS:
+            raise KeyError(f"Medida desconocida: {medida!r}. Opciones: {MEDIDAS}")
+        base = self.bases[self._base_de(dimensiones)]
+        if base is None:
+            raise ValueError("El cubo está vacío; agregue un lote antes de consultar")
+        if dimensiones not in self.cuboides:
+            self.cuboides[dimensiones] = _enrollar(base, dimensiones)
+        self.consultas[clave] = self.cuboides[dimensiones][medida]
+        return self.consultas[clave]
+
+    def materializar(self, lista_dimensiones):
+        '''
+        Precalcula varios rollups para que las consultas del tablero no tengan que calcularlos.
+
+        Parámetros:
+            lista_dimensiones (list): Lista de listas de dimensiones, por ejemplo [["Año", "Mes"], ["Sexo"]].
+
+        Retorna:
+            CuboAgregado: El mismo cubo, para encadenar llamadas.
+        '''
+        for dimensiones in lista_dimensiones:
+            self.consultar(dimensiones)
+        return self
@@ -0,0 +1,103 @@
+## VARIABLES DERIVADAS DE CALENDARIO Y HORA
+# Importaciones
+import numpy as np
+import pandas as pd
+
+import tiempo
+
+
+DIAS_SEMANA = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
+TIPOS_DIA = ["Semana", "Fin de Semana"]
+
+
+def _dia_semana(df):
+    # Día de la semana como int8 (0 = lunes, 6 = domingo); -1 si la fecha falta
+    fechas = df["Fecha"]
+    if not pd.api.types.is_datetime64_any_dtype(fechas.dtype):
+        fechas = pd.to_datetime(fechas, errors="coerce")
+    dias = fechas.dt.dayofweek
+    return dias.fillna(-1).to_numpy(dtype=np.int8)
+
+
+def _tipo_dia(df):
+    dias = obtener_derivada(df, "Día semana").to_numpy()
+    codigos = np.where(dias >= 0, (dias >= 5).astype(np.int8), -1)
+    return pd.Categorical.from_codes(codigos, TIPOS_DIA)
+
+
+def _nombre_dia(df):
+    dias = obtener_derivada(df, "Día semana").to_numpy()
+    return pd.Categorical.from_codes(dias, DIAS_SEMANA, ordered=True)
+
+
+def _segundos(df):
+    return tiempo.hora_a_segundos(df["Hora"])
+
+
+def _hora_del_dia(df):
+    return tiempo.hora(_segundos(df))
+
+
+def _categoria_tiempo(df):
+    if "Hora del día" in df.columns:
+        # Si la hora entera ya está materializada evitamos volver a interpretar "Hora"
+        horas = df["Hora del día"].to_numpy(dtype=np.int32)
+        segundos = np.where(horas >= 0, horas * 3600, tiempo.SIN_HORA)
+    else:
+        segundos = _segundos(df)
+    return pd.Categorical.from_codes(tiempo.codigos_momento_dia(segundos), tiempo.MOMENTOS_DIA, ordered=True)
+
+
+# Cada variable derivada, en orden de dependencia, con la función que la calcula
+CALCULOS = {
+    "Día semana": _dia_semana,
+    "Tipo de día": _tipo_dia,
+    "Nombre día": _nombre_dia,
+    "Hora del día": _hora_del_dia,
+    "Categoria tiempo": _categoria_tiempo,
+}
+
+COLUMNAS_DERIVADAS = list(CALCULOS)
+
+
+def obtener_derivada(df, columna):
+    '''
+    Devuelve una variable derivada, leyéndola del DataFrame si ya está materializada.
+
+    Si la columna no existe se calcula de forma vectorizada sin modificar df, de modo que las
+    funciones de gráficos pueden usarla sin efectos secundarios sobre el DataFrame del usuario.
+
+    Parámetros:
+        df (pandas.DataFrame): El DataFrame de homicidios.
+        columna (str): Una de las columnas de COLUMNAS_DERIVADAS.
+
+    Retorna:
+        pandas.Series: La variable derivada alineada con el índice de df.
+    '''
+    if columna in df.columns:
+        return df[columna]
+    if columna not in CALCULOS:
+        raise KeyError(f"Variable derivada desconocida: {columna!r}. Opciones: {COLUMNAS_DERIVADAS}")
+    return pd.Series(CALCULOS[columna](df), index=df.index, name=columna)
+
+
+def materializar_derivadas(df, columnas=None):
+    '''
+    Calcula una sola vez las variables de calendario y de hora del día y las agrega a df.
+
+    Las variables son compactas: "Día semana" y "Hora del día" son int8 (-1 si falta el dato) y
+    "Tipo de día", "Nombre día" y "Categoria tiempo" son categóricas. Las columnas que ya existen
+    no se recalculan. El dataset Parquet (ver esquema.py) las guarda junto al resto de las
+    columnas, así que al cargarlo no es necesario volver a calcularlas.
+
+    Parámetros:
+        df (pandas.DataFrame): El DataFrame de homicidios, con las columnas "Fecha" y "Hora".
+        columnas (list): Las variables a materializar. Por defecto, todas.
+
+    Retorna:
+        pandas.DataFrame: El mismo DataFrame con las variables derivadas agregadas.
+    '''
+    for columna in columnas or COLUMNAS_DERIVADAS:
+        if columna not in df.columns:
+            df[columna] = obtener_derivada(df, columna)
+    return df
@@ -0,0 +1,306 @@
+## DETECCIÓN DE DUPLICADOS POR HUELLAS DE 64 BITS
+# Importaciones
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+import ids
+
+# pyarrow es opcional: permite calcular las huellas de texto directamente sobre los buffers
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+# Cantidad de particiones en disco del modo por bloques
+PARTICIONES = 64
+
+# Registro guardado en disco por cada fila: huella, número de fuente y posición global de la fila
+REGISTRO = np.dtype([("huella", np.uint64), ("fuente", np.int32), ("fila", np.int64)])
+
+# Tabla de valores aleatorios por byte y multiplicador del hash polinomial de los textos
+_TABLA_BYTES = np.random.default_rng(20231).integers(1, 2 ** 63, size=256, dtype=np.uint64) | np.uint64(1)
+_BASE = np.uint64(0x100000001B3)
+_HUELLA_NULO = np.uint64(0x9E3779B97F4A7C15)
+
+# Abreviaturas unificadas al normalizar direcciones
+ABREVIATURAS = {
+    r"\bAVENIDA\b": "AV",
+    r"\bAUTOPISTA\b": "AU",
+    r"\bGENERAL\b": "GRAL",
+    r"\bPRESIDENTE\b": "PRES",
+    r"\bDOCTOR\b": "DR",
+}
+
+
+def normalizar_direccion(serie, por_cuadra=False):
+    '''
+    Normaliza direcciones para detectar casi duplicados.
+
+    Pasa a mayúsculas, quita tildes y signos de puntuación, unifica abreviaturas y espacios, y
+    ordena alfabéticamente las dos calles de un cruce ("A y B" y "B y A" quedan iguales).
+
+    Parámetros:
+        serie (pandas.Series): Las direcciones, por ejemplo "Dirección normalizada".
+        por_cuadra (bool): Si es True, la altura final se redondea a la centena (2384 -> 2300),
+            de modo que las direcciones de una misma cuadra coinciden.
+
+    Retorna:
+        pandas.Series: Las direcciones normalizadas (los nulos se mantienen).
+    '''
+    texto = serie.astype("string").str.upper()
+    texto = texto.str.normalize("NFKD").str.encode("ascii", errors="ignore").str.decode("ascii")
+    texto = texto.str.replace(r"[^\w\s]", " ", regex=True)
+    for patron, reemplazo in ABREVIATURAS.items():
+        texto = texto.str.replace(patron, reemplazo, regex=True)
+    if por_cuadra:
+        texto = texto.str.replace(r"\s(\d+)\s*$", lambda m: f" {int(m.group(1)) // 100 * 100}", regex=True)
+    texto = texto.str.replace(r"\s+", " ", regex=True).str.strip()
+
+    # Cruces: ordenamos las dos calles para que el orden no importe
+    partes = texto.str.split(r" [YE] ", n=1, regex=True, expand=True)
+    if partes.shape[1] == 2:
+        a, b = partes[0], partes[1]
+        cruce = b.notna()
+        menor = a.where(~cruce | (a <= b), b)
+        mayor = b.where(~cruce | (a <= b), a)
+        texto = texto.where(~cruce, menor + " Y " + mayor)
+    return texto.astype(serie.dtype if pd.api.types.is_string_dtype(serie.dtype) else object)
+
+
+def _mezclar(h):
+    # Finalizador de splitmix64: distribuye los bits de la huella (aritmética módulo 2**64)
+    with np.errstate(over="ignore"):
+        h = (h ^ (h >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        h = (h ^ (h >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return h ^ (h >> np.uint64(31))
+
+
+def _huella_texto(serie):
+    # Hash polinomial de los bytes de cada texto, calculado en bloque sobre los buffers de Arrow
+    arreglo = pa.array(serie.astype("string"), type=pa.large_string(), from_pandas=True)
+    if isinstance(arreglo, pa.ChunkedArray):
+        arreglo = arreglo.combine_chunks()
+    nulos = arreglo.is_null().to_numpy(zero_copy_only=False)
+    _, buffer_offsets, buffer_datos = arreglo.buffers()
+    offsets = np.frombuffer(buffer_offsets, dtype=np.int64)[arreglo.offset:arreglo.offset + len(arreglo) + 1]
+    largos = np.diff(offsets)
+    inicio = offsets[0]
+    datos = np.frombuffer(buffer_datos, dtype=np.uint8)[inicio:offsets[-1]] if buffer_datos is not None \
+        else np.empty(0, dtype=np.uint8)
+
+    resultado = np.zeros(len(largos), dtype=np.uint64)
+    if len(datos):
+        # Cada byte pesa BASE**(posiciones hasta el final de su texto)
+        with np.errstate(over="ignore"):
+            potencias = np.cumprod(np.concatenate([[1], np.full(int(largos.max()) - 1, _BASE)]).astype(np.uint64))
+            fila = np.repeat(np.arange(len(largos)), largos)
+            exponente = offsets[1:][fila] - inicio - np.arange(len(datos)) - 1
+            terminos = _TABLA_BYTES[datos] * potencias[exponente]
+        con_datos = largos > 0
+        resultado[con_datos] = np.add.reduceat(terminos, (offsets[:-1] - inicio)[con_datos])
+    with np.errstate(over="ignore"):
+        resultado = _mezclar(resultado ^ (largos.astype(np.uint64) * _BASE))
+    resultado[nulos] = _HUELLA_NULO
+    return resultado
+
+
+def _huella_columna(serie):
+    # Huella de 64 bits de cada valor de una columna
+    if serie.dtype.kind in "biufmM" and not isinstance(serie.dtype, pd.CategoricalDtype):
+        valores = serie.to_numpy()
+        if valores.dtype.kind == "f":
+            # -0.0 y 0.0 son iguales; todos los NaN también
+            valores = np.where(valores == 0, 0.0, valores)
+            huella = _mezclar(valores.astype(np.float64).view(np.uint64))
+            huella[np.isnan(valores)] = _HUELLA_NULO
+            return huella
+        return _mezclar(valores.astype(np.int64).view(np.uint64))
+    if pa is not None:
+        return _huella_texto(serie)
+    return pd.util.hash_pandas_object(serie.astype("string"), index=False).to_numpy()
+
+
+def huellas(df, columnas, normalizar=None):
+    '''
+    Calcula una huella de 64 bits por fila a partir de una o varias columnas clave.
+
+    Los números se mezclan directamente y los textos se resumen con un hash polinomial sobre
+    sus bytes (en bloque, sin recorrer las filas en Python). Las columnas de texto y las de
+    números dan huellas distintas para el mismo valor ("1" y 1).
+
+    Parámetros:
+        df (pandas.DataFrame): El DataFrame.
+        columnas (str o list): La columna o las columnas clave.
+        normalizar (dict): Funciones a aplicar a cada columna antes de calcular la huella, por
+            ejemplo {"Dirección normalizada": normalizar_direccion}.
+
+    Retorna:
+        numpy.ndarray: Un arreglo uint64 con la huella de cada fila.
+    '''
+    columnas = [columnas] if isinstance(columnas, str) else list(columnas)
+    claves = _claves(df, columnas, normalizar)
+    resultado = np.zeros(len(claves), dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for columna in columnas:
+            resultado = _mezclar(resultado * _BASE + _huella_columna(claves[columna]))
+    return resultado
+
+
+def _claves(df, columnas, normalizar):
+    claves = df[columnas]
+    if normalizar:
+        claves = claves.assign(**{c: f(claves[c]) for c, f in normalizar.items() if c in columnas})
+    return claves
+
+
+def grupos_duplicados(df, columnas, normalizar=None):
+    '''
+    Encuentra los grupos de filas que comparten la misma clave.
+
+    Cada clave se convierte en un código entero exacto (factorizando cada columna) y los
+    grupos se cuentan con un solo bincount; solo las filas duplicadas se ordenan por clave. Al no usar huellas,
+    no hay colisiones posibles. Las filas con alguna clave nula no se consideran duplicadas
+    entre sí. La columna "Id" se compara por su código entero (ver ids.py) si todos los Id
+    tienen la forma "AAAA-NNNN", así que sus grupos quedan en orden de año y número.
+
+    Parámetros:
+        df (pandas.DataFrame): El DataFrame.
+        columnas (str o list): La columna o las columnas clave.
+        normalizar (dict): Funciones de normalización por columna (ver huellas), para detectar
+            casi duplicados como direcciones escritas de distinta forma.
+
+    Retorna:
+        pandas.DataFrame: Las filas duplicadas ordenadas por clave, con las columnas de df más
+        "grupo" (número de grupo) y "tamaño_grupo". Si no hay duplicados, el DataFrame está vacío
+        pero tiene las mismas columnas.
+    '''
+    columnas = [columnas] if isinstance(columnas, str) else list(columnas)
+    claves = _claves(df, columnas, normalizar)
+    if "Id" in columnas and "Id" not in (normalizar or {}):
+        # Con el Id empaquetado en un entero (ver ids.py) factorizamos y ordenamos enteros en lugar de textos
+        try:
+            claves = claves.assign(Id=ids.codificar(claves["Id"]))
+        except ValueError:
+            pass  # Hay Id nulos o con otro formato: usamos el texto
+
+    # Código entero exacto de cada clave: factorizamos cada columna y combinamos los códigos
+    codigos = np.zeros(len(claves), dtype=np.int64)
+    nulas = np.zeros(len(claves), dtype=bool)
+    for columna in columnas:
+        codigos_columna, unicos = pd.factorize(claves[columna], use_na_sentinel=True)
+        nulas |= codigos_columna < 0
+        codigos = codigos * (len(unicos) + 1) + codigos_columna + 1
+        if len(columnas) > 1:
+            # Volvemos a factorizar para que el código combinado no desborde
+            codigos = pd.factorize(codigos)[0]
+
+    # Solo las claves sin nulos que aparecen más de una vez
+    codigos[nulas] = -1
+    tamaños = np.bincount(codigos[~nulas]) if (~nulas).any() else np.array([], dtype=np.int64)
+    filas = np.flatnonzero(~nulas)
+    filas = filas[tamaños[codigos[filas]] > 1]
+
+    # Numeramos los grupos en el orden de las claves (solo se ordenan las filas duplicadas)
+    grupo = claves.iloc[filas].groupby(columnas, sort=True).ngroup().to_numpy()
+    orden = np.lexsort((filas, grupo))
+    resultado = df.iloc[filas[orden]].copy()
+    resultado["grupo"] = grupo[orden].astype(np.int64)
+    resultado["tamaño_grupo"] = np.bincount(grupo)[grupo[orden]].astype(np.int64) if len(grupo) else np.array([], dtype=np.int64)
+    return resultado
+
+
+def duplicados_por_bloques(fuentes, columnas, normalizar=None, particiones=PARTICIONES, directorio=None):
+    '''
+    Busca claves duplicadas en datos que no entran en memoria, leyéndolos por bloques.
+
+    Primera pasada: cada bloque se reduce a huellas de 64 bits que se reparten en particiones
+    en disco según la huella. Segunda pasada: cada partición (que sí entra en memoria) se
+    ordena y se buscan las huellas repetidas. Ambas pasadas son lineales en la cantidad de
+    filas; solo se guardan 20 bytes por fila. El resultado se basa en las huellas: con 64
+    bits la probabilidad de una colisión es despreciable incluso con cientos de millones de
+    filas, y los grupos pueden confirmarse luego por valor con grupos_duplicados. Como en
+    grupos_duplicados, las filas con alguna clave nula no se consideran duplicadas entre sí.
+
+    Parámetros:
+        fuentes (dict o iterable): Un iterable de bloques (DataFrames) o un diccionario
+            {nombre: iterable de bloques} para buscar duplicados entre varias fuentes, por
+            ejemplo HECHOS y VICTIMAS.
+        columnas (str, list o dict): Las columnas clave, o un diccionario {nombre: columnas}
+            cuando cada fuente las llama distinto.
+        normalizar (dict): Funciones de normalización por columna (ver huellas).
+        particiones (int): Cantidad de particiones en disco.
+        directorio (str): Carpeta para las particiones. Por defecto, una carpeta temporal que se
+            borra al terminar.
+
+    Retorna:
+        pandas.DataFrame: Una fila por aparición de una clave duplicada, con las columnas
+        "fuente", "fila" (posición de la fila dentro de su fuente), "huella", "grupo" y
+        "tamaño_grupo", ordenadas por grupo.
+    '''
+    if not isinstance(fuentes, dict):
+        fuentes = {None: fuentes}
+    nombres = list(fuentes)
+    temporal = directorio is None
+    directorio = tempfile.mkdtemp(prefix="duplicados_") if temporal else directorio
+    os.makedirs(directorio, exist_ok=True)
+    rutas = [os.path.join(directorio, f"particion-{p:04d}.bin") for p in range(particiones)]
+
+    try:
+        archivos = [open(ruta, "wb") for ruta in rutas]
+        try:
+            for numero, nombre in enumerate(nombres):
+                clave = columnas[nombre] if isinstance(columnas, dict) else columnas
+                inicio = 0
+                clave = [clave] if isinstance(clave, str) else list(clave)
+                for bloque in fuentes[nombre]:
+                    # Las filas con alguna clave nula no se escriben (todas tendrían la misma huella)
+                    claves = _claves(bloque, clave, normalizar)
+                    filas = np.flatnonzero(claves.notna().all(axis=1).to_numpy())
+                    registros = np.empty(len(filas), dtype=REGISTRO)
+                    registros["huella"] = huellas(claves if len(filas) == len(claves) else claves.iloc[filas], clave)
+                    registros["fuente"] = numero
+                    registros["fila"] = inicio + filas
+                    inicio += len(bloque)
+                    # Repartimos el bloque entre las particiones con un solo ordenamiento estable
+                    destino = (registros["huella"] % np.uint64(particiones)).astype(np.int64)
+                    orden = np.argsort(destino, kind="stable")
+                    cortes = np.searchsorted(destino[orden], np.arange(particiones + 1))
+                    for p in np.flatnonzero(np.diff(cortes)):
+                        registros[orden[cortes[p]:cortes[p + 1]]].tofile(archivos[p])
+        finally:
+            for archivo in archivos:
+                archivo.close()
+
+        resultados = []
+        for ruta in rutas:
+            registros = np.fromfile(ruta, dtype=REGISTRO)
+            if len(registros) < 2:
+                continue
+            registros = registros[np.argsort(registros["huella"], kind="stable")]
+            h = registros["huella"]
+            # Una huella está repetida si es igual a la anterior o a la siguiente
+            repetida = np.zeros(len(h), dtype=bool)
+            iguales = h[1:] == h[:-1]
+            repetida[1:] |= iguales
+            repetida[:-1] |= iguales
+            if repetida.any():
+                resultados.append(registros[repetida])
+    finally:
+        if temporal:
+            shutil.rmtree(directorio, ignore_errors=True)
+
+    registros = np.concatenate(resultados) if resultados else np.empty(0, dtype=REGISTRO)
+    _, grupo, tamaños = np.unique(registros["huella"], return_inverse=True, return_counts=True)
+    orden = np.lexsort((registros["fila"], registros["fuente"], grupo))
+    return pd.DataFrame({
+        "fuente": np.array(nombres, dtype=object)[registros["fuente"][orden]],
+        "fila": registros["fila"][orden],
+        "huella": registros["huella"][orden],
+        "grupo": grupo[orden].astype(np.int64),
+        "tamaño_grupo": tamaños[grupo[orden]].astype(np.int64),
+    })
@@ -0,0 +1,155 @@
+## TAMAÑO DEL EFECTO (D DE COHEN) POR GRUPOS
+# Importaciones
+import numpy as np
+import pandas as pd
+
+
+# Cantidad máxima de valores remuestreados por iteración del bootstrap (acota la memoria)
+ELEMENTOS_POR_BLOQUE = 5_000_000
+
+
+def momentos(df, valor, grupo, comparar):
+    '''
+    Calcula en una sola pasada los momentos de una variable por grupo y nivel.
+
+    Parámetros:
+        df (pandas.DataFrame): El DataFrame a analizar.
+        valor (str): La variable numérica, por ejemplo "Edad".
+        grupo (str o list): La clave de agrupación, por ejemplo "Año", "Comuna" o "Rol".
+        comparar (str): La columna cuyos niveles se comparan, por ejemplo "Sexo".
+
+    Retorna:
+        pandas.DataFrame: Las columnas "n", "suma" y "suma_cuadrados" indexadas por (grupo, nivel).
+        Los valores no numéricos o nulos se descartan.
+    '''
+    grupos = [grupo] if isinstance(grupo, str) else list(grupo)
+    x = pd.to_numeric(df[valor], errors="coerce").astype(float)
+    validos = x.notna()
+    tabla = pd.DataFrame({"n": validos.astype(np.int64), "suma": x.where(validos, 0.0)})
+    tabla["suma_cuadrados"] = tabla["suma"] ** 2
+    claves = [df[g] for g in grupos] + [df[comparar]]
+    return tabla[validos.to_numpy()].groupby([c[validos] for c in claves], observed=True).sum()
+
+
+def _d_de_cohen(n1, s1, q1, n2, s2, q2):
+    # Misma fórmula que tools.cohen: varianzas muestrales ponderadas por n (no por n - 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        media1, media2 = s1 / n1, s2 / n2
+        var1 = (q1 - s1 * media1) / (n1 - 1)
+        var2 = (q2 - s2 * media2) / (n2 - 1)
+        combinada = (n1 * var1 + n2 * var2) / (n1 + n2)
+        return (media1 - media2) / np.sqrt(combinada)
+
+
+def _ordenar_por_celda(df, valor, grupos, comparar, niveles):
+    # Valores de los dos niveles ordenados por celda (grupo, nivel), con el inicio y tamaño de cada celda
+    x = pd.to_numeric(df[valor], errors="coerce").to_numpy(dtype=float)
+    nivel = df[comparar].to_numpy()
+    codigo_grupo, unicos = pd.MultiIndex.from_arrays([df[g] for g in grupos]).factorize()
+    validos = ~np.isnan(x) & np.isin(nivel, list(niveles)) & (codigo_grupo >= 0)
+    codigo_nivel = (nivel == niveles[1]).astype(np.int64)
+    celda = codigo_grupo.astype(np.int64) * 2 + codigo_nivel
+    celda, x = celda[validos], x[validos]
+    orden = np.argsort(celda, kind="stable")
+    tamaños = np.bincount(celda, minlength=len(unicos) * 2)
+    return x[orden], tamaños, unicos
+
+
+def _remuestrear_celda(rng, x, remuestreos):
+    # Suma y suma de cuadrados de cada remuestreo (con reposición) de los valores de una celda
+    n = len(x)
+    if n == 0:
+        return np.zeros(remuestreos), np.zeros(remuestreos)
+    valores, frecuencias = np.unique(x, return_counts=True)
+    if len(valores) < n:
+        # Con valores repetidos (edades enteras) remuestrear equivale a sortear cuántas veces sale
+        # cada valor distinto: el costo depende de la cantidad de valores distintos y no de n
+        conteos = rng.multinomial(n, frecuencias / n, size=remuestreos)
+        return conteos @ valores, conteos @ valores ** 2
+    sumas, cuadrados = [], []
+    por_bloque = max(1, ELEMENTOS_POR_BLOQUE // n)
+    for inicio in range(0, remuestreos, por_bloque):
+        muestra = x[rng.integers(0, n, size=(min(por_bloque, remuestreos - inicio), n))]
+        sumas.append(muestra.sum(axis=1))
+        cuadrados.append((muestra ** 2).sum(axis=1))
+    return np.concatenate(sumas), np.concatenate(cuadrados)
+
+
+def _bootstrap(valores, tamaños, remuestreos, confianza, semilla):
+    # Remuestreo estratificado: cada celda (grupo, nivel) se remuestrea por separado, todas las
+    # repeticiones a la vez, y se combinan en una matriz de remuestreos x grupos
+    rng = np.random.default_rng(semilla)
+    if len(tamaños) == 0:
+        return np.array([]), np.array([])
+    celdas = np.split(valores, np.cumsum(tamaños)[:-1])
+    momentos_celdas = [_remuestrear_celda(rng, x, remuestreos) for x in celdas]
+    sumas = np.column_stack([m[0] for m in momentos_celdas])
+    cuadrados = np.column_stack([m[1] for m in momentos_celdas])
+    n = tamaños.astype(float)
+    estimaciones = _d_de_cohen(n[0::2], sumas[:, 0::2], cuadrados[:, 0::2],
+                               n[1::2], sumas[:, 1::2], cuadrados[:, 1::2])
+    # Los remuestreos con varianza nula (d infinita) no aportan al intervalo
+    estimaciones[~np.isfinite(estimaciones)] = np.nan
+
+    # Percentiles por grupo; los grupos sin estimaciones válidas quedan con NaN
+    alfa = (1 - confianza) / 2
+    inferior = np.full(estimaciones.shape[1], np.nan)
+    superior = np.full(estimaciones.shape[1], np.nan)
+    con_datos = ~np.isnan(estimaciones).all(axis=0)
+    if con_datos.any():
+        inferior[con_datos], superior[con_datos] = np.nanquantile(estimaciones[:, con_datos], [alfa, 1 - alfa], axis=0)
+    return inferior, superior
+
+
+def cohen_por_grupo(df, grupo="Año", comparar="Sexo", niveles=("MASCULINO", "FEMENINO"), valor="Edad",
+                    remuestreos=0, confianza=0.95, semilla=0):
+    '''
+    Calcula la d de Cohen entre dos niveles de una columna para cada valor de una clave de agrupación.
+
+    Los momentos (cantidad, suma y suma de cuadrados) se obtienen con un único groupby, sin filtrar
+    el DataFrame una vez por grupo. Opcionalmente, estima intervalos de confianza por bootstrap
+    estratificado: todos los remuestreos de cada celda (grupo, nivel) se generan de una vez con
+    NumPy, como conteos multinomiales sobre los valores distintos cuando hay repetidos (edades) o
+    como matrices de índices en otro caso, con una semilla fija para que el resultado sea
+    reproducible.
+
+    Parámetros:
+        df (pandas.DataFrame): El DataFrame a analizar.
+        grupo (str o list): La clave de agrupación ("Año", "Comuna", "Rol", etc.).
+        comparar (str): La columna que define los dos grupos a comparar.
+        niveles (tuple): Los dos niveles de comparar, en el orden (grupo 1, grupo 2).
+        valor (str): La variable numérica.
+        remuestreos (int): Cantidad de remuestreos bootstrap. Con 0 no se calculan intervalos.
+        confianza (float): Nivel de confianza de los intervalos.
+        semilla (int): Semilla del generador aleatorio.
+
+    Retorna:
+        pandas.DataFrame: Una fila por grupo con "n1", "n2" y "Estadistico de Cohen", más
+        "Inferior" y "Superior" si remuestreos > 0. Los grupos sin datos en alguno de los dos
+        niveles quedan con NaN.
+    '''
+    if len(niveles) != 2:
+        raise ValueError("Se deben indicar exactamente dos niveles a comparar")
+    grupos = [grupo] if isinstance(grupo, str) else list(grupo)
+
+    tabla = momentos(df[df[comparar].isin(list(niveles))], valor, grupos, comparar)
+    por_nivel = tabla.unstack(comparar, fill_value=0)
+    columnas = pd.MultiIndex.from_product([["n", "suma", "suma_cuadrados"], list(niveles)])
+    por_nivel = por_nivel.reindex(columns=columnas, fill_value=0)
+    m = {(c, k): por_nivel[(c, niveles[k])].to_numpy(dtype=float) for c in ["n", "suma", "suma_cuadrados"] for k in (0, 1)}
+
+    resultado = pd.DataFrame(index=por_nivel.index)
+    resultado["n1"] = m[("n", 0)].astype(np.int64)
+    resultado["n2"] = m[("n", 1)].astype(np.int64)
+    resultado["Estadistico de Cohen"] = _d_de_cohen(m[("n", 0)], m[("suma", 0)], m[("suma_cuadrados", 0)],
+                                                    m[("n", 1)], m[("suma", 1)], m[("suma_cuadrados", 1)])
+
+    if remuestreos:
+        valores, tamaños, unicos = _ordenar_por_celda(df, valor, grupos, comparar, niveles)
+        inferior, superior = _bootstrap(valores, tamaños, remuestreos, confianza, semilla)
+        indice = unicos if len(grupos) > 1 else unicos.get_level_values(0)
+        intervalos = pd.DataFrame({"Inferior": inferior, "Superior": superior}, index=indice)
+        intervalos.index.names = resultado.index.names
+        resultado = resultado.join(intervalos)
+
+    return resultado.reset_index()
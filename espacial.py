@@ -0,0 +1,659 @@
+## ÍNDICE ESPACIAL DE GRILLA SOBRE LAS COORDENADAS DE LOS HECHOS
+# Importaciones
+import hashlib
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+
+# Radio medio de la Tierra en metros
+RADIO_TIERRA = 6_371_008.8
+
+# Punto de referencia para pasar de lon/lat a metros (centro aproximado de CABA)
+LON_REFERENCIA = -58.44
+LAT_REFERENCIA = -34.61
+
+# Caja de CABA en longitud y latitud, con un margen de unos 500 m
+LIMITES_LON = (-58.54, -58.33)
+LIMITES_LAT = (-34.71, -34.52)
+
+# Lado de cada celda de la grilla, en metros
+TAMAÑO_CELDA = 100.0
+
+# Columnas de coordenadas de homicidios_cleaned (longitud y latitud)
+COLUMNAS_COORDENADAS = ("Pos x", "Pos y")
+
+# Columnas de coordenadas proyectadas (Gauss-Krüger Buenos Aires) que reemplazan a "XY (CABA)"
+COLUMNAS_CABA = ("X (CABA)", "Y (CABA)")
+
+# Puntos WKT de "XY (CABA)", por ejemplo "Point (98896.78238426 93532.43437792)"
+PATRON_WKT = r"^\s*POINT\s*\(\s*([-+]?\d+(?:\.\d*)?)\s+([-+]?\d+(?:\.\d*)?)\s*\)\s*$"
+PATRON_NUMERO = r"^[-+]?\d+(\.\d*)?$"
+
+# Gauss-Krüger Buenos Aires: Transversa de Mercator sobre el elipsoide Internacional 1924
+# (datum Campo Inchauspe), con origen en el centro de la ciudad
+ELIPSOIDE_INTERNACIONAL = (6378388.0, 1 / 297)
+ELIPSOIDE_WGS84 = (6378137.0, 1 / 298.257223563)
+LON_ORIGEN_GKBA = -58.4627
+LAT_ORIGEN_GKBA = -34.6297166
+FALSO_ESTE_GKBA = 100000.0
+FALSO_NORTE_GKBA = 100000.0
+
+# Traslación geocéntrica de Campo Inchauspe a WGS84, en metros
+TRASLACION_WGS84 = (-148.0, 136.0, 90.0)
+
+# Distancia máxima (en metros) aceptada entre "XY (CABA)" y "Pos x"/"Pos y" del mismo hecho
+TOLERANCIA_METROS = 5.0
+
+
+def _a_float(valores):
+    # Arreglo float64; los textos no numéricos (por ejemplo ".") pasan a NaN
+    arreglo = np.asarray(valores)
+    if arreglo.dtype.kind in "biuf":
+        return arreglo.astype(float, copy=False)
+    return pd.to_numeric(pd.Series(arreglo), errors="coerce").to_numpy(dtype=float)
+
+
+def coordenadas_validas(lon, lat):
+    '''
+    Indica qué filas tienen coordenadas utilizables.
+
+    El ETL guarda 0 cuando falta la coordenada ("Point (. .)"), así que además de los nulos se
+    descartan los ceros y los valores fuera del rango de longitud y latitud.
+
+    Parámetros:
+        lon (array): Longitudes ("Pos x").
+        lat (array): Latitudes ("Pos y").
+
+    Retorna:
+        numpy.ndarray: Máscara booleana, True donde la coordenada es válida.
+    '''
+    lon, lat = _a_float(lon), _a_float(lat)
+    return (np.isfinite(lon) & np.isfinite(lat) & (lon != 0) & (lat != 0)
+            & (np.abs(lon) <= 180) & (np.abs(lat) <= 90))
+
+
+def _limites(limites=None):
+    # ((lon_min, lon_max), (lat_min, lat_max)) como una tupla plana de floats (si ya es plana, se
+    # deja como está); por defecto, la caja de CABA
+    if limites is None:
+        limites = (LIMITES_LON, LIMITES_LAT)
+    if len(limites) == 2:
+        limites = (*limites[0], *limites[1])
+    lon_min, lon_max, lat_min, lat_max = limites
+    return float(lon_min), float(lon_max), float(lat_min), float(lat_max)
+
+
+def dentro_de_limites(lon, lat, limites=None):
+    '''
+    Indica qué filas tienen coordenadas válidas dentro de una caja de longitud y latitud.
+
+    Parámetros:
+        lon, lat (array): Longitudes y latitudes.
+        limites (tuple): ((lon_min, lon_max), (lat_min, lat_max)). Por defecto, la caja de CABA.
+
+    Retorna:
+        numpy.ndarray: Máscara booleana, True donde la coordenada es válida y cae dentro de la caja.
+    '''
+    lon, lat = _a_float(lon), _a_float(lat)
+    lon_min, lon_max, lat_min, lat_max = _limites(limites)
+    with np.errstate(invalid="ignore"):
+        dentro = (lon >= lon_min) & (lon <= lon_max) & (lat >= lat_min) & (lat <= lat_max)
+    return dentro & coordenadas_validas(lon, lat)
+
+
+def a_metros(lon, lat, lon0=LON_REFERENCIA, lat0=LAT_REFERENCIA):
+    '''
+    Proyecta lon/lat a metros con una proyección equirrectangular local.
+
+    A la escala de una ciudad el error es despreciable y la proyección es lineal, de modo que
+    un rectángulo en lon/lat sigue siendo un rectángulo en metros.
+
+    Parámetros:
+        lon, lat (array): Coordenadas en grados.
+        lon0, lat0 (float): Punto de referencia de la proyección.
+
+    Retorna:
+        tuple: Los arreglos (x, y) en metros respecto del punto de referencia.
+    '''
+    escala = np.pi / 180 * RADIO_TIERRA
+    x = (np.asarray(lon, dtype=float) - lon0) * escala * np.cos(np.radians(lat0))
+    y = (np.asarray(lat, dtype=float) - lat0) * escala
+    return x, y
+
+
+def a_lonlat(x, y, lon0=LON_REFERENCIA, lat0=LAT_REFERENCIA):
+    '''
+    Inversa de a_metros.
+
+    Retorna:
+        tuple: Los arreglos (lon, lat) en grados.
+    '''
+    escala = np.pi / 180 * RADIO_TIERRA
+    lon = np.asarray(x, dtype=float) / (escala * np.cos(np.radians(lat0))) + lon0
+    lat = np.asarray(y, dtype=float) / escala + lat0
+    return lon, lat
+
+
+def _wkt_arrow(texto):
+    # Camino rápido con las funciones de texto de Arrow para el formato exacto "Point (x y)"
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    arreglo = pa.array(texto, type=pa.string(), from_pandas=True)
+    canonico = pc.and_(pc.and_(pc.starts_with(arreglo, "Point ("), pc.ends_with(arreglo, ")")),
+                       pc.not_equal(arreglo, "Point (. .)"))
+    arreglo = pc.if_else(pc.fill_null(canonico, False), arreglo, pa.scalar(None, pa.string()))
+    partes = pc.split_pattern(pc.utf8_slice_codeunits(arreglo, 7, -1), " ", max_splits=1)
+
+    # Tomamos la primera y la segunda parte de las filas con exactamente dos partes
+    dos_partes = pc.fill_null(pc.equal(pc.list_value_length(partes), 2), False).to_numpy(zero_copy_only=False)
+    primeras = partes.offsets.to_numpy()[:-1][dos_partes]
+    planas = partes.values
+    coordenadas = []
+    for desplazamiento in (0, 1):
+        parte = planas.take(pa.array(primeras + desplazamiento))
+        try:
+            numero = pc.cast(parte, pa.float64())
+        except pa.ArrowInvalid:
+            # Algún texto no es un número: se anulan antes de convertir
+            numero = pc.cast(pc.if_else(pc.match_substring_regex(parte, PATRON_NUMERO), parte, None), pa.float64())
+        resultado = np.full(len(arreglo), np.nan)
+        resultado[dos_partes] = numero.to_numpy(zero_copy_only=False)
+        coordenadas.append(resultado)
+    return coordenadas
+
+
+def separar_wkt(valores):
+    '''
+    Separa una columna de puntos WKT ("Point (x y)") en dos arreglos float64.
+
+    El formato exacto del dataset se interpreta en bloque con las funciones de texto de Arrow
+    (si pyarrow está instalado). Solo los textos que no tienen ese formato se revisan con una
+    expresión regular, y los centinelas ("Point (. .)", 0 o nulos) quedan como NaN.
+
+    Parámetros:
+        valores (pandas.Series o array): La columna "XY (CABA)".
+
+    Retorna:
+        tuple: Los arreglos (x, y) en metros, con NaN donde falta la coordenada.
+    '''
+    serie = valores if isinstance(valores, pd.Series) else pd.Series(valores)
+    # Los centinelas numéricos (0) pasan a texto y luego no coinciden con el formato
+    texto = serie.astype("string")
+    try:
+        x, y = _wkt_arrow(texto)
+    except ImportError:
+        x = np.full(len(texto), np.nan)
+        y = np.full(len(texto), np.nan)
+
+    # Revisamos con la expresión regular solo los textos que el camino rápido no pudo leer
+    pendientes = (np.isnan(x) | np.isnan(y)) & texto.notna().to_numpy(dtype=bool)
+    if pendientes.any():
+        partes = texto[pendientes].str.extract(PATRON_WKT, flags=re.IGNORECASE)
+        x[pendientes] = pd.to_numeric(partes[0], errors="coerce").to_numpy(dtype=float)
+        y[pendientes] = pd.to_numeric(partes[1], errors="coerce").to_numpy(dtype=float)
+    return x, y
+
+
+def _elipsoide(elipsoide):
+    a, f = elipsoide
+    return a, 2 * f - f * f
+
+
+def _a_geocentricas(lon, lat, elipsoide):
+    # Coordenadas geodésicas (altura 0) a cartesianas geocéntricas
+    a, e2 = _elipsoide(elipsoide)
+    fi, lam = np.radians(lat), np.radians(lon)
+    n = a / np.sqrt(1 - e2 * np.sin(fi) ** 2)
+    return n * np.cos(fi) * np.cos(lam), n * np.cos(fi) * np.sin(lam), n * (1 - e2) * np.sin(fi)
+
+
+def _a_geodesicas(x, y, z, elipsoide):
+    # Cartesianas geocéntricas a geodésicas con la fórmula de Bowring (precisión submilimétrica cerca de la superficie)
+    a, e2 = _elipsoide(elipsoide)
+    b = a * np.sqrt(1 - e2)
+    ep2 = e2 / (1 - e2)
+    p = np.hypot(x, y)
+    theta = np.arctan2(z * a, p * b)
+    seno, coseno = np.sin(theta), np.cos(theta)
+    fi = np.arctan2(z + ep2 * b * seno * seno * seno, p - e2 * a * coseno * coseno * coseno)
+    return np.degrees(np.arctan2(y, x)), np.degrees(fi)
+
+
+def _cambiar_datum(lon, lat, origen, destino, signo):
+    # Traslación geocéntrica de tres parámetros entre datums
+    x, y, z = _a_geocentricas(lon, lat, origen)
+    dx, dy, dz = TRASLACION_WGS84
+    return _a_geodesicas(x + signo * dx, y + signo * dy, z + signo * dz, destino)
+
+
+def _arco_meridiano(fi, e2, a):
+    e4, e6 = e2 ** 2, e2 ** 3
+    return a * ((1 - e2 / 4 - 3 * e4 / 64 - 5 * e6 / 256) * fi
+                - (3 * e2 / 8 + 3 * e4 / 32 + 45 * e6 / 1024) * np.sin(2 * fi)
+                + (15 * e4 / 256 + 45 * e6 / 1024) * np.sin(4 * fi)
+                - (35 * e6 / 3072) * np.sin(6 * fi))
+
+
+def _mercator_transversa(lon, lat):
+    # Transversa de Mercator (Snyder, 1987) con los parámetros de GKBA
+    a, e2 = _elipsoide(ELIPSOIDE_INTERNACIONAL)
+    ep2 = e2 / (1 - e2)
+    fi = np.radians(lat)
+    seno, coseno, tangente = np.sin(fi), np.cos(fi), np.tan(fi)
+    n = a / np.sqrt(1 - e2 * seno ** 2)
+    t = tangente ** 2
+    c = ep2 * coseno ** 2
+    d = np.radians(lon - LON_ORIGEN_GKBA) * coseno
+    m = _arco_meridiano(fi, e2, a) - _arco_meridiano(np.radians(LAT_ORIGEN_GKBA), e2, a)
+    # Las series en d se evalúan con el esquema de Horner sobre d²
+    d2 = d * d
+    x = n * d * (1 + d2 * ((1 - t + c) / 6 + d2 * (5 - 18 * t + t * t + 72 * c - 58 * ep2) / 120))
+    y = m + n * tangente * d2 * (0.5 + d2 * ((5 - t + 9 * c + 4 * c * c) / 24
+                                             + d2 * (61 - 58 * t + t * t + 600 * c - 330 * ep2) / 720))
+    return x + FALSO_ESTE_GKBA, y + FALSO_NORTE_GKBA
+
+
+def _mercator_transversa_inversa(x, y):
+    a, e2 = _elipsoide(ELIPSOIDE_INTERNACIONAL)
+    ep2 = e2 / (1 - e2)
+    e1 = (1 - np.sqrt(1 - e2)) / (1 + np.sqrt(1 - e2))
+    m = _arco_meridiano(np.radians(LAT_ORIGEN_GKBA), e2, a) + (np.asarray(y, dtype=float) - FALSO_NORTE_GKBA)
+    mu = m / (a * (1 - e2 / 4 - 3 * e2 ** 2 / 64 - 5 * e2 ** 3 / 256))
+    fi1 = (mu + (3 * e1 / 2 - 27 * e1 ** 3 / 32) * np.sin(2 * mu)
+           + (21 * e1 ** 2 / 16 - 55 * e1 ** 4 / 32) * np.sin(4 * mu)
+           + (151 * e1 ** 3 / 96) * np.sin(6 * mu) + (1097 * e1 ** 4 / 512) * np.sin(8 * mu))
+    seno, coseno, tangente = np.sin(fi1), np.cos(fi1), np.tan(fi1)
+    c1 = ep2 * coseno ** 2
+    t1 = tangente ** 2
+    n1 = a / np.sqrt(1 - e2 * seno ** 2)
+    r1 = n1 * (1 - e2) / (1 - e2 * seno ** 2)
+    d = (np.asarray(x, dtype=float) - FALSO_ESTE_GKBA) / n1
+    d2 = d * d
+    fi = fi1 - (n1 * tangente / r1) * d2 * (0.5 - d2 * ((5 + 3 * t1 + 10 * c1 - 4 * c1 * c1 - 9 * ep2) / 24
+                                                        - d2 * (61 + 90 * t1 + 298 * c1 + 45 * t1 * t1 - 252 * ep2 - 3 * c1 * c1) / 720))
+    lam = d * (1 - d2 * ((1 + 2 * t1 + c1) / 6
+                         - d2 * (5 - 2 * c1 + 28 * t1 - 3 * c1 * c1 + 8 * ep2 + 24 * t1 * t1) / 120)) / coseno
+    return LON_ORIGEN_GKBA + np.degrees(lam), np.degrees(fi)
+
+
+def lonlat_a_caba(lon, lat):
+    '''
+    Convierte longitudes y latitudes WGS84 ("Pos x", "Pos y") a coordenadas proyectadas de CABA.
+
+    La proyección es Gauss-Krüger Buenos Aires (la de "XY (CABA)"): primero se pasa del datum
+    WGS84 a Campo Inchauspe y luego se aplica la Transversa de Mercator, todo en bloque con NumPy.
+    Las coordenadas faltantes (0 o nulas) devuelven NaN.
+
+    Parámetros:
+        lon, lat (array): Coordenadas en grados.
+
+    Retorna:
+        tuple: Los arreglos (x, y) en metros.
+    '''
+    lon, lat = _a_float(lon), _a_float(lat)
+    validos = coordenadas_validas(lon, lat)
+    lon, lat = np.where(validos, lon, np.nan), np.where(validos, lat, np.nan)
+    lon, lat = _cambiar_datum(lon, lat, ELIPSOIDE_WGS84, ELIPSOIDE_INTERNACIONAL, -1)
+    return _mercator_transversa(lon, lat)
+
+
+def caba_a_lonlat(x, y):
+    '''
+    Convierte coordenadas proyectadas de CABA ("X (CABA)", "Y (CABA)") a longitudes y latitudes WGS84.
+
+    Parámetros:
+        x, y (array): Coordenadas Gauss-Krüger Buenos Aires en metros. NaN o 0 si faltan.
+
+    Retorna:
+        tuple: Los arreglos (lon, lat) en grados, con NaN donde falta la coordenada.
+    '''
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    validos = np.isfinite(x) & np.isfinite(y) & (x != 0) & (y != 0)
+    lon, lat = _mercator_transversa_inversa(np.where(validos, x, np.nan), np.where(validos, y, np.nan))
+    return _cambiar_datum(lon, lat, ELIPSOIDE_INTERNACIONAL, ELIPSOIDE_WGS84, 1)
+
+
+def validar_coordenadas(df, tolerancia=TOLERANCIA_METROS):
+    '''
+    Verifica que las coordenadas proyectadas y las geográficas de cada hecho coincidan.
+
+    Acepta las columnas "X (CABA)" e "Y (CABA)" o, si no están, la columna de texto "XY (CABA)".
+
+    Parámetros:
+        df (pandas.DataFrame): El DataFrame con "Pos x", "Pos y" y las coordenadas proyectadas.
+        tolerancia (float): Distancia máxima aceptada entre ambas, en metros.
+
+    Retorna:
+        pandas.DataFrame: Las columnas "Distancia (m)" y "Consistente" alineadas con df.
+        "Consistente" es nulo cuando falta alguna de las dos coordenadas.
+    '''
+    if all(c in df.columns for c in COLUMNAS_CABA):
+        x = df[COLUMNAS_CABA[0]].to_numpy(dtype=float)
+        y = df[COLUMNAS_CABA[1]].to_numpy(dtype=float)
+    else:
+        x, y = separar_wkt(df["XY (CABA)"])
+    x = np.where(x == 0, np.nan, x)
+    y = np.where(y == 0, np.nan, y)
+    px, py = lonlat_a_caba(df[COLUMNAS_COORDENADAS[0]], df[COLUMNAS_COORDENADAS[1]])
+    distancia = np.hypot(px - x, py - y)
+    consistente = pd.array(np.where(np.isnan(distancia), None, distancia <= tolerancia), dtype="boolean")
+    return pd.DataFrame({"Distancia (m)": distancia, "Consistente": consistente}, index=df.index)
+
+
+def huella(lon, lat):
+    '''
+    Calcula una huella (hash) de las coordenadas para identificar la versión del dataset.
+
+    Retorna:
+        str: Los primeros 16 caracteres del SHA-1 de las coordenadas.
+    '''
+    contenido = np.ascontiguousarray(np.column_stack([np.asarray(lon, dtype=float), np.asarray(lat, dtype=float)]))
+    return hashlib.sha1(contenido.tobytes()).hexdigest()[:16]
+
+
+def _indices(inicios, fines):
+    # Concatena los rangos [inicio, fin) en un solo arreglo de índices sin bucles de Python
+    largos = fines - inicios
+    total = int(largos.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    desplazamientos = np.repeat(inicios - np.concatenate([[0], np.cumsum(largos)[:-1]]), largos)
+    return desplazamientos + np.arange(total)
+
+
+def _suavizar(matriz, nucleo, eje):
+    # Convolución 1D a lo largo de un eje sumando copias desplazadas de la matriz
+    radio = len(nucleo) // 2
+    ancho = [(0, 0), (0, 0)]
+    ancho[eje] = (radio, radio)
+    rellena = np.pad(matriz, ancho)
+    largo = matriz.shape[eje]
+    resultado = np.zeros_like(matriz, dtype=float)
+    for desplazamiento, peso in enumerate(nucleo):
+        resultado += peso * np.take(rellena, np.arange(desplazamiento, desplazamiento + largo), axis=eje)
+    return resultado
+
+
+class IndiceEspacial:
+    '''
+    Índice de grilla uniforme sobre las coordenadas de los hechos.
+
+    Los puntos se proyectan a metros, se asignan a celdas cuadradas y se ordenan por celda
+    (recorriendo la grilla por filas), con un arreglo de inicios al estilo CSR. Así, las celdas
+    de una misma fila de la grilla quedan contiguas y una consulta lee un tramo por fila en
+    lugar de recorrer todos los puntos. Los conteos por celda y su tabla de sumas acumuladas
+    permiten contar rectángulos sin mirar los puntos interiores y calcular densidades (KDE)
+    sobre la grilla.
+
+    Las filas sin coordenadas (0 o nulas) o con coordenadas fuera de la caja de CABA no se indexan;
+    se informan en sin_coordenadas. Así un punto erróneo lejos de la ciudad no agranda la grilla.
+
+    Parámetros:
+        lon, lat (array): Longitudes y latitudes, una por fila del DataFrame.
+        tamaño_celda (float): Lado de cada celda, en metros.
+        referencia (tuple): (lon, lat) del punto de referencia de la proyección.
+        limites (tuple): ((lon_min, lon_max), (lat_min, lat_max)) de los puntos que se indexan. Por
+            defecto, la caja de CABA (LIMITES_LON y LIMITES_LAT).
+        version (str): Identificador de la versión del dataset. Por defecto, la huella de las coordenadas.
+    '''
+
+    def __init__(self, lon, lat, tamaño_celda=TAMAÑO_CELDA, referencia=(LON_REFERENCIA, LAT_REFERENCIA),
+                 limites=None, version=None):
+        lon, lat = _a_float(lon), _a_float(lat)
+        self.limites = _limites(limites)
+        validos = dentro_de_limites(lon, lat, self.limites)
+        posiciones = np.flatnonzero(validos)
+        x, y = a_metros(lon[validos], lat[validos], *referencia)
+
+        self.tamaño_celda = float(tamaño_celda)
+        self.referencia = tuple(float(r) for r in referencia)
+        self.version = version if version is not None else huella(lon, lat)
+        self.total_filas = len(lon)
+        self.sin_coordenadas = int(len(lon) - len(posiciones))
+        self.x0 = float(x.min()) if len(x) else 0.0
+        self.y0 = float(y.min()) if len(y) else 0.0
+        self.nx = int((x.max() - self.x0) // self.tamaño_celda) + 1 if len(x) else 1
+        self.ny = int((y.max() - self.y0) // self.tamaño_celda) + 1 if len(y) else 1
+
+        ix, iy = self._celdas(x, y)
+        celda = iy * self.nx + ix
+        orden = np.argsort(celda, kind="stable")
+        self.x, self.y = x[orden], y[orden]
+        self.filas = posiciones[orden]
+        conteos = np.bincount(celda, minlength=self.nx * self.ny)
+        self.inicios = np.concatenate([[0], np.cumsum(conteos)])
+        self._preparar()
+
+    def _preparar(self):
+        # Conteos por celda y tabla de sumas acumuladas (con una fila y columna de ceros al inicio)
+        self.conteos = np.diff(self.inicios).reshape(self.ny, self.nx)
+        self.acumulado = np.zeros((self.ny + 1, self.nx + 1), dtype=np.int64)
+        self.acumulado[1:, 1:] = self.conteos.cumsum(axis=0).cumsum(axis=1)
+        self.densidades = {}
+
+    def _celdas(self, x, y):
+        ix = ((x - self.x0) // self.tamaño_celda).astype(np.int64)
+        iy = ((y - self.y0) // self.tamaño_celda).astype(np.int64)
+        return ix, iy
+
+    @classmethod
+    def desde_dataframe(cls, df, columnas=COLUMNAS_COORDENADAS, **kwargs):
+        '''
+        Construye el índice a partir de las columnas de longitud y latitud de un DataFrame.
+
+        Las consultas devuelven posiciones de fila (usar con df.iloc).
+        '''
+        lon, lat = columnas
+        return cls(df[lon].to_numpy(), df[lat].to_numpy(), **kwargs)
+
+    def __len__(self):
+        return len(self.filas)
+
+    def _rango(self, xmin, xmax, ymin, ymax):
+        # Rango de celdas que cubre el rectángulo, recortado a la grilla; None si no se superponen
+        ix0, iy0 = self._celdas(np.array([xmin]), np.array([ymin]))
+        ix1, iy1 = self._celdas(np.array([xmax]), np.array([ymax]))
+        ix0, iy0 = max(int(ix0[0]), 0), max(int(iy0[0]), 0)
+        ix1, iy1 = min(int(ix1[0]), self.nx - 1), min(int(iy1[0]), self.ny - 1)
+        if len(self) == 0 or ix0 > ix1 or iy0 > iy1:
+            return None
+        return ix0, ix1, iy0, iy1
+
+    def _candidatos(self, ix0, ix1, filas_grilla):
+        # Puntos de las celdas ix0..ix1 en cada fila de la grilla indicada (un tramo contiguo por fila)
+        base = np.asarray(filas_grilla, dtype=np.int64) * self.nx
+        return _indices(self.inicios[base + ix0], self.inicios[base + ix1 + 1])
+
+    def radio(self, lon, lat, metros):
+        '''
+        Devuelve las filas cuyas coordenadas están a una distancia menor o igual que metros del punto.
+
+        Parámetros:
+            lon, lat (float): El centro de la búsqueda, por ejemplo una intersección.
+            metros (float): El radio de búsqueda.
+
+        Retorna:
+            numpy.ndarray: Las posiciones de fila (para df.iloc), ordenadas.
+        '''
+        px, py = a_metros(lon, lat, *self.referencia)
+        rango = self._rango(px - metros, px + metros, py - metros, py + metros)
+        if rango is None:
+            return np.empty(0, dtype=np.int64)
+        ix0, ix1, iy0, iy1 = rango
+        candidatos = self._candidatos(ix0, ix1, np.arange(iy0, iy1 + 1))
+        dentro = (self.x[candidatos] - px) ** 2 + (self.y[candidatos] - py) ** 2 <= metros ** 2
+        return np.sort(self.filas[candidatos[dentro]])
+
+    def contar_radio(self, lon, lat, metros):
+        '''
+        Cuenta las filas a una distancia menor o igual que metros del punto.
+        '''
+        return len(self.radio(lon, lat, metros))
+
+    def caja(self, lon_min, lat_min, lon_max, lat_max):
+        '''
+        Devuelve las filas dentro de un rectángulo de longitudes y latitudes (bordes incluidos).
+
+        Retorna:
+            numpy.ndarray: Las posiciones de fila (para df.iloc), ordenadas.
+        '''
+        xmin, ymin = a_metros(lon_min, lat_min, *self.referencia)
+        xmax, ymax = a_metros(lon_max, lat_max, *self.referencia)
+        rango = self._rango(xmin, xmax, ymin, ymax)
+        if rango is None:
+            return np.empty(0, dtype=np.int64)
+        ix0, ix1, iy0, iy1 = rango
+        candidatos = self._candidatos(ix0, ix1, np.arange(iy0, iy1 + 1))
+        return np.sort(self.filas[candidatos[self._dentro_caja(candidatos, xmin, xmax, ymin, ymax)]])
+
+    def _dentro_caja(self, candidatos, xmin, xmax, ymin, ymax):
+        x, y = self.x[candidatos], self.y[candidatos]
+        return (x >= xmin) & (x <= xmax) & (y >= ymin) & (y <= ymax)
+
+    def contar_caja(self, lon_min, lat_min, lon_max, lat_max):
+        '''
+        Cuenta las filas dentro de un rectángulo de longitudes y latitudes (bordes incluidos).
+
+        Las celdas interiores se cuentan con la tabla de sumas acumuladas; solo se revisan punto
+        por punto las celdas del borde, por lo que el costo no depende del tamaño del rectángulo.
+
+        Retorna:
+            int: La cantidad de filas.
+        '''
+        xmin, ymin = a_metros(lon_min, lat_min, *self.referencia)
+        xmax, ymax = a_metros(lon_max, lat_max, *self.referencia)
+        rango = self._rango(xmin, xmax, ymin, ymax)
+        if rango is None:
+            return 0
+        ix0, ix1, iy0, iy1 = rango
+
+        # Interior: celdas ix0+1..ix1-1 por iy0+1..iy1-1
+        interior = 0
+        if ix1 - ix0 >= 2 and iy1 - iy0 >= 2:
+            a = self.acumulado
+            interior = int(a[iy1, ix1] - a[iy0 + 1, ix1] - a[iy1, ix0 + 1] + a[iy0 + 1, ix0 + 1])
+
+        # Borde: filas iy0 e iy1 completas, y columnas ix0 e ix1 en las filas intermedias
+        borde = [self._candidatos(ix0, ix1, np.unique([iy0, iy1]))]
+        intermedias = np.arange(iy0 + 1, iy1)
+        for ix in np.unique([ix0, ix1]):
+            borde.append(self._candidatos(ix, ix, intermedias))
+        borde = np.concatenate(borde)
+        return interior + int(self._dentro_caja(borde, xmin, xmax, ymin, ymax).sum())
+
+    def densidad(self, ancho_banda=200.0):
+        '''
+        Estima la densidad de hechos sobre la grilla con un núcleo gaussiano (KDE).
+
+        Se suavizan los conteos por celda con un núcleo separable, así que el costo depende de la
+        cantidad de celdas y no de la cantidad de puntos. El resultado se guarda por ancho de banda.
+
+        Parámetros:
+            ancho_banda (float): Desvío del núcleo gaussiano, en metros.
+
+        Retorna:
+            numpy.ndarray: Matriz (ny, nx) con hechos por km² en cada celda.
+        '''
+        if ancho_banda not in self.densidades:
+            sigma = ancho_banda / self.tamaño_celda
+            radio = max(1, int(np.ceil(3 * sigma)))
+            pasos = np.arange(-radio, radio + 1)
+            nucleo = np.exp(-0.5 * (pasos / sigma) ** 2)
+            nucleo /= nucleo.sum()
+            suavizado = _suavizar(_suavizar(self.conteos.astype(float), nucleo, 0), nucleo, 1)
+            self.densidades[ancho_banda] = suavizado / (self.tamaño_celda / 1000) ** 2
+        return self.densidades[ancho_banda]
+
+    def centros(self):
+        '''
+        Devuelve la longitud y latitud del centro de cada celda.
+
+        Retorna:
+            tuple: Dos matrices (ny, nx) con lon y lat.
+        '''
+        x = self.x0 + (np.arange(self.nx) + 0.5) * self.tamaño_celda
+        y = self.y0 + (np.arange(self.ny) + 0.5) * self.tamaño_celda
+        lon, _ = a_lonlat(x, np.zeros_like(x), *self.referencia)
+        _, lat = a_lonlat(np.zeros_like(y), y, *self.referencia)
+        return np.broadcast_to(lon, (self.ny, self.nx)), np.broadcast_to(lat[:, None], (self.ny, self.nx))
+
+    def puntos_calientes(self, cantidad=10, ancho_banda=200.0):
+        '''
+        Devuelve las celdas con mayor densidad estimada.
+
+        Parámetros:
+            cantidad (int): Cantidad de celdas a devolver.
+            ancho_banda (float): Desvío del núcleo gaussiano, en metros.
+
+        Retorna:
+            pandas.DataFrame: Columnas "Pos x", "Pos y" (centro de la celda), "Densidad" (hechos
+            por km²) y "Hechos en celda", ordenadas de mayor a menor densidad.
+        '''
+        densidad = self.densidad(ancho_banda).ravel()
+        cantidad = min(cantidad, len(densidad))
+        mayores = np.argpartition(-densidad, cantidad - 1)[:cantidad]
+        mayores = mayores[np.argsort(-densidad[mayores], kind="stable")]
+        lon, lat = self.centros()
+        return pd.DataFrame({"Pos x": lon.ravel()[mayores], "Pos y": lat.ravel()[mayores],
+                             "Densidad": densidad[mayores], "Hechos en celda": self.conteos.ravel()[mayores]})
+
+    def guardar(self, ruta):
+        '''
+        Guarda el índice en un archivo .npz para no reconstruirlo en cada sesión.
+        '''
+        np.savez(ruta, x=self.x, y=self.y, filas=self.filas, inicios=self.inicios,
+                 grilla=np.array([self.tamaño_celda, self.x0, self.y0, *self.referencia, *self.limites]),
+                 dimensiones=np.array([self.nx, self.ny, self.total_filas, self.sin_coordenadas]),
+                 version=np.array(self.version))
+
+    @classmethod
+    def cargar(cls, ruta):
+        '''
+        Carga un índice guardado con guardar.
+        '''
+        with np.load(ruta) as datos:
+            indice = cls.__new__(cls)
+            indice.x, indice.y = datos["x"], datos["y"]
+            indice.filas, indice.inicios = datos["filas"], datos["inicios"]
+            tamaño, x0, y0, lon0, lat0, *limites = datos["grilla"].tolist()
+            indice.tamaño_celda, indice.x0, indice.y0, indice.referencia = tamaño, x0, y0, (lon0, lat0)
+            # Los índices guardados antes de filtrar por la caja de CABA no traen los límites
+            indice.limites = tuple(limites) or None
+            indice.nx, indice.ny, indice.total_filas, indice.sin_coordenadas = datos["dimensiones"].tolist()
+            indice.version = str(datos["version"])
+        indice._preparar()
+        return indice
+
+
+def cargar_o_construir(df, ruta, columnas=COLUMNAS_COORDENADAS, **kwargs):
+    '''
+    Carga el índice guardado si corresponde a la misma versión del dataset; si no, lo construye y lo guarda.
+
+    La versión es la huella de las coordenadas, así que el índice se reconstruye cuando cambian
+    los datos o cuando se pide otro tamaño de celda, otra referencia u otros límites.
+
+    Parámetros:
+        df (pandas.DataFrame): El DataFrame de homicidios.
+        ruta (str): Archivo .npz del índice.
+        columnas (tuple): Columnas de longitud y latitud.
+
+    Retorna:
+        IndiceEspacial: El índice correspondiente a df.
+    '''
+    lon, lat = columnas
+    version = huella(_a_float(df[lon]), _a_float(df[lat]))
+    if os.path.exists(ruta):
+        indice = IndiceEspacial.cargar(ruta)
+        parametros = (float(kwargs.get("tamaño_celda", TAMAÑO_CELDA)),
+                      tuple(float(r) for r in kwargs.get("referencia", (LON_REFERENCIA, LAT_REFERENCIA))),
+                      _limites(kwargs.get("limites")))
+        if indice.version == version and (indice.tamaño_celda, indice.referencia, indice.limites) == parametros:
+            return indice
+    indice = IndiceEspacial.desde_dataframe(df, columnas, version=version, **kwargs)
+    indice.guardar(ruta)
+    return indice
@@ -0,0 +1,193 @@
+## ESQUEMA TIPADO Y ALMACENAMIENTO COLUMNAR DE homicidios_cleaned
+# Importaciones
+import uuid
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+import compactacion
+import derivadas
+import espacial
+import tiempo
+
+
+# Tipo de las columnas categóricas: diccionario con índices int8 sobre texto
+CATEGORICA = pa.dictionary(pa.int8(), pa.string())
+
+# Esquema explícito del dataset limpio, en el mismo orden que homicidios_cleaned.csv
+ESQUEMA = pa.schema([
+    ("Id", pa.string()),
+    ("Rol", CATEGORICA),
+    ("Sexo", CATEGORICA),
+    ("Edad", pa.int16()),
+    ("Cantidad víctimas", pa.int16()),
+    ("Fecha", pa.date32()),
+    ("Año", pa.int16()),
+    ("Mes", pa.int8()),
+    ("Día", pa.int8()),
+    ("Hora", pa.time32("s")),
+    ("Hora entera", pa.int8()),
+    ("Lugar del hecho", pa.string()),
+    ("Tipo de calle", CATEGORICA),
+    ("Calle", pa.string()),
+    ("Cruce", CATEGORICA),
+    ("Dirección normalizada", pa.string()),
+    ("Comuna", pa.int8()),
+    ("X (CABA)", pa.float64()),
+    ("Y (CABA)", pa.float64()),
+    ("Pos x", pa.float64()),
+    ("Pos y", pa.float64()),
+    ("Participantes", CATEGORICA),
+    ("Víctima", CATEGORICA),
+    ("Acusado", CATEGORICA),
+    # Variables derivadas (ver derivadas.py), materializadas al escribir el dataset
+    ("Día semana", pa.int8()),
+    ("Tipo de día", CATEGORICA),
+    ("Nombre día", CATEGORICA),
+    ("Hora del día", pa.int8()),
+    ("Categoria tiempo", CATEGORICA),
+])
+
+# El dataset se particiona por año al estilo Hive ("Año=2016/")
+PARTICIONADO = ds.partitioning(pa.schema([ESQUEMA.field("Año")]), flavor="hive")
+
+
+def _columna(serie, tipo):
+    # Convierte una columna de pandas al tipo de Arrow indicado en el esquema
+    if pa.types.is_dictionary(tipo) and isinstance(serie.dtype, pd.CategoricalDtype):
+        # Usamos las categorías de la columna (el diccionario global) como diccionario de Arrow
+        codigos = serie.cat.codes.to_numpy()
+        indices = pa.array(codigos, mask=codigos < 0).cast(tipo.index_type)
+        return pa.DictionaryArray.from_arrays(indices, pa.array(list(serie.cat.categories), type=tipo.value_type))
+    if pa.types.is_dictionary(tipo):
+        texto = serie.astype(object).where(serie.notna(), None)
+        return pa.array(texto, type=pa.string()).dictionary_encode().cast(tipo)
+    if pa.types.is_date(tipo):
+        return pa.array(pd.to_datetime(serie).dt.date, type=tipo)
+    if pa.types.is_time(tipo):
+        segundos = tiempo.hora_a_segundos(serie)
+        return pa.array(segundos, mask=segundos == tiempo.SIN_HORA).cast(tipo)
+    if pa.types.is_floating(tipo):
+        return pa.array(pd.to_numeric(serie, errors="coerce"), type=tipo, from_pandas=True)
+    if pa.types.is_integer(tipo):
+        return pa.array(pd.to_numeric(serie, errors="coerce"), from_pandas=True).cast(tipo)
+    # Texto: los centinelas numéricos del ETL se guardan como nulos
+    texto = serie.astype(object).where(serie.map(lambda v: isinstance(v, str)), None)
+    return pa.array(texto, type=tipo)
+
+
+def _coordenadas_caba(df):
+    # Los DataFrames con el formato anterior traen "XY (CABA)" como texto; se separa al convertir
+    if all(c in df.columns for c in espacial.COLUMNAS_CABA) or "XY (CABA)" not in df.columns:
+        return {}
+    x, y = espacial.separar_wkt(df["XY (CABA)"])
+    return dict(zip(espacial.COLUMNAS_CABA, (pd.Series(x, index=df.index), pd.Series(y, index=df.index))))
+
+
+def a_tabla(df, esquema=ESQUEMA):
+    '''
+    Convierte un DataFrame de homicidios limpio en una tabla de Arrow con el esquema tipado.
+
+    Acepta tanto el resultado del ETL (fechas datetime, horas time) como el CSV leído con
+    pd.read_csv (fechas y horas como texto). Las variables derivadas del esquema que no estén
+    en df se calculan en este momento, de modo que el dataset las guarda ya materializadas. Si
+    df trae la columna de texto "XY (CABA)" en lugar de "X (CABA)" e "Y (CABA)", se separa. Las
+    columnas categóricas se codifican con el diccionario global de compactacion.py (que se
+    extiende si df trae valores nuevos), así todos los archivos del dataset comparten diccionario.
+
+    Parámetros:
+        df (pandas.DataFrame): El DataFrame con las columnas de homicidios_cleaned.
+        esquema (pyarrow.Schema): El esquema de destino.
+
+    Retorna:
+        pyarrow.Table: La tabla tipada.
+    '''
+    coordenadas = _coordenadas_caba(df)
+    diccionario = compactacion.cargar_diccionario()
+    if compactacion.extender_diccionario(df, diccionario):
+        compactacion.guardar_diccionario(diccionario)
+    faltantes = [c for c in esquema.names
+                 if c not in df.columns and c not in derivadas.CALCULOS and c not in coordenadas]
+    if faltantes:
+        raise KeyError(f"Columnas inexistentes en el DataFrame: {faltantes}")
+
+    def serie(nombre):
+        if nombre in coordenadas:
+            return coordenadas[nombre]
+        valores = derivadas.obtener_derivada(df, nombre) if nombre in derivadas.CALCULOS else df[nombre]
+        if nombre in compactacion.COLUMNAS_CATEGORICAS or nombre in compactacion.CATEGORIAS_DERIVADAS:
+            return compactacion.categorizar(valores, compactacion.tipo_categorico(nombre, diccionario))
+        return valores
+
+    columnas = [_columna(serie(campo.name), campo.type) for campo in esquema]
+    return pa.Table.from_arrays(columnas, schema=esquema)
+
+
+def escribir_parquet(bloques, ruta, esquema=ESQUEMA):
+    '''
+    Escribe uno o varios bloques como dataset Parquet particionado por "Año".
+
+    Cada bloque se agrega como nuevos archivos dentro de las particiones, por lo que el
+    dataset puede escribirse progresivamente desde el pipeline por bloques.
+
+    Parámetros:
+        bloques (pandas.DataFrame o iterable): Un DataFrame o un iterable de bloques.
+        ruta (str): Carpeta raíz del dataset. Si ya existe, se reemplazan sus particiones.
+        esquema (pyarrow.Schema): El esquema de destino.
+
+    Retorna:
+        int: La cantidad total de filas escritas.
+    '''
+    if isinstance(bloques, pd.DataFrame):
+        bloques = [bloques]
+
+    filas = 0
+    for numero, bloque in enumerate(bloques):
+        tabla = a_tabla(bloque, esquema)
+        ds.write_dataset(tabla, ruta, format="parquet", partitioning=PARTICIONADO,
+                         basename_template=f"parte-{numero:05d}-{uuid.uuid4().hex[:8]}-{{i}}.parquet",
+                         existing_data_behavior="overwrite_or_ignore" if numero else "delete_matching")
+        filas += tabla.num_rows
+    return filas
+
+
+def leer_parquet(ruta, columnas=None, filtros=None, esquema=ESQUEMA):
+    '''
+    Lee el dataset Parquet de homicidios con proyección de columnas y filtros a nivel de archivo.
+
+    Los filtros sobre "Año" descartan particiones completas sin abrirlas; el resto se evalúa
+    con las estadísticas de cada archivo antes de leer los datos. Los archivos se abren con
+    memory-map.
+
+    Parámetros:
+        ruta (str): Carpeta raíz del dataset.
+        columnas (list): Columnas a leer. Por defecto, todas.
+        filtros (list o pyarrow.compute.Expression): Filtros en la forma de pyarrow, por ejemplo
+            [("Año", ">=", 2019), ("Víctima", "=", "MOTO")].
+        esquema (pyarrow.Schema): El esquema del dataset.
+
+    Retorna:
+        pyarrow.Table: La tabla con las columnas pedidas, en el orden del esquema si columnas es None.
+    '''
+    tabla = pq.read_table(ruta, columns=columnas, filters=filtros, memory_map=True,
+                          partitioning=PARTICIONADO, schema=esquema)
+    return tabla.select(columnas if columnas is not None else esquema.names)
+
+
+def a_pandas(tabla):
+    '''
+    Convierte una tabla leída del dataset a pandas manteniendo las categorías y fechas tipadas.
+
+    Las columnas categóricas quedan con las categorías del diccionario global (ver
+    compactacion.py), también en datasets escritos antes de que existiera, y las variables
+    derivadas recuperan su orden.
+
+    Parámetros:
+        tabla (pyarrow.Table): Tabla devuelta por leer_parquet.
+
+    Retorna:
+        pandas.DataFrame: Las columnas de diccionario como Categorical y "Fecha" como datetime64.
+    '''
+    return compactacion.compactar(tabla.to_pandas(date_as_object=False), guardar=False)
@@ -0,0 +1,491 @@
+## MODO RÁPIDO DE LOS GRÁFICOS DE tools.graficos
+# seaborn calcula sus estadísticas en cada llamada y sobre todas las filas: barplot remuestrea 1000 veces cada
+# barra para el intervalo de confianza, histplot estima la densidad sobre cada edad y boxplot ordena cada grupo.
+# Con el modo rápido activo, los gráficos de tools.graficos se dibujan a partir de agregados ya calculados
+# (conteos, medias, cuantiles de las cajas y una densidad por núcleo en una malla fija, convolucionada por FFT)
+# con primitivas de matplotlib, imitando el aspecto de seaborn. Las distribuciones se resumen en tablas de
+# frecuencias (cuántas filas tiene cada valor), que se obtienen en una pasada con bincount o se leen del cubo:
+# a partir de ellas el costo depende de la cantidad de valores distintos y no de la cantidad de filas.
+# Importaciones
+import colorsys
+
+import matplotlib as mpl
+import numpy as np
+import pandas as pd
+import seaborn as sns
+
+
+# Puntos del soporte de la densidad (como gridsize de seaborn) y de la malla fina de la convolución
+PUNTOS_DENSIDAD = 200
+PUNTOS_MALLA = 2048
+
+# Valor de la normal estándar del intervalo de confianza del 95% de las medias
+Z_95 = 1.959963984540054
+
+# Saturación y ancho de las barras y cajas de seaborn
+SATURACION = 0.75
+ANCHO = 0.8
+
+_activo = False
+
+
+def activar():
+    '''
+    Activa el modo rápido para los gráficos de tools.graficos.
+    '''
+    global _activo
+    _activo = True
+
+
+def desactivar():
+    '''
+    Desactiva el modo rápido: los gráficos vuelven a dibujarse con seaborn.
+    '''
+    global _activo
+    _activo = False
+
+
+def activo():
+    '''
+    Retorna:
+        bool: True si el modo rápido está activo.
+    '''
+    return _activo
+
+
+## AGREGADOS
+
+def frecuencias(df, valor, grupos=()):
+    '''
+    Cuenta las filas de cada valor de una columna numérica, en una sola pasada.
+
+    Los nulos se descartan (como en seaborn). Los grupos quedan en el orden en que aparecen
+    en df, o en orden creciente si son numéricos; los valores, en orden creciente.
+
+    Parámetros:
+        df (pandas.DataFrame): El DataFrame con las filas.
+        valor (str): La columna numérica (por ejemplo, "Edad").
+        grupos (list): Columnas por las que separar los conteos (por ejemplo, ["Año", "Sexo"]).
+
+    Retorna:
+        pandas.Series: Los conteos de los valores presentes, indexados por (grupos..., valor),
+        como CuboAgregado.consultar(grupos + [valor]).
+    '''
+    grupos = [grupos] if isinstance(grupos, str) else list(grupos)
+    codigos, valores = pd.factorize(df[valor], sort=True)
+    validos = codigos >= 0
+    combinados = codigos.astype(np.int64)
+    niveles, tamaño = [pd.Index(valores)], len(valores)
+    # Código combinado de cada fila: los códigos de los grupos y del valor en base mixta (el primer grupo
+    # es la cifra más significativa, así los conteos quedan ordenados por grupos y luego por valor)
+    for grupo in reversed(grupos):
+        codigos_grupo, unicos = pd.factorize(df[grupo], sort=pd.api.types.is_numeric_dtype(df[grupo]))
+        validos &= codigos_grupo >= 0
+        combinados += codigos_grupo.astype(np.int64) * tamaño
+        tamaño *= len(unicos)
+        niveles.insert(0, pd.Index(unicos))
+    conteos = np.bincount(combinados[validos], minlength=tamaño)
+    indice = pd.MultiIndex.from_product(niveles, names=grupos + [valor]) if grupos else niveles[0].rename(valor)
+    serie = pd.Series(conteos, index=indice, name="Filas")
+    return serie[serie.to_numpy() > 0]
+
+
+def _valores(frecuencias):
+    # Valores (float, crecientes) y conteos de una tabla de frecuencias, sin nulos ni conteos en cero
+    serie = frecuencias[frecuencias.index.notna() & (frecuencias.to_numpy() > 0)]
+    valores = serie.index.to_numpy(dtype=float)
+    orden = np.argsort(valores, kind="stable")
+    return valores[orden], serie.to_numpy(dtype=np.int64)[orden]
+
+
+def por_grupo(frecuencias):
+    '''
+    Separa una tabla de frecuencias por (grupos..., valor) en una tabla por grupo.
+
+    Parámetros:
+        frecuencias (pandas.Series): Los conteos indexados por (grupos..., valor).
+
+    Retorna:
+        dict: Para cada grupo (una tupla si hay más de uno), sus conteos indexados por valor,
+        en el orden de frecuencias y sin los grupos nulos.
+    '''
+    niveles = list(range(frecuencias.index.nlevels - 1))
+    agrupado = frecuencias.groupby(level=niveles[0] if len(niveles) == 1 else niveles, sort=False)
+    return {clave: serie.droplevel(niveles) for clave, serie in agrupado}
+
+
+def cuantiles(frecuencias, q):
+    '''
+    Calcula cuantiles a partir de los conteos, con la interpolación lineal de numpy.percentile.
+
+    Parámetros:
+        frecuencias (pandas.Series): Los conteos indexados por valor.
+        q (array): Los cuantiles, entre 0 y 1.
+
+    Retorna:
+        numpy.ndarray: Los mismos cuantiles que sobre las filas expandidas.
+    '''
+    valores, conteos = _valores(frecuencias)
+    return _cuantiles(valores, conteos, q)
+
+
+def _cuantiles(valores, conteos, q):
+    # El valor de la posición r (desde 0) de los datos ordenados es el primero cuyo acumulado supera r
+    acumulado = np.cumsum(conteos)
+    posiciones = np.asarray(q, dtype=float) * (acumulado[-1] - 1)
+    abajo = np.floor(posiciones)
+    arriba = np.minimum(abajo + 1, acumulado[-1] - 1)
+    v_abajo = valores[np.searchsorted(acumulado, abajo, side="right")]
+    v_arriba = valores[np.searchsorted(acumulado, arriba, side="right")]
+    return v_abajo + (v_arriba - v_abajo) * (posiciones - abajo)
+
+
+def resumen_caja(frecuencias, bigotes=1.5, etiqueta=None):
+    '''
+    Calcula las estadísticas de una caja como matplotlib.cbook.boxplot_stats, desde los conteos.
+
+    Los atípicos se devuelven una vez por valor distinto: repetidos se dibujarían en el mismo lugar.
+
+    Parámetros:
+        frecuencias (pandas.Series): Los conteos indexados por valor.
+        bigotes (float): El largo de los bigotes en rangos intercuartílicos.
+        etiqueta (str): La etiqueta de la caja.
+
+    Retorna:
+        dict: Las estadísticas para Axes.bxp (med, q1, q3, whislo, whishi, fliers, mean, ...).
+    '''
+    valores, conteos = _valores(frecuencias)
+    n = conteos.sum()
+    q1, mediana, q3 = _cuantiles(valores, conteos, [0.25, 0.5, 0.75])
+    rango = q3 - q1
+    # Los bigotes llegan al valor más extremo dentro de 1.5 rangos intercuartílicos de la caja
+    altos = valores[valores <= q3 + bigotes * rango]
+    bajos = valores[valores >= q1 - bigotes * rango]
+    superior = altos.max() if len(altos) and altos.max() >= q3 else q3
+    inferior = bajos.min() if len(bajos) and bajos.min() <= q1 else q1
+    return {"label": etiqueta, "mean": (valores * conteos).sum() / n, "iqr": rango, "med": mediana,
+            "q1": q1, "q3": q3, "whislo": inferior, "whishi": superior,
+            "cilo": mediana - 1.57 * rango / np.sqrt(n), "cihi": mediana + 1.57 * rango / np.sqrt(n),
+            "fliers": np.concatenate([valores[valores < inferior], valores[valores > superior]])}
+
+
+def media_e_intervalo(frecuencias):
+    '''
+    Calcula la media y la mitad del intervalo de confianza del 95% desde los conteos.
+
+    Usa la aproximación normal (media ± 1.96 errores estándar), que coincide con el intervalo
+    por bootstrap de seaborn salvo en grupos muy chicos, sin remuestrear.
+
+    Parámetros:
+        frecuencias (pandas.Series): Los conteos indexados por valor.
+
+    Retorna:
+        tuple: La media y la mitad del intervalo (NaN con una sola fila).
+    '''
+    valores, conteos = _valores(frecuencias)
+    n = conteos.sum()
+    media = (valores * conteos).sum() / n
+    if n < 2:
+        return media, np.nan
+    desvio = np.sqrt((conteos * (valores - media) ** 2).sum() / (n - 1))
+    return media, Z_95 * desvio / np.sqrt(n)
+
+
+def histograma(frecuencias):
+    '''
+    Calcula el histograma de conteos con los intervalos "auto" de numpy (los de seaborn.histplot).
+
+    Parámetros:
+        frecuencias (pandas.Series): Los conteos indexados por valor.
+
+    Retorna:
+        tuple: Los bordes de los intervalos y la cantidad de filas en cada uno.
+    '''
+    valores, conteos = _valores(frecuencias)
+    n = conteos.sum()
+    primero, ultimo = valores[0], valores[-1]
+    if primero == ultimo:
+        primero, ultimo = primero - 0.5, ultimo + 0.5
+    # "auto" toma el menor ancho entre la regla de Freedman-Diaconis y la de Sturges
+    q1, q3 = _cuantiles(valores, conteos, [0.25, 0.75])
+    sturges = (valores[-1] - valores[0]) / (np.log2(n) + 1.0)
+    freedman = 2.0 * (q3 - q1) * n ** (-1.0 / 3.0)
+    ancho = min(freedman, sturges) if freedman else sturges
+    intervalos = int(np.ceil((ultimo - primero) / ancho)) if ancho else 1
+    bordes = np.linspace(primero, ultimo, intervalos + 1)
+    return bordes, np.histogram(valores, bordes, weights=conteos)[0]
+
+
+def densidad(frecuencias, corte=0, puntos=PUNTOS_DENSIDAD):
+    '''
+    Estima la densidad por núcleo gaussiano (ancho de Scott, como seaborn) desde los conteos.
+
+    Los conteos se reparten linealmente en una malla fija de PUNTOS_MALLA nodos y se convolucionan
+    con el núcleo por FFT; la densidad se interpola luego en el soporte.
+
+    Parámetros:
+        frecuencias (pandas.Series): Los conteos indexados por valor.
+        corte (float): Cuántos anchos de banda se extiende el soporte más allá de los datos.
+        puntos (int): Los puntos del soporte.
+
+    Retorna:
+        tuple: El soporte y la densidad, o None si los datos no tienen varianza.
+    '''
+    valores, conteos = _valores(frecuencias)
+    n = conteos.sum()
+    media = (valores * conteos).sum() / n
+    varianza = (conteos * (valores - media) ** 2).sum() / (n - 1) if n > 1 else 0.0
+    if np.isclose(varianza, 0):
+        return None
+    ancho = np.sqrt(varianza) * n ** (-1 / 5)
+    soporte = np.linspace(valores[0] - ancho * corte, valores[-1] + ancho * corte, puntos)
+
+    # Binning lineal: cada valor reparte su conteo entre los dos nodos vecinos de la malla
+    malla = np.linspace(soporte[0], soporte[-1], PUNTOS_MALLA)
+    paso = malla[1] - malla[0]
+    posiciones = (valores - malla[0]) / paso
+    izquierdos = np.clip(np.floor(posiciones).astype(np.int64), 0, PUNTOS_MALLA - 2)
+    fracciones = posiciones - izquierdos
+    pesos = np.bincount(izquierdos, conteos * (1 - fracciones), minlength=PUNTOS_MALLA) \
+        + np.bincount(izquierdos + 1, conteos * fracciones, minlength=PUNTOS_MALLA)
+
+    # Convolución lineal (con relleno de ceros) con el núcleo evaluado en todas las distancias de la malla
+    distancias = np.arange(-(PUNTOS_MALLA - 1), PUNTOS_MALLA) * paso
+    nucleo = np.exp(-0.5 * (distancias / ancho) ** 2) / (ancho * np.sqrt(2 * np.pi))
+    largo = 1 << int(np.ceil(np.log2(len(pesos) + len(nucleo) - 1)))
+    convolucion = np.fft.irfft(np.fft.rfft(pesos, largo) * np.fft.rfft(nucleo, largo), largo)
+    en_malla = convolucion[PUNTOS_MALLA - 1:2 * PUNTOS_MALLA - 1] / n
+    return soporte, np.interp(soporte, malla, np.maximum(en_malla, 0))
+
+
+## DIBUJO
+
+def colores(paleta, n, saturacion=SATURACION):
+    '''
+    Retorna:
+        list: n colores RGB de la paleta, con la saturación de seaborn.
+    '''
+    return [desaturar(c, saturacion) for c in sns.color_palette(paleta, n)]
+
+
+def desaturar(color, proporcion=SATURACION):
+    '''
+    Retorna:
+        tuple: El color RGB con la saturación multiplicada por proporcion (como seaborn.desaturate).
+    '''
+    h, l, s = colorsys.rgb_to_hls(*mpl.colors.to_rgb(color))
+    return colorsys.hls_to_rgb(h, l, s * proporcion)
+
+
+def color_siguiente(ax):
+    '''
+    Retorna:
+        tuple: El próximo color del ciclo de colores de ax (lo consume, como seaborn).
+    '''
+    prueba = ax.bar([np.nan], [np.nan])
+    color = mpl.colors.to_rgb(prueba.patches[0].get_facecolor())
+    prueba.remove()
+    return color
+
+
+def _color_lineas(colores_relleno):
+    # Gris de los bordes de las cajas: 60% de la menor luminosidad de los rellenos
+    luminosidad = min(colorsys.rgb_to_hls(*mpl.colors.to_rgb(c))[1] for c in colores_relleno)
+    return (luminosidad * 0.6,) * 3
+
+
+def _eje_categorico(ax, etiquetas, eje="x", nombre_x=None, nombre_y=None):
+    # Marcas, límites y nombres del eje categórico como los deja seaborn
+    posiciones = np.arange(len(etiquetas))
+    if eje == "x":
+        ax.set_xticks(posiciones, [str(e) for e in etiquetas])
+        ax.xaxis.grid(False)
+        ax.set_xlim(-0.5, len(etiquetas) - 0.5, auto=None)
+    else:
+        ax.set_yticks(posiciones, [str(e) for e in etiquetas])
+        ax.yaxis.grid(False)
+        ax.set_ylim(len(etiquetas) - 0.5, -0.5, auto=None)
+    _nombres(ax, nombre_x, nombre_y)
+
+
+def _nombres(ax, nombre_x, nombre_y):
+    # Nombres de los ejes que no tienen uno, ocultos si el eje no muestra sus marcas (ejes compartidos)
+    if not ax.get_xlabel() and nombre_x is not None:
+        ax.set_xlabel(nombre_x, visible=any(t.get_visible() for t in ax.get_xticklabels()))
+    if not ax.get_ylabel() and nombre_y is not None:
+        ax.set_ylabel(nombre_y, visible=any(t.get_visible() for t in ax.get_yticklabels()))
+
+
+def barras(ax, etiquetas, alturas, colores_barras, errores=None, nombre_x=None, nombre_y=None):
+    '''
+    Dibuja barras verticales como seaborn.barplot con datos ya agregados.
+
+    Parámetros:
+        ax (matplotlib.axes.Axes): Los ejes.
+        etiquetas (list): Las categorías del eje x, en orden.
+        alturas (array): La altura de cada barra.
+        colores_barras (color o list): Un color o uno por barra.
+        errores (array): La mitad del intervalo de cada barra; sin intervalos por defecto.
+        nombre_x, nombre_y (str): Los nombres de los ejes si todavía no tienen uno.
+
+    Retorna:
+        matplotlib.axes.Axes: Los ejes.
+    '''
+    posiciones = np.arange(len(etiquetas))
+    ax.bar(posiciones - ANCHO / 2, alturas, ANCHO, align="edge", color=colores_barras)
+    if errores is not None:
+        _intervalos(ax, posiciones, alturas, errores)
+    _eje_categorico(ax, etiquetas, "x", nombre_x, nombre_y)
+    return ax
+
+
+def barras_agrupadas(ax, etiquetas, niveles, alturas, colores_niveles, errores=None, nombre_x=None,
+                     nombre_y=None, titulo=None):
+    '''
+    Dibuja barras agrupadas por un segundo nivel (hue de seaborn.barplot) con datos ya agregados.
+
+    Parámetros:
+        ax (matplotlib.axes.Axes): Los ejes.
+        etiquetas (list): Las categorías del eje x, en orden.
+        niveles (list): Los niveles de cada grupo de barras, en orden.
+        alturas (numpy.ndarray): Las alturas, una fila por categoría y una columna por nivel (NaN: sin barra).
+        colores_niveles (list): Un color por nivel.
+        errores (numpy.ndarray): Las mitades de los intervalos, con la forma de alturas.
+        nombre_x, nombre_y (str): Los nombres de los ejes si todavía no tienen uno.
+        titulo (str): El título de la leyenda (por defecto, sin leyenda).
+
+    Retorna:
+        matplotlib.axes.Axes: Los ejes.
+    '''
+    posiciones = np.arange(len(etiquetas))
+    ancho = ANCHO / len(niveles)
+    for j, (nivel, color) in enumerate(zip(niveles, colores_niveles)):
+        presentes = ~np.isnan(alturas[:, j])
+        centros = posiciones[presentes] + ancho * j + ancho / 2 - ANCHO / 2
+        ax.bar(centros - ancho / 2, alturas[presentes, j], ancho, align="edge", color=color, label=str(nivel))
+        if errores is not None:
+            _intervalos(ax, centros, alturas[presentes, j], errores[presentes, j])
+    _eje_categorico(ax, etiquetas, "x", nombre_x, nombre_y)
+    if titulo is not None:
+        ax.legend(title=titulo)
+    return ax
+
+
+def _intervalos(ax, posiciones, alturas, errores):
+    # Una línea por intervalo, del gris y grosor de seaborn (las barras sin intervalo quedan sin línea)
+    for posicion, altura, error in zip(posiciones, alturas, errores):
+        if not np.isnan(error):
+            ax.plot([posicion, posicion], [altura - error, altura + error], color=".26",
+                    linewidth=1.5 * mpl.rcParams["lines.linewidth"])
+
+
+def cajas(ax, resumenes, colores_cajas, vertical=True, etiquetas=None, nombre_x=None, nombre_y=None):
+    '''
+    Dibuja diagramas de caja como seaborn.boxplot a partir de sus estadísticas (ver resumen_caja).
+
+    Parámetros:
+        ax (matplotlib.axes.Axes): Los ejes.
+        resumenes (list): Las estadísticas de cada caja, en orden.
+        colores_cajas (list): El color de relleno de cada caja.
+        vertical (bool): True para cajas verticales (categorías en el eje x).
+        etiquetas (list): Las categorías del eje categórico. Por defecto, marcas sin texto.
+        nombre_x, nombre_y (str): Los nombres de los ejes si todavía no tienen uno.
+
+    Retorna:
+        matplotlib.axes.Axes: Los ejes.
+    '''
+    linea = _color_lineas(colores_cajas)
+    posiciones = np.arange(len(resumenes))
+    artistas = ax.bxp(resumenes, positions=posiciones, widths=ANCHO, capwidths=ANCHO / 2, patch_artist=True,
+                      orientation="vertical" if vertical else "horizontal", manage_ticks=False,
+                      boxprops={"edgecolor": linea}, medianprops={"color": linea, "solid_capstyle": "butt"},
+                      whiskerprops={"color": linea, "solid_capstyle": "butt"},
+                      flierprops={"markeredgecolor": linea}, capprops={"color": linea})
+    for caja, color in zip(artistas["boxes"], colores_cajas):
+        caja.set_facecolor(color)
+    etiquetas = [""] * len(resumenes) if etiquetas is None else etiquetas
+    _eje_categorico(ax, etiquetas, "x" if vertical else "y", nombre_x, nombre_y)
+    return ax
+
+
+def cajas_por_grupo(ax, frecuencias, paleta, vertical=True, nombre_x=None, nombre_y=None):
+    '''
+    Dibuja una caja por grupo a partir de los conteos por (grupo, valor), como seaborn.boxplot con x o y.
+
+    Parámetros:
+        ax (matplotlib.axes.Axes): Los ejes.
+        frecuencias (pandas.Series): Los conteos indexados por (grupo, valor), como los devuelve frecuencias.
+        paleta (str o list): La paleta de seaborn de las cajas.
+        vertical (bool): True para cajas verticales (grupos en el eje x).
+        nombre_x, nombre_y (str): Los nombres de los ejes si todavía no tienen uno.
+
+    Retorna:
+        matplotlib.axes.Axes: Los ejes.
+    '''
+    conteos = por_grupo(frecuencias)
+    resumenes = [resumen_caja(serie) for serie in conteos.values()]
+    return cajas(ax, resumenes, colores(paleta, len(resumenes)), vertical, list(conteos), nombre_x, nombre_y)
+
+
+def medias_por_grupo(ax, frecuencias, paleta, nombre_x=None, nombre_y=None):
+    '''
+    Dibuja la media de cada grupo con su intervalo del 95%, como seaborn.barplot con x y hue.
+
+    Parámetros:
+        ax (matplotlib.axes.Axes): Los ejes.
+        frecuencias (pandas.Series): Los conteos indexados por (x, hue, valor), como los devuelve frecuencias.
+        paleta (str o list): La paleta de seaborn de los niveles de hue.
+        nombre_x, nombre_y (str): Los nombres de los ejes si todavía no tienen uno.
+
+    Retorna:
+        matplotlib.axes.Axes: Los ejes.
+    '''
+    conteos = por_grupo(frecuencias)
+    nombres = list(frecuencias.index.names[:2])
+    medias = pd.DataFrame([media_e_intervalo(serie) for serie in conteos.values()], columns=["Media", "Error"],
+                          index=pd.MultiIndex.from_tuples(list(conteos), names=nombres))
+    categorias, niveles = medias.index.unique(nombres[0]), medias.index.unique(nombres[1])
+    tabla = medias.unstack(nombres[1]).reindex(categorias)
+    return barras_agrupadas(ax, list(categorias), list(niveles), tabla["Media"][niveles].to_numpy(dtype=float),
+                            colores(paleta, len(niveles)), tabla["Error"][niveles].to_numpy(dtype=float),
+                            nombre_x, nombre_y)
+
+
+def histograma_densidad(ax, frecuencias, color, edgecolor=None):
+    '''
+    Dibuja un histograma de conteos con su curva de densidad, como seaborn.histplot(kde=True).
+
+    Parámetros:
+        ax (matplotlib.axes.Axes): Los ejes.
+        frecuencias (pandas.Series): Los conteos indexados por valor (su nombre es el del eje x).
+        color (str): El color de las barras y de la curva.
+        edgecolor (str): El color de los bordes de las barras.
+
+    Retorna:
+        matplotlib.axes.Axes: Los ejes.
+    '''
+    bordes, alturas = histograma(frecuencias)
+    anchos = np.diff(bordes)
+    barras_hist = ax.bar(bordes[:-1], alturas, anchos, align="edge", color="none",
+                         facecolor=mpl.colors.to_rgba(color, 0.5),
+                         edgecolor=edgecolor if edgecolor is not None else mpl.rcParams["patch.edgecolor"])
+    for barra in barras_hist:
+        barra.sticky_edges.x[:] = []
+        barra.sticky_edges.y[:] = (0, np.inf)
+
+    curva = densidad(frecuencias)
+    if curva is not None:
+        # La densidad se escala al área del histograma para leerse en conteos
+        soporte, valores = curva
+        linea, = ax.plot(soporte, valores * (alturas * anchos).sum(), color=mpl.colors.to_rgba(color, 1))
+        linea.sticky_edges.y[:] = (0, np.inf)
+
+    # El grosor de los bordes depende del ancho en puntos de la barra más angosta (como en seaborn)
+    ax.autoscale_view()
+    angosta = np.argmin(anchos)
+    puntos = 72 / ax.figure.dpi * abs(ax.transData.transform([bordes[angosta] + anchos[angosta]] * 2)
+                                      - ax.transData.transform([bordes[angosta]] * 2))[0]
+    for barra in barras_hist:
+        barra.set_linewidth(min(0.1 * puntos, barra.get_linewidth()))
+    _nombres(ax, frecuencias.index.name or "", "Count")
+    return ax
@@ -0,0 +1,181 @@
+## CÓDIGO ENTERO DEL ID DE LOS HECHOS
+# Los Id de los hechos tienen la forma "AAAA-NNNN": el año y el número del hecho dentro del año (con al
+# menos cuatro dígitos). Empaquetamos cada Id en un entero año * BASE + número (int32), que ocupa 4 bytes
+# en lugar de un texto y se compara, ordena y une mucho más rápido. El orden de los códigos es el de
+# año y número (para números de cuatro dígitos coincide con el orden de los textos), así que en un
+# dataset ordenado por código las filas de un rango de años se encuentran con una búsqueda binaria.
+# Importaciones
+import numpy as np
+import pandas as pd
+
+# pyarrow es opcional: permite validar y convertir los textos sin pasar por objetos de Python
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+
+
+# Forma canónica de un Id: el número tiene cuatro dígitos, o más sin ceros a la izquierda
+# (así decodificar(codificar(id)) == id siempre)
+PATRON = r"\d{4}-(?:\d{4}|[1-9]\d{4,5})"
+
+# Multiplicador del año en el código: el número del hecho tiene a lo sumo seis dígitos
+BASE = 1_000_000
+
+
+def _texto(ids):
+    # Un arreglo de Arrow con los Id (los valores que no son texto se convierten a texto)
+    serie = pd.Series(ids) if not isinstance(ids, pd.Series) else ids
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        serie = serie.astype(object)
+    arreglo = pa.array(serie.astype("string"), type=pa.string(), from_pandas=True)
+    return arreglo.combine_chunks() if isinstance(arreglo, pa.ChunkedArray) else arreglo
+
+
+def es_valido(ids):
+    '''
+    Indica qué Id tienen la forma canónica "AAAA-NNNN" (ver PATRON).
+
+    Parámetros:
+        ids (pandas.Series o array): Los Id.
+
+    Retorna:
+        numpy.ndarray: Un arreglo booleano; los nulos no son válidos.
+    '''
+    if pa is not None:
+        return pc.fill_null(pc.match_substring_regex(_texto(ids), f"^{PATRON}$"), False).to_numpy(zero_copy_only=False)
+    return pd.Series(ids).astype("string").str.fullmatch(PATRON).fillna(False).to_numpy(dtype=bool)
+
+
+def codificar(ids, invalido=None):
+    '''
+    Empaqueta los Id en enteros año * BASE + número, de forma vectorizada.
+
+    Parámetros:
+        ids (pandas.Series o array): Los Id con la forma "AAAA-NNNN".
+        invalido (int): El código de los Id nulos o con otro formato (por ejemplo -1). Por
+            defecto se lanza ValueError.
+
+    Retorna:
+        numpy.ndarray: Los códigos en el mismo orden que ids: int32, o int64 si algún año es
+        posterior a 2146 y el código no entra en 32 bits.
+
+    Lanza:
+        ValueError: Si algún Id es nulo o no tiene la forma canónica (y invalido es None).
+    '''
+    validos = es_valido(ids)
+    todos = validos.all()
+    if not todos and invalido is None:
+        malos = pd.Series(ids).to_numpy(dtype=object)[~validos]
+        raise ValueError(f"Hay {len(malos)} Id con formato inválido (se espera AAAA-NNNN), por ejemplo: "
+                         f"{', '.join(repr(x) for x in malos[:5])}")
+    if pa is not None:
+        arreglo = _texto(ids)
+        if not todos:
+            # Reemplazamos los inválidos por un Id cualquiera para poder convertir el resto de una vez
+            arreglo = pc.if_else(pa.array(validos), arreglo, "0000-0000")
+        años = pc.cast(pc.utf8_slice_codeunits(arreglo, 0, 4), pa.int32()).to_numpy()
+        numeros = pc.cast(pc.utf8_slice_codeunits(arreglo, 5, 12), pa.int32()).to_numpy()
+    else:
+        serie = pd.Series(ids).astype("string").where(validos, "0000-0000")
+        años = serie.str.slice(0, 4).astype("int32").to_numpy()
+        numeros = serie.str.slice(5).astype("int32").to_numpy()
+    codigos = años.astype(np.int64) * BASE + numeros
+    if not todos:
+        codigos[~validos] = invalido
+    minimo, maximo = np.iinfo(np.int32).min, np.iinfo(np.int32).max
+    return codigos.astype(np.int32) if len(codigos) == 0 or (codigos.min() >= minimo and codigos.max() <= maximo) \
+        else codigos
+
+
+def decodificar(codigos):
+    '''
+    Recupera los Id de texto a partir de sus códigos.
+
+    Parámetros:
+        codigos (array): Los códigos de codificar.
+
+    Retorna:
+        pandas.Series: Los Id "AAAA-NNNN".
+    '''
+    codigos = np.asarray(codigos)
+    if pa is not None:
+        años = pc.cast(pa.array(codigos // BASE), pa.string())
+        numeros = pc.utf8_lpad(pc.cast(pa.array(codigos % BASE), pa.string()), width=4, padding="0")
+        return pd.Series(pc.binary_join_element_wise(años, numeros, "-"), dtype="str")
+    años = pd.Series(codigos // BASE).astype("str")
+    numeros = pd.Series(codigos % BASE).astype("str").str.zfill(4)
+    return años + "-" + numeros
+
+
+def año(codigos):
+    '''
+    Retorna:
+        numpy.ndarray: El año de cada código.
+    '''
+    return np.asarray(codigos) // BASE
+
+
+def rango_años(codigos, desde, hasta=None):
+    '''
+    Busca las filas de un rango de años en códigos ordenados, con una búsqueda binaria.
+
+    Parámetros:
+        codigos (array): Los códigos ordenados de menor a mayor (como en homicidios_cleaned).
+        desde (int): El primer año.
+        hasta (int): El último año (incluido). Por defecto, igual a desde.
+
+    Retorna:
+        slice: Las posiciones de las filas, para usar con df.iloc.
+    '''
+    hasta = desde if hasta is None else hasta
+    inicio, fin = np.searchsorted(codigos, [desde * BASE, (hasta + 1) * BASE], side="left")
+    return slice(int(inicio), int(fin))
+
+
+def unir_por_id(izquierda, derecha, columna="Id"):
+    '''
+    Left join por Id con los códigos enteros: ordena ambos lados y busca cada código de la
+    izquierda en la derecha con una búsqueda binaria (merge join ordenado).
+
+    Equivale a izquierda.merge(derecha, on=columna, how="left") ordenado por Id, conservando el
+    orden original de las filas de la izquierda dentro de cada Id. Las filas sin Id en la derecha
+    quedan con nulos. Si la derecha tiene Id repetidos o columnas en común con la izquierda
+    (además de la clave), se usa merge de pandas y luego se ordena por código.
+
+    Parámetros:
+        izquierda (pandas.DataFrame): El DataFrame de la izquierda (por ejemplo, VICTIMAS).
+        derecha (pandas.DataFrame): El DataFrame de la derecha (por ejemplo, HECHOS).
+        columna (str): La columna con los Id.
+
+    Retorna:
+        pandas.DataFrame: Las columnas de la izquierda y luego las de la derecha (sin la clave),
+        ordenado por código y con índice 0..n-1.
+    '''
+    codigos_izquierda = codificar(izquierda[columna])
+    codigos_derecha = codificar(derecha[columna])
+    orden_izquierda = np.argsort(codigos_izquierda, kind="stable")
+    orden_derecha = np.argsort(codigos_derecha, kind="stable")
+    izquierda_ordenada = codigos_izquierda[orden_izquierda]
+    derecha_ordenada = codigos_derecha[orden_derecha]
+
+    comunes = izquierda.columns.intersection(derecha.columns).drop(columna)
+    if len(comunes) or (derecha_ordenada[1:] == derecha_ordenada[:-1]).any():
+        unido = izquierda.merge(derecha, on=columna, how="left")
+        return unido.iloc[np.argsort(codificar(unido[columna]), kind="stable")].reset_index(drop=True)
+
+    # Posición de cada código de la izquierda en la derecha (-1 si no está)
+    posiciones = np.searchsorted(derecha_ordenada, izquierda_ordenada)
+    acotadas = np.minimum(posiciones, max(len(derecha_ordenada) - 1, 0))
+    encontradas = derecha_ordenada[acotadas] == izquierda_ordenada if len(derecha_ordenada) \
+        else np.zeros(len(izquierda_ordenada), dtype=bool)
+    filas_derecha = np.where(encontradas, orden_derecha[acotadas] if len(orden_derecha) else -1, -1)
+
+    resto = derecha.drop(columns=columna).reset_index(drop=True)
+    if encontradas.all():
+        resto = resto.take(filas_derecha)
+    else:
+        # reindex deja en nulo las filas de la etiqueta -1 (como merge con how="left")
+        resto = resto.reindex(filas_derecha)
+    return pd.concat([izquierda.iloc[orden_izquierda].reset_index(drop=True), resto.reset_index(drop=True)], axis=1)
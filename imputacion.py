@@ -0,0 +1,194 @@
+## MOTOR DE IMPUTACIÓN POR LOTES
+# Importaciones
+import pandas as pd
+import numpy as np
+
+
+# Valores que el dataset original usa para indicar "sin dato"
+CENTINELAS = ("SD",)
+
+# Estrategias soportadas y su agregación de pandas (None para las no numéricas)
+ESTRATEGIAS = {"moda": None, "media": "mean", "mediana": "median"}
+
+
+def normalizar_estrategia(estrategia):
+    '''
+    Convierte la especificación de una estrategia a la forma (nombre, claves de grupo).
+
+    Se aceptan las formas "moda", ("media", "Sexo") o ("mediana", ["Sexo", "Año"]).
+
+    Parámetros:
+        estrategia (str o tuple): La estrategia tal como la indica el usuario.
+
+    Retorna:
+        tuple: El nombre de la estrategia y una tupla (posiblemente vacía) con las claves de agrupación.
+    '''
+    if isinstance(estrategia, str):
+        nombre, claves = estrategia, ()
+    else:
+        nombre, claves = estrategia
+        claves = (claves,) if isinstance(claves, str) else tuple(claves)
+
+    if nombre not in ESTRATEGIAS:
+        raise ValueError(f"Estrategia desconocida: {nombre!r}. Opciones: {sorted(ESTRATEGIAS)}")
+    return nombre, claves
+
+
+def _limpiar_centinelas(serie, centinelas, numerica):
+    # Detectamos nulos y centinelas en una sola pasada vectorizada. Las columnas no numéricas no
+    # se reescriben (la moda descarta los centinelas al contar), así evitamos copiar la columna.
+    centinela = None
+    if centinelas and not pd.api.types.is_numeric_dtype(serie.dtype):
+        centinela = serie.isin(centinelas).to_numpy()
+
+    if numerica:
+        if centinela is not None:
+            serie = serie.mask(centinela)
+        try:
+            # Camino rápido: tras quitar los centinelas la columna suele ser convertible directamente
+            serie = serie.astype("float64")
+        except (TypeError, ValueError):
+            serie = pd.to_numeric(serie, errors="coerce")
+        return serie, serie.isna().to_numpy()
+
+    nulos = serie.isna().to_numpy()
+    if centinela is not None:
+        nulos = nulos | centinela
+    return serie, nulos
+
+
+def _moda(serie, centinelas):
+    # Igual que Series.mode().iloc[0]: ante empates se queda con el menor valor
+    conteos = serie.value_counts().drop(list(centinelas), errors="ignore")
+    if conteos.empty:
+        return np.nan
+    return conteos[conteos == conteos.max()].index.sort_values()[0]
+
+
+def _indices_de_grupo(df, claves, tabla):
+    # Posición de cada fila dentro del índice de la tabla de estadísticos (-1 si el grupo no existe)
+    if len(claves) == 1:
+        filas = pd.Index(df[claves[0]])
+    else:
+        filas = pd.MultiIndex.from_arrays([df[c] for c in claves])
+    return tabla.index.get_indexer(filas)
+
+
+def _moda_por_grupo(serie, df, claves, centinelas):
+    # Contamos (grupo, valor) una sola vez; idxmax toma el primer máximo, es decir el menor valor en empate
+    conteos = serie.groupby([df[c] for c in claves] + [serie], observed=True, sort=True).size()
+    conteos = conteos[~conteos.index.get_level_values(-1).isin(list(centinelas))]
+    if conteos.empty:
+        return pd.Series(dtype=object)
+    niveles = list(range(len(claves)))
+    mejores = conteos.groupby(level=niveles, observed=True).idxmax()
+    return pd.Series([t[-1] for t in mejores.to_numpy()], index=mejores.index)
+
+
+def imputar(df, estrategias, centinelas=CENTINELAS, inplace=True):
+    '''
+    Completa los valores ausentes de varias columnas de un DataFrame en una sola llamada.
+
+    Cada columna se imputa con la moda, la media o la mediana, ya sea global o calculada por
+    grupos (por ejemplo, la edad media según "Sexo" o la moda de "Víctima" según "Rol"). Los
+    centinelas como "SD" se tratan como nulos. Las columnas que comparten estrategia numérica y
+    claves de agrupación se resuelven con un único groupby, y el relleno se hace mediante
+    indexación de NumPy, sin recorrer las filas en Python. Si un grupo no tiene ningún valor
+    válido, se usa el estadístico global de la columna.
+
+    Parámetros:
+        df (pandas.DataFrame): El DataFrame que contiene las columnas a imputar.
+        estrategias (dict): Diccionario columna -> estrategia. La estrategia puede ser "moda",
+            "media", "mediana" o una tupla (estrategia, claves) con una o varias columnas de agrupación.
+        centinelas (tuple): Valores que deben considerarse nulos. Por defecto ("SD",).
+        inplace (bool): Si es True se modifica df; si es False se trabaja sobre una única copia.
+
+    Retorna:
+        tuple: El DataFrame imputado y un DataFrame de reporte con una fila por columna que incluye:
+        - "columna": Nombre de la columna imputada.
+        - "estrategia": Estrategia aplicada.
+        - "grupo": Claves de agrupación utilizadas (vacío si es global).
+        - "nulos": Cantidad de nulos (incluidos centinelas) antes de imputar.
+        - "imputados": Cantidad de valores completados.
+        - "restantes": Cantidad de nulos que no pudieron completarse.
+        - "valores": Valor imputado (global) o diccionario grupo -> valor.
+    '''
+    if not inplace:
+        df = df.copy()
+
+    planes = {columna: normalizar_estrategia(e) for columna, e in estrategias.items()}
+    faltantes = {c for c in planes if c not in df.columns}
+    faltantes |= {k for _, claves in planes.values() for k in claves if k not in df.columns}
+    if faltantes:
+        raise KeyError(f"Columnas inexistentes en el DataFrame: {sorted(faltantes)}")
+
+    # Limpiamos centinelas de todas las columnas involucradas antes de calcular estadísticos
+    limpias = {}
+    for columna, (nombre, _) in planes.items():
+        limpias[columna] = _limpiar_centinelas(df[columna], centinelas, ESTRATEGIAS[nombre] is not None)
+
+    # Agrupamos las columnas numéricas que comparten estrategia y claves para un único groupby
+    lotes = {}
+    for columna, (nombre, claves) in planes.items():
+        if ESTRATEGIAS[nombre] is not None and claves:
+            lotes.setdefault((nombre, claves), []).append(columna)
+
+    tablas = {}
+    for (nombre, claves), columnas in lotes.items():
+        bloque = pd.DataFrame({c: limpias[c][0] for c in columnas})
+        agregado = bloque.groupby([df[k] for k in claves], observed=True).agg(ESTRATEGIAS[nombre])
+        for columna in columnas:
+            tablas[columna] = agregado[columna]
+
+    reporte = []
+    for columna, (nombre, claves) in planes.items():
+        serie, nulos = limpias[columna]
+        n_nulos = int(nulos.sum())
+
+        if nombre == "moda":
+            global_ = _moda(serie, centinelas)
+        else:
+            global_ = serie.agg(ESTRATEGIAS[nombre])
+
+        # Las estrategias numéricas trabajan sobre float64; la moda conserva el tipo original
+        tipo = object if ESTRATEGIAS[nombre] is None else "float64"
+
+        if claves:
+            tabla = tablas[columna] if columna in tablas else _moda_por_grupo(serie, df, claves, centinelas)
+            valores = tabla.to_dict()
+            relleno = None
+            if n_nulos:
+                posiciones = _indices_de_grupo(df.loc[nulos, list(claves)], claves, tabla)
+                candidatos = tabla.to_numpy(dtype=tipo)
+                relleno = np.full(n_nulos, global_, dtype=tipo)
+                encontrados = posiciones >= 0
+                relleno[encontrados] = candidatos[posiciones[encontrados]]
+                # Grupos sin valores válidos caen al estadístico global
+                relleno[pd.isna(relleno)] = global_
+        else:
+            valores = global_
+            relleno = np.full(n_nulos, global_, dtype=tipo) if n_nulos else None
+
+        if relleno is not None:
+            if ESTRATEGIAS[nombre] is None:
+                # Para la moda escribimos solo las posiciones nulas y conservamos el dtype de la columna
+                serie = serie.copy()
+                serie.iloc[np.flatnonzero(nulos)] = relleno
+            else:
+                base = serie.to_numpy(dtype=tipo, copy=True)
+                base[nulos] = relleno
+                serie = pd.Series(base, index=serie.index, name=columna)
+
+        restantes = int(serie.isna().sum()) if relleno is not None else n_nulos
+        df[columna] = serie
+        reporte.append({
+            "columna": columna,
+            "estrategia": nombre,
+            "grupo": ", ".join(claves),
+            "nulos": n_nulos,
+            "imputados": n_nulos - restantes,
+            "restantes": restantes,
+            "valores": valores,
+        })
+
+    return df, pd.DataFrame(reporte)
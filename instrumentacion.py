@@ -0,0 +1,313 @@
+## INSTRUMENTACIÓN DE LAS FUNCIONES DE tools
+# Registra, para cada llamada a una función pública de tools, el tiempo, las filas de entrada y de
+# salida, los bytes asignados (con tracemalloc, opcional) y las copias de DataFrame/Series, y envía cada medición a
+# uno o más sumideros: en memoria, un archivo JSONL o métricas en formato de texto de Prometheus.
+# Es opcional: mientras está desactivada, tools expone las funciones originales (sin envoltura), así
+# que no agrega ningún costo. Solo se instrumentan las llamadas hechas a través de tools.funcion.
+# Importaciones
+import functools
+import http.server
+import json
+import threading
+import time
+import tracemalloc
+
+import pandas as pd
+
+import tools
+
+
+# Límites (en segundos) de los intervalos del histograma de duraciones de Prometheus
+INTERVALOS_SEGUNDOS = (0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+# Campos de cada medición
+COLUMNAS = ["funcion", "modulo", "inicio", "segundos", "filas_entrada", "filas_salida", "bytes_asignados",
+            "copias", "error"]
+
+_sumideros = ()
+_con_memoria = False
+_inicio_tracemalloc = False
+_copia_dataframe = _copia_serie = None
+
+# Contador de copias y profundidad de llamadas instrumentadas anidadas, por hilo
+_estado = threading.local()
+
+
+class SumideroMemoria:
+    '''
+    Guarda las mediciones en una lista.
+
+    Atributos:
+        mediciones (list): Las mediciones (diccionarios), en el orden en que terminaron las llamadas.
+    '''
+
+    def __init__(self):
+        self.mediciones = []
+        self._candado = threading.Lock()
+
+    def registrar(self, medicion):
+        with self._candado:
+            self.mediciones.append(medicion)
+
+    def tabla(self):
+        '''
+        Retorna:
+            pandas.DataFrame: Una fila por llamada.
+        '''
+        return pd.DataFrame(self.mediciones, columns=COLUMNAS)
+
+    def resumen(self):
+        '''
+        Retorna:
+            pandas.DataFrame: Por función, las llamadas, los segundos totales y máximos, las filas, los
+            bytes y las copias, ordenado de la que más tiempo consumió a la que menos.
+        '''
+        return (self.tabla().groupby("funcion")
+                .agg(llamadas=("segundos", "size"), segundos=("segundos", "sum"), segundos_max=("segundos", "max"),
+                     filas_entrada=("filas_entrada", "sum"), filas_salida=("filas_salida", "sum"),
+                     bytes_asignados=("bytes_asignados", "sum"), copias=("copias", "sum"),
+                     errores=("error", "count"))
+                .sort_values("segundos", ascending=False))
+
+
+class SumideroJSONL:
+    '''
+    Agrega cada medición como una línea JSON al final de un archivo.
+
+    Parámetros:
+        ruta (str): La ruta del archivo (se crea si no existe).
+    '''
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self._candado = threading.Lock()
+
+    def registrar(self, medicion):
+        linea = json.dumps(medicion, ensure_ascii=False)
+        with self._candado, open(self.ruta, "a", encoding="utf-8") as archivo:
+            archivo.write(linea + "\n")
+
+
+class SumideroPrometheus:
+    '''
+    Acumula las mediciones por función y las expone en el formato de texto de Prometheus.
+
+    Las métricas son contadores de llamadas, errores, filas, bytes y copias, y un histograma de
+    duraciones, todos con la etiqueta "funcion". El texto se obtiene con texto() o se publica en
+    http://direccion:puerto/metrics con servir().
+    '''
+
+    def __init__(self, intervalos=INTERVALOS_SEGUNDOS):
+        self.intervalos = tuple(intervalos)
+        self._funciones = {}
+        self._candado = threading.Lock()
+        self._servidor = None
+
+    def registrar(self, medicion):
+        with self._candado:
+            acumulado = self._funciones.setdefault(medicion["funcion"], {
+                "llamadas": 0, "errores": 0, "segundos": 0.0, "filas_entrada": 0, "filas_salida": 0,
+                "bytes_asignados": 0, "copias": 0, "intervalos": [0] * len(self.intervalos)})
+            acumulado["llamadas"] += 1
+            acumulado["errores"] += medicion["error"] is not None
+            acumulado["segundos"] += medicion["segundos"]
+            for campo in ("filas_entrada", "filas_salida", "bytes_asignados", "copias"):
+                acumulado[campo] += medicion[campo] or 0
+            for i, limite in enumerate(self.intervalos):
+                acumulado["intervalos"][i] += medicion["segundos"] <= limite
+
+    def texto(self):
+        '''
+        Retorna:
+            str: Las métricas en el formato de exposición de texto de Prometheus (versión 0.0.4).
+        '''
+        contadores = [("llamadas", "tools_llamadas_total", "Llamadas a la función"),
+                      ("errores", "tools_errores_total", "Llamadas que terminaron con una excepción"),
+                      ("filas_entrada", "tools_filas_entrada_total", "Filas de los DataFrame o Series recibidos"),
+                      ("filas_salida", "tools_filas_salida_total", "Filas de los DataFrame o Series devueltos"),
+                      ("bytes_asignados", "tools_bytes_asignados_total", "Bytes asignados (pico de tracemalloc)"),
+                      ("copias", "tools_copias_total", "Copias de DataFrame y Series")]
+        with self._candado:
+            funciones = {nombre: dict(acumulado, intervalos=list(acumulado["intervalos"]))
+                         for nombre, acumulado in sorted(self._funciones.items())}
+
+        lineas = []
+        for campo, metrica, ayuda in contadores:
+            lineas += [f"# HELP {metrica} {ayuda}", f"# TYPE {metrica} counter"]
+            lineas += [f'{metrica}{{funcion="{nombre}"}} {acumulado[campo]}' for nombre, acumulado in funciones.items()]
+
+        metrica = "tools_duracion_segundos"
+        lineas += [f"# HELP {metrica} Duración de las llamadas", f"# TYPE {metrica} histogram"]
+        for nombre, acumulado in funciones.items():
+            for limite, cantidad in zip(self.intervalos, acumulado["intervalos"]):
+                lineas.append(f'{metrica}_bucket{{funcion="{nombre}",le="{limite}"}} {cantidad}')
+            lineas.append(f'{metrica}_bucket{{funcion="{nombre}",le="+Inf"}} {acumulado["llamadas"]}')
+            lineas.append(f'{metrica}_sum{{funcion="{nombre}"}} {acumulado["segundos"]}')
+            lineas.append(f'{metrica}_count{{funcion="{nombre}"}} {acumulado["llamadas"]}')
+        return "\n".join(lineas) + "\n"
+
+    def servir(self, puerto=9464, direccion="127.0.0.1"):
+        '''
+        Publica las métricas en http://direccion:puerto/metrics desde un hilo en segundo plano.
+
+        Parámetros:
+            puerto (int): El puerto (0 elige uno libre).
+            direccion (str): La dirección de escucha (por defecto solo la máquina local).
+
+        Retorna:
+            int: El puerto en el que escucha el servidor.
+        '''
+        sumidero = self
+
+        class Manejador(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                cuerpo = sumidero.texto().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(cuerpo)))
+                self.end_headers()
+                self.wfile.write(cuerpo)
+
+            def log_message(self, *args):
+                pass
+
+        self.detener()
+        self._servidor = http.server.ThreadingHTTPServer((direccion, puerto), Manejador)
+        threading.Thread(target=self._servidor.serve_forever, daemon=True).start()
+        return self._servidor.server_port
+
+    def detener(self):
+        '''
+        Detiene el servidor de métricas, si está activo.
+        '''
+        if self._servidor is not None:
+            self._servidor.shutdown()
+            self._servidor.server_close()
+            self._servidor = None
+
+
+def _filas(valor):
+    return len(valor) if isinstance(valor, (pd.DataFrame, pd.Series)) else None
+
+
+def _contar_copias(copia):
+    # Envoltura de DataFrame.copy / Series.copy que suma al contador del hilo
+    @functools.wraps(copia)
+    def contar(self, *args, **kwargs):
+        _estado.copias = getattr(_estado, "copias", 0) + 1
+        return copia(self, *args, **kwargs)
+    return contar
+
+
+def instrumentar(funcion):
+    '''
+    Envuelve una función para medir cada llamada y enviar la medición a los sumideros activos.
+
+    Las filas de entrada son las del primer DataFrame o Series recibido y las de salida las del
+    valor devuelto (None si no es un DataFrame ni una Series, como en las imputaciones que
+    modifican df). Los bytes asignados son el pico de tracemalloc durante la llamada; en llamadas
+    anidadas solo se miden en la más externa (las internas informan None). Las copias cuentan las
+    llamadas a DataFrame.copy y Series.copy, incluidas las que hace pandas internamente.
+
+    Parámetros:
+        funcion (function): La función a instrumentar.
+
+    Retorna:
+        function: La función envuelta (la original queda en el atributo __wrapped__).
+    '''
+    @functools.wraps(funcion)
+    def envoltura(*args, **kwargs):
+        profundidad = getattr(_estado, "profundidad", 0)
+        medir_memoria = _con_memoria and profundidad == 0 and tracemalloc.is_tracing()
+        if medir_memoria:
+            memoria_inicial = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        copias_iniciales = getattr(_estado, "copias", 0)
+        entrada = next((len(a) for a in list(args) + list(kwargs.values()) if isinstance(a, (pd.DataFrame, pd.Series))),
+                       None)
+        resultado = error = None
+        _estado.profundidad = profundidad + 1
+        inicio, reloj = time.time(), time.perf_counter()
+        try:
+            resultado = funcion(*args, **kwargs)
+            return resultado
+        except Exception as excepcion:
+            error = type(excepcion).__name__
+            raise
+        finally:
+            segundos = time.perf_counter() - reloj
+            _estado.profundidad = profundidad
+            medicion = {"funcion": funcion.__name__, "modulo": funcion.__module__, "inicio": inicio,
+                        "segundos": segundos, "filas_entrada": entrada, "filas_salida": _filas(resultado),
+                        "bytes_asignados": (tracemalloc.get_traced_memory()[1] - memoria_inicial) if medir_memoria else None,
+                        "copias": getattr(_estado, "copias", 0) - copias_iniciales, "error": error}
+            for sumidero in _sumideros:
+                sumidero.registrar(medicion)
+
+    envoltura._instrumentada = True
+    return envoltura
+
+
+def activar(*sumideros, memoria=False):
+    '''
+    Activa la instrumentación de las funciones públicas de tools.
+
+    Las funciones ya cargadas se reemplazan en tools por su versión instrumentada y las que se
+    carguen después se instrumentan al cargarlas (sin importar antes matplotlib ni seaborn).
+
+    Parámetros:
+        sumideros: Los destinos de las mediciones (objetos con un método registrar(medicion)). Sin
+            sumideros se usa un SumideroMemoria.
+        memoria (bool): Si se miden los bytes asignados con tracemalloc. Mientras está activo, el
+            rastreo hace más lenta cada asignación de Python (unas 20 veces en funciones que se
+            aplican valor por valor, como convertir_a_time), así que conviene usarlo solo para
+            diagnosticar; sin él, bytes_asignados queda en None.
+
+    Retorna:
+        El primer sumidero.
+    '''
+    global _sumideros, _con_memoria, _inicio_tracemalloc, _copia_dataframe, _copia_serie
+    desactivar()
+    _sumideros = sumideros or (SumideroMemoria(),)
+    _con_memoria = memoria
+    if memoria and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _inicio_tracemalloc = True
+    _copia_dataframe, _copia_serie = pd.DataFrame.copy, pd.Series.copy
+    pd.DataFrame.copy, pd.Series.copy = _contar_copias(_copia_dataframe), _contar_copias(_copia_serie)
+
+    tools._envolver = instrumentar
+    for nombre in tools.__all__:
+        if nombre in vars(tools):
+            setattr(tools, nombre, instrumentar(vars(tools)[nombre]))
+    return _sumideros[0]
+
+
+def desactivar():
+    '''
+    Desactiva la instrumentación: tools vuelve a exponer las funciones originales.
+    '''
+    global _sumideros, _con_memoria, _inicio_tracemalloc, _copia_dataframe, _copia_serie
+    tools._envolver = None
+    for nombre in tools.__all__:
+        funcion = vars(tools).get(nombre)
+        if getattr(funcion, "_instrumentada", False):
+            setattr(tools, nombre, funcion.__wrapped__)
+    if _copia_dataframe is not None:
+        pd.DataFrame.copy, pd.Series.copy = _copia_dataframe, _copia_serie
+        _copia_dataframe = _copia_serie = None
+    if _inicio_tracemalloc:
+        tracemalloc.stop()
+        _inicio_tracemalloc = False
+    _sumideros, _con_memoria = (), False
+
+
+def activa():
+    '''
+    Retorna:
+        bool: Si la instrumentación está activa.
+    '''
+    return bool(_sumideros)
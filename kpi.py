@@ -0,0 +1,314 @@
+## INDICADORES CLAVE (KPI) CON CONTADORES INCREMENTALES
+# Importaciones
+import numpy as np
+import pandas as pd
+
+
+# Cantidad de meses que abarca cada período con nombre
+PERIODOS = {"mes": 1, "trimestre": 3, "semestre": 6, "año": 12}
+
+# Las tasas se expresan cada 100.000 habitantes
+POR_HABITANTES = 100_000
+
+RUTA_POBLACION = "datasets/poblacion_CABA.csv"
+
+
+def cargar_poblacion(ruta=RUTA_POBLACION):
+    '''
+    Lee la población de CABA por año censal.
+
+    Parámetros:
+        ruta (str): Ruta del CSV con las columnas "Año" y "Población".
+
+    Retorna:
+        pandas.Series: La población indexada por año, ordenada.
+    '''
+    poblacion = pd.read_csv(ruta)
+    return poblacion.set_index("Año")["Población"].sort_index().astype(float)
+
+
+def poblacion_interpolada(años, poblacion):
+    '''
+    Estima la población de uno o varios años interpolando linealmente entre los censos.
+
+    Fuera del rango censal se extrapola con la recta de los dos censos más cercanos, de modo
+    que los años posteriores al último censo no quedan con la población fija.
+
+    Parámetros:
+        años (int o array): Los años a estimar.
+        poblacion (pandas.Series): Población por año censal, como la devuelve cargar_poblacion.
+
+    Retorna:
+        numpy.ndarray: La población estimada para cada año.
+    '''
+    x = poblacion.index.to_numpy(dtype=float)
+    y = poblacion.to_numpy(dtype=float)
+    años = np.asarray(años, dtype=float)
+    resultado = np.interp(años, x, y)
+    if len(x) >= 2:
+        antes, despues = años < x[0], años > x[-1]
+        resultado = np.where(antes, y[0] + (años - x[0]) * (y[1] - y[0]) / (x[1] - x[0]), resultado)
+        resultado = np.where(despues, y[-1] + (años - x[-1]) * (y[-1] - y[-2]) / (x[-1] - x[-2]), resultado)
+    return resultado
+
+
+def _meses(periodo):
+    # Acepta un nombre de PERIODOS o una cantidad de meses que divida al año
+    meses = PERIODOS.get(periodo, periodo)
+    if not isinstance(meses, (int, np.integer)) or meses <= 0 or 12 % meses:
+        raise ValueError(f"Período inválido: {periodo!r}. Opciones: {list(PERIODOS)} o un divisor de 12")
+    return int(meses)
+
+
+def _año_mes(lote):
+    # Año y mes de cada fila, de las columnas del ETL o, si faltan, de "Fecha"
+    if "Año" in lote.columns and "Mes" in lote.columns:
+        return lote["Año"].to_numpy(dtype=np.int64), lote["Mes"].to_numpy(dtype=np.int64)
+    fechas = pd.to_datetime(lote["Fecha"])
+    return fechas.dt.year.to_numpy(dtype=np.int64), fechas.dt.month.to_numpy(dtype=np.int64)
+
+
+def _mascara(lote, filtros):
+    # Filtros de igualdad: {"columna": valor} o {"columna": [valores]}
+    mascara = np.ones(len(lote), dtype=bool)
+    for columna, valor in (filtros or {}).items():
+        valores = valor if isinstance(valor, (list, tuple, set)) else [valor]
+        mascara &= lote[columna].isin(valores).to_numpy(dtype=bool)
+    return mascara
+
+
+def etiqueta_periodo(codigo, meses):
+    '''
+    Convierte el código numérico de un período en una etiqueta legible.
+
+    Parámetros:
+        codigo (int): Código del período (año * períodos por año + número de período).
+        meses (int): Meses que abarca cada período.
+
+    Retorna:
+        str: Por ejemplo "2021" para años, "2021-S1" para semestres o "2021-03" para meses.
+    '''
+    por_año = 12 // meses
+    año, numero = divmod(int(codigo), por_año)
+    if meses == 12:
+        return str(año)
+    if meses == 6:
+        return f"{año}-S{numero + 1}"
+    if meses == 3:
+        return f"{año}-T{numero + 1}"
+    if meses == 1:
+        return f"{año}-{numero + 1:02d}"
+    return f"{año}-P{numero + 1}"
+
+
+class KPI:
+    '''
+    Indicador calculado sobre contadores de víctimas por período.
+
+    Cada lote de víctimas se filtra, se cuenta por período y se suma a un diccionario de
+    contadores, por lo que agregar un lote cuesta lo mismo que recorrer ese lote, sin importar
+    cuánto historial se haya acumulado. La tasa se calcula cada 100.000 habitantes con la
+    población interpolada del año del período, y la meta se expresa como variación porcentual
+    respecto de la ventana anterior (por ejemplo -10 para "reducir un 10%").
+
+    Parámetros:
+        nombre (str): Nombre del indicador.
+        periodo (str o int): "mes", "trimestre", "semestre", "año" o una cantidad de meses.
+        filtros (dict): Filtros de igualdad sobre las víctimas, por ejemplo {"Víctima": "MOTO"}.
+        medida (str): "tasa" (cada 100.000 habitantes) o "cantidad" (víctimas).
+        meta (float): Variación porcentual objetivo respecto de la ventana anterior.
+        ventana (int): Cantidad de períodos que suma cada ventana móvil (1 = sin solapamiento).
+        poblacion (pandas.Series): Población por año censal. Por defecto, la de poblacion_CABA.csv.
+    '''
+
+    def __init__(self, nombre, periodo="año", filtros=None, medida="tasa", meta=None, ventana=1, poblacion=None):
+        if medida not in ("tasa", "cantidad"):
+            raise ValueError(f"Medida desconocida: {medida!r}. Opciones: ['tasa', 'cantidad']")
+        if ventana < 1:
+            raise ValueError("La ventana debe abarcar al menos un período")
+        self.nombre = nombre
+        self.meses = _meses(periodo)
+        self.filtros = dict(filtros or {})
+        self.medida = medida
+        self.meta = meta
+        self.ventana = int(ventana)
+        self.poblacion = cargar_poblacion() if poblacion is None and medida == "tasa" else poblacion
+        self.conteos = {}
+        self.total = 0
+
+    def codigos(self, lote):
+        '''
+        Calcula el código de período de cada fila de un lote.
+
+        Parámetros:
+            lote (pandas.DataFrame): Víctimas con "Año" y "Mes" (o "Fecha").
+
+        Retorna:
+            numpy.ndarray: Un código int64 por fila.
+        '''
+        años, meses = _año_mes(lote)
+        return años * (12 // self.meses) + (meses - 1) // self.meses
+
+    def agregar(self, lote):
+        '''
+        Suma un lote de víctimas a los contadores del indicador.
+
+        Parámetros:
+            lote (pandas.DataFrame): Las víctimas nuevas.
+
+        Retorna:
+            KPI: El mismo indicador, para encadenar llamadas.
+        '''
+        if len(lote) == 0:
+            return self
+        codigos = self.codigos(lote)[_mascara(lote, self.filtros)]
+        unicos, cantidades = np.unique(codigos, return_counts=True)
+        for codigo, cantidad in zip(unicos.tolist(), cantidades.tolist()):
+            self.conteos[codigo] = self.conteos.get(codigo, 0) + cantidad
+        self.total += len(codigos)
+        return self
+
+    def _año(self, codigo):
+        return int(codigo) // (12 // self.meses)
+
+    def cantidad(self, codigo):
+        '''
+        Devuelve las víctimas de la ventana que termina en el período indicado.
+        '''
+        return sum(self.conteos.get(c, 0) for c in range(codigo - self.ventana + 1, codigo + 1))
+
+    def valor(self, codigo):
+        '''
+        Devuelve el valor del indicador para la ventana que termina en el período indicado.
+
+        Parámetros:
+            codigo (int): Código del período (ver codigos).
+
+        Retorna:
+            float: La tasa cada 100.000 habitantes o la cantidad de víctimas, según la medida.
+        '''
+        cantidad = self.cantidad(codigo)
+        if self.medida == "cantidad":
+            return float(cantidad)
+        poblacion = poblacion_interpolada(self._año(codigo), self.poblacion)
+        return float(cantidad / poblacion * POR_HABITANTES)
+
+    def tabla(self):
+        '''
+        Arma la serie completa del indicador, un registro por período desde el primero observado.
+
+        Retorna:
+            pandas.DataFrame: Con las columnas "Periodo", "Víctimas", "Población" (si la medida es
+            tasa), "Valor", "Variación (%)" respecto de la ventana anterior, "Objetivo" y "Cumple".
+        '''
+        columnas = ["Periodo", "Víctimas", "Población", "Valor", "Variación (%)", "Objetivo", "Cumple"]
+        if not self.conteos:
+            return pd.DataFrame(columns=columnas)
+
+        codigos = np.arange(min(self.conteos), max(self.conteos) + 1)
+        victimas = np.array([self.conteos.get(c, 0) for c in codigos.tolist()], dtype=np.int64)
+        # Ventana móvil: suma acumulada menos la suma acumulada desplazada en "ventana" períodos
+        acumulado = np.concatenate([[0], np.cumsum(victimas)])
+        inicio = np.maximum(np.arange(len(codigos)) + 1 - self.ventana, 0)
+        en_ventana = acumulado[1:] - acumulado[inicio]
+
+        if self.medida == "tasa":
+            poblacion = poblacion_interpolada(codigos // (12 // self.meses), self.poblacion)
+            valores = en_ventana / poblacion * POR_HABITANTES
+        else:
+            poblacion = np.full(len(codigos), np.nan)
+            valores = en_ventana.astype(float)
+
+        anteriores = np.full(len(codigos), np.nan)
+        anteriores[self.ventana:] = valores[:-self.ventana] if self.ventana < len(codigos) else []
+        with np.errstate(divide="ignore", invalid="ignore"):
+            variacion = (valores - anteriores) / anteriores * 100
+        objetivo = anteriores * (1 + self.meta / 100) if self.meta is not None else np.full(len(codigos), np.nan)
+
+        tabla = pd.DataFrame({
+            "Periodo": [etiqueta_periodo(c, self.meses) for c in codigos.tolist()],
+            "Víctimas": en_ventana,
+            "Población": poblacion,
+            "Valor": valores,
+            "Variación (%)": variacion,
+            "Objetivo": objetivo,
+        })
+        tabla["Cumple"] = pd.array(np.where(np.isnan(objetivo), None, valores <= objetivo), dtype="boolean")
+        return tabla
+
+    def ultimo(self):
+        '''
+        Devuelve el registro del último período observado.
+
+        Retorna:
+            pandas.Series: La última fila de tabla().
+        '''
+        return self.tabla().iloc[-1]
+
+
+class PanelKPI:
+    '''
+    Conjunto de indicadores que se actualizan juntos con cada lote de víctimas.
+
+    Parámetros:
+        kpis (list): Los indicadores del panel. Por defecto, los tres KPI del proyecto.
+        poblacion (pandas.Series): Población por año censal, compartida por los indicadores por defecto.
+    '''
+
+    def __init__(self, kpis=None, poblacion=None):
+        self.kpis = {k.nombre: k for k in (kpis if kpis is not None else kpis_proyecto(poblacion))}
+
+    @classmethod
+    def desde_dataframe(cls, df, kpis=None, poblacion=None):
+        '''
+        Construye el panel a partir de un DataFrame completo de víctimas.
+        '''
+        return cls(kpis, poblacion).agregar(df)
+
+    def agregar(self, lote):
+        '''
+        Suma un lote de víctimas a todos los indicadores del panel.
+
+        Retorna:
+            PanelKPI: El mismo panel, para encadenar llamadas.
+        '''
+        for kpi in self.kpis.values():
+            kpi.agregar(lote)
+        return self
+
+    def __getitem__(self, nombre):
+        return self.kpis[nombre]
+
+    def resumen(self):
+        '''
+        Devuelve el último período de cada indicador en una sola tabla.
+
+        Retorna:
+            pandas.DataFrame: Una fila por indicador, indexada por su nombre.
+        '''
+        filas = {nombre: kpi.ultimo() for nombre, kpi in self.kpis.items() if kpi.conteos}
+        return pd.DataFrame(filas).T
+
+
+def kpis_proyecto(poblacion=None):
+    '''
+    Crea los tres indicadores definidos en el README del proyecto.
+
+    - Tasa semestral de homicidios en siniestros viales, con meta de reducirla un 10%.
+    - Cantidad anual de víctimas que se desplazaban en moto, con meta de reducirla un 7%.
+    - Tasa anual de homicidios en avenidas, con meta de reducirla un 10%.
+
+    Parámetros:
+        poblacion (pandas.Series): Población por año censal. Por defecto, la de poblacion_CABA.csv.
+
+    Retorna:
+        list: Los tres objetos KPI.
+    '''
+    poblacion = cargar_poblacion() if poblacion is None else poblacion
+    return [
+        KPI("Tasa semestral de homicidios", periodo="semestre", meta=-10, poblacion=poblacion),
+        KPI("Accidentes mortales de motociclistas", periodo="año", filtros={"Víctima": "MOTO"},
+            medida="cantidad", meta=-7, poblacion=poblacion),
+        KPI("Tasa de homicidios en avenidas", periodo="año", filtros={"Tipo de calle": "AVENIDA"},
+            meta=-10, poblacion=poblacion),
+    ]
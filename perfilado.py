@@ -0,0 +1,238 @@
+## PERFILADO DE COLUMNAS CON CACHÉ POR CONTENIDO
+# Importaciones
+import hashlib
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# pyarrow es opcional: solo acelera la huella de las columnas de texto respaldadas por Arrow
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+from imputacion import CENTINELAS
+
+
+# Cantidad máxima de perfiles guardados en la caché (se descartan los más antiguos)
+TAMAÑO_CACHE = 512
+
+# Valor z de cada nivel de confianza admitido para los márgenes de error del modo muestreado
+VALORES_Z = {0.90: 1.6449, 0.95: 1.9600, 0.99: 2.5758}
+
+# Columnas del perfil, en el orden en que se presentan
+COLUMNAS_PERFIL = ["nombre_campo", "tipo_datos", "conteo_tipos", "no_nulos_%", "nulos_%", "nulos",
+                   "centinelas", "centinelas_%", "cardinalidad", "minimo", "maximo"]
+
+_cache = {}
+
+
+def _es_objeto(serie):
+    return serie.dtype == object
+
+
+def huella_columna(serie):
+    '''
+    Calcula una huella del contenido de una columna para usarla como clave de caché.
+
+    Las columnas numéricas y de fechas se resumen sobre sus bytes, las de texto de Arrow sobre
+    sus buffers y las categóricas sobre sus códigos y categorías. Las columnas object se
+    serializan con pickle, que distingue el tipo de cada valor (1 y "1" dan huellas distintas).
+
+    Parámetros:
+        serie (pandas.Series): La columna.
+
+    Retorna:
+        str: La huella hexadecimal (incluye el dtype y la cantidad de filas).
+    '''
+    resumen = hashlib.blake2b(digest_size=16)
+    resumen.update(f"{serie.dtype}|{len(serie)}".encode())
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        resumen.update(np.ascontiguousarray(serie.cat.codes.to_numpy()).view(np.uint8))
+        resumen.update(huella_columna(pd.Series(serie.cat.categories)).encode())
+        return resumen.hexdigest()
+    if _es_objeto(serie):
+        resumen.update(pickle.dumps(serie.to_numpy(), protocol=5))
+        return resumen.hexdigest()
+    if hasattr(serie.array, "__arrow_array__"):
+        # Texto respaldado por Arrow: los buffers de cada fragmento (validez, offsets y datos)
+        arreglo = pa.chunked_array(serie.array.__arrow_array__()) if pa is not None else None
+        if arreglo is not None:
+            for fragmento in arreglo.chunks:
+                resumen.update(f"{fragmento.offset}|{len(fragmento)}".encode())
+                for buffer in fragmento.buffers():
+                    if buffer is not None:
+                        resumen.update(memoryview(buffer))
+            return resumen.hexdigest()
+    valores = serie.to_numpy()
+    if valores.dtype.kind in "biufcmM":
+        resumen.update(np.ascontiguousarray(valores).view(np.uint8))
+    else:
+        resumen.update(pd.util.hash_pandas_object(serie, index=False).to_numpy().view(np.uint8))
+    return resumen.hexdigest()
+
+
+def _conteo_tipos(serie, nulos):
+    # Tipos de Python de los valores (como Series.apply(type)) con su cantidad, en orden de aparición
+    if _es_objeto(serie):
+        tipos = np.fromiter(map(type, serie.to_numpy()), dtype=object, count=len(serie))
+        conteos = pd.Series(tipos).value_counts(sort=False)
+        return dict(zip(conteos.index, conteos.tolist())), tipos
+
+    # Con un dtype fijo alcanza con el tipo de un valor no nulo y, si hay, el de un nulo (pueden ser del
+    # mismo tipo, como NaN en una columna float: en ese caso se suman)
+    conteo = {}
+    posiciones = []
+    if (~nulos).any():
+        posiciones.append((int(np.argmax(~nulos)), int((~nulos).sum())))
+    if nulos.any():
+        posiciones.append((int(np.argmax(nulos)), int(nulos.sum())))
+    for posicion, cantidad in sorted(posiciones):
+        tipo = type(serie.iloc[[posicion]].astype(object).iloc[0])
+        conteo[tipo] = conteo.get(tipo, 0) + cantidad
+    return conteo, None
+
+
+def _extremos(serie, validos, tipos):
+    # Mínimo y máximo de los valores válidos; en columnas mezcladas, solo del tipo más frecuente
+    if not validos.any():
+        return None, None
+    valores = serie[validos]
+    if tipos is not None:
+        presentes = pd.Series(tipos[validos]).value_counts()
+        if len(presentes) > 1:
+            valores = valores[tipos[validos] == presentes.index[0]]
+    try:
+        return valores.min(), valores.max()
+    except TypeError:
+        return None, None
+
+
+def perfilar_columna(serie, centinelas=CENTINELAS):
+    '''
+    Calcula el perfil de una columna: tipos, nulos, centinelas, cardinalidad y extremos.
+
+    Parámetros:
+        serie (pandas.Series): La columna a perfilar.
+        centinelas (tuple): Valores que representan un dato faltante (por defecto "SD").
+
+    Retorna:
+        dict: El perfil con las claves de COLUMNAS_PERFIL.
+    '''
+    nulos = serie.isna().to_numpy()
+    conteo, tipos = _conteo_tipos(serie, nulos)
+
+    # Solo las columnas que pueden contener texto pueden tener centinelas
+    es_centinela = np.zeros(len(serie), dtype=bool)
+    if _es_objeto(serie) or pd.api.types.is_string_dtype(serie.dtype) or isinstance(serie.dtype, pd.CategoricalDtype):
+        es_centinela = serie.isin(list(centinelas)).to_numpy(dtype=bool)
+
+    filas = len(serie)
+    cantidad_nulos = int(nulos.sum())
+    porcentaje_no_nulos = (filas - cantidad_nulos) / filas * 100 if filas else 0.0
+    minimo, maximo = _extremos(serie, ~nulos & ~es_centinela, tipos)
+    return {
+        "nombre_campo": serie.name,
+        "tipo_datos": np.array(list(conteo), dtype=object),
+        "conteo_tipos": conteo,
+        "no_nulos_%": round(porcentaje_no_nulos, 2),
+        "nulos_%": round(100 - porcentaje_no_nulos, 2),
+        "nulos": cantidad_nulos,
+        "centinelas": int(es_centinela.sum()),
+        "centinelas_%": round(es_centinela.sum() / filas * 100, 2) if filas else 0.0,
+        "cardinalidad": int(serie.nunique(dropna=True)),
+        "minimo": minimo,
+        "maximo": maximo,
+    }
+
+
+def _margen(proporcion, n, total, z):
+    # Margen de error (en puntos porcentuales) de una proporción muestral, con corrección por población finita
+    if n == 0:
+        return np.nan
+    correccion = (total - n) / (total - 1) if total > 1 else 0.0
+    return z * np.sqrt(proporcion * (1 - proporcion) / n * correccion) * 100
+
+
+def _perfil_muestreado(serie, muestra, semilla, centinelas, z):
+    # Perfila una muestra aleatoria y escala los conteos a la columna completa
+    total = len(serie)
+    indices = np.sort(np.random.default_rng(semilla).choice(total, size=muestra, replace=False))
+    perfil = perfilar_columna(serie.iloc[indices], centinelas)
+    escala = total / muestra
+    perfil["conteo_tipos"] = {t: int(round(c * escala)) for t, c in perfil["conteo_tipos"].items()}
+    perfil["nulos"] = int(round(perfil["nulos"] * escala))
+    perfil["centinelas"] = int(round(perfil["centinelas"] * escala))
+    # El margen informado es el mayor entre los porcentajes de nulos y de centinelas
+    perfil["margen_%"] = round(max(_margen(perfil["nulos_%"] / 100, muestra, total, z),
+                                   _margen(perfil["centinelas_%"] / 100, muestra, total, z)), 2)
+    perfil["filas_muestra"] = muestra
+    return perfil
+
+
+def perfilar(df, centinelas=CENTINELAS, muestra=None, confianza=0.95, semilla=0, hilos=None, usar_cache=True):
+    '''
+    Perfila todas las columnas de un DataFrame.
+
+    Cada columna se recorre con operaciones vectorizadas (los tipos de una columna object se
+    obtienen en una sola pasada en C) y, opcionalmente, las columnas se procesan en paralelo.
+    Los perfiles se guardan en una caché por huella del contenido de cada columna, así que
+    volver a perfilar columnas sin cambios solo cuesta calcular su huella.
+
+    En el modo muestreado se perfila una muestra aleatoria de filas: los conteos se escalan a la
+    columna completa y "margen_%" informa el margen de error de los porcentajes al nivel de
+    confianza indicado. La cardinalidad, el mínimo y el máximo corresponden a la muestra (la
+    cardinalidad es una cota inferior). Este modo no usa la caché.
+
+    Parámetros:
+        df (pandas.DataFrame): El DataFrame a perfilar.
+        centinelas (tuple): Valores que representan un dato faltante (por defecto "SD").
+        muestra (int): Cantidad de filas a muestrear. Por defecto se perfilan todas.
+        confianza (float): Nivel de confianza de los márgenes (0.90, 0.95 o 0.99).
+        semilla (int): Semilla del muestreo.
+        hilos (int): Cantidad de hilos para perfilar columnas en paralelo. Por defecto, uno.
+        usar_cache (bool): Si es False, no se lee ni se escribe la caché.
+
+    Retorna:
+        pandas.DataFrame: Una fila por columna con las columnas de COLUMNAS_PERFIL (y "margen_%"
+        y "filas_muestra" en el modo muestreado).
+    '''
+    if confianza not in VALORES_Z:
+        raise ValueError(f"Nivel de confianza no admitido: {confianza}. Opciones: {list(VALORES_Z)}")
+    muestreado = muestra is not None and muestra < len(df)
+
+    def perfil(columna):
+        serie = df[columna]
+        clave = None
+        # En el modo muestreado no se usa la caché: calcular la huella recorrería la columna completa
+        if usar_cache and not muestreado:
+            clave = (huella_columna(serie), tuple(centinelas))
+            if clave in _cache:
+                return dict(_cache[clave], nombre_campo=columna)
+        if muestreado:
+            resultado = _perfil_muestreado(serie, muestra, semilla, centinelas, VALORES_Z[confianza])
+        else:
+            resultado = perfilar_columna(serie, centinelas)
+        if clave is not None:
+            if len(_cache) >= TAMAÑO_CACHE:
+                _cache.pop(next(iter(_cache)))
+            _cache[clave] = resultado
+        return dict(resultado, nombre_campo=columna)
+
+    if hilos and hilos > 1:
+        with ThreadPoolExecutor(hilos) as ejecutor:
+            perfiles = list(ejecutor.map(perfil, df.columns))
+    else:
+        perfiles = [perfil(columna) for columna in df.columns]
+
+    columnas = COLUMNAS_PERFIL + (["margen_%", "filas_muestra"] if muestreado else [])
+    return pd.DataFrame(perfiles, columns=columnas)
+
+
+def limpiar_cache():
+    '''
+    Descarta todos los perfiles guardados.
+    '''
+    _cache.clear()
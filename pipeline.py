@@ -0,0 +1,641 @@
+## PIPELINE ETL POR BLOQUES PARA homicidios.xlsx
+# Importaciones
+import io
+import json
+import os
+import shutil
+import tempfile
+from collections import Counter
+from datetime import time
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+import duplicados
+import espacial
+import ids
+import planillas
+import tiempo
+
+
+# Cantidad de filas por bloque leído de la planilla
+TAMAÑO_BLOQUE = 50_000
+
+# Renombres aplicados luego de capitalizar y reemplazar "_" por espacios (igual que ETL.ipynb)
+RENOMBRES_HECHOS = {"N victimas": "Cantidad víctimas",
+                    "Aaaa": "Año",
+                    "Mm": "Mes",
+                    "Dd": "Día",
+                    "Hh": "Hora entera",
+                    "Xy (caba)": "XY (CABA)",
+                    "Victima": "Víctima"}
+
+RENOMBRES_VICTIMAS = {"Id hecho": "Id",
+                      "Aaaa": "Año",
+                      "Mm": "Mes",
+                      "Dd": "Día",
+                      "Victima": "Víctima"}
+
+# Columnas de VICTIMAS que se descartan porque se repiten en HECHOS o no se usan
+DESCARTES_VICTIMAS = ["Fecha fallecimiento", "Fecha", "Año", "Mes", "Día", "Víctima"]
+
+# Modo incremental: diferencia máxima (en años) de la edad media de un sexo respecto de la usada para
+# imputar el CSV antes de recalcularlo completo, y versión del archivo de estado
+UMBRAL_DERIVA_EDAD = 1.0
+VERSION_ESTADO = 1
+
+
+def leer_hoja_por_bloques(ruta, hoja, tamaño_bloque=TAMAÑO_BLOQUE):
+    '''
+    Lee una hoja de un archivo Excel en modo streaming y la entrega en bloques de filas.
+
+    Se utiliza openpyxl en modo de solo lectura, que recorre el XML de la hoja sin cargarla
+    completa en memoria. Las filas completamente vacías se omiten.
+
+    Parámetros:
+        ruta (str): Ruta del archivo .xlsx.
+        hoja (str): Nombre de la hoja a leer, por ejemplo "HECHOS" o "VICTIMAS".
+        tamaño_bloque (int): Cantidad máxima de filas por bloque.
+
+    Retorna:
+        generator: Un generador de pandas.DataFrame con los encabezados de la hoja como columnas.
+    '''
+    libro = load_workbook(ruta, read_only=True, data_only=True)
+    try:
+        filas = libro[hoja].iter_rows(values_only=True)
+        encabezado = next(filas)
+        bloque = []
+        for fila in filas:
+            if all(valor is None for valor in fila):
+                continue
+            bloque.append(fila)
+            if len(bloque) == tamaño_bloque:
+                yield pd.DataFrame.from_records(bloque, columns=encabezado)
+                bloque = []
+        if bloque:
+            yield pd.DataFrame.from_records(bloque, columns=encabezado)
+    finally:
+        libro.close()
+
+
+def aplicar_etapas(bloques, etapas):
+    '''
+    Aplica una secuencia de etapas de limpieza a cada bloque de un flujo de DataFrames.
+
+    Parámetros:
+        bloques (iterable): Los bloques (pandas.DataFrame) a procesar.
+        etapas (list): Funciones que reciben un bloque y devuelven el bloque transformado.
+
+    Retorna:
+        generator: Un generador con los bloques ya transformados.
+    '''
+    for bloque in bloques:
+        for etapa in etapas:
+            bloque = etapa(bloque)
+        yield bloque
+
+
+def normalizar_columnas(renombres):
+    '''
+    Crea una etapa que capitaliza los nombres de columna, reemplaza "_" por espacios y aplica renombres.
+
+    Parámetros:
+        renombres (dict): Diccionario nombre actual -> nombre nuevo.
+
+    Retorna:
+        function: La etapa de normalización.
+    '''
+    def etapa(bloque):
+        # Asignamos las etiquetas directamente para no copiar los datos del bloque
+        columnas = [str(x).capitalize().replace("_", " ") for x in bloque.columns]
+        bloque.columns = [renombres.get(x, x) for x in columnas]
+        return bloque
+    return etapa
+
+
+def descartar_columnas(columnas):
+    '''
+    Crea una etapa que elimina las columnas indicadas si están presentes.
+
+    Parámetros:
+        columnas (list): Nombres de las columnas a eliminar.
+
+    Retorna:
+        function: La etapa de descarte.
+    '''
+    def etapa(bloque):
+        return bloque.drop(columns=[c for c in columnas if c in bloque.columns])
+    return etapa
+
+
+def limpiar_hechos(bloque):
+    '''
+    Aplica a un bloque de HECHOS las correcciones de valores del notebook ETL.
+
+    Marca "Cruce" como "SI"/"NO", completa "Dirección normalizada" y "Calle" con "SD", agrupa
+    las víctimas "OBJETO FIJO" y "PEATON_MOTO" en "OTRO" y reemplaza por 0 las coordenadas
+    faltantes (".") de "Pos x" y "Pos y". La columna de texto "XY (CABA)" se separa en las
+    columnas numéricas "X (CABA)" e "Y (CABA)", con NaN donde falta el punto ("Point (. .)").
+
+    Parámetros:
+        bloque (pandas.DataFrame): Un bloque de la hoja HECHOS con las columnas ya normalizadas.
+
+    Retorna:
+        pandas.DataFrame: El bloque corregido.
+    '''
+    bloque["Cruce"] = np.where(bloque["Cruce"].notnull(), "SI", "NO")
+    bloque["Dirección normalizada"] = bloque["Dirección normalizada"].fillna("SD")
+    bloque["Calle"] = bloque["Calle"].fillna("SD")
+    bloque["Víctima"] = bloque["Víctima"].replace({"OBJETO FIJO": "OTRO", "PEATON_MOTO": "OTRO"})
+    bloque["Pos x"] = bloque["Pos x"].replace(".", 0)
+    bloque["Pos y"] = bloque["Pos y"].replace(".", 0)
+    # Separamos el punto WKT en dos columnas float64 en la misma posición que "XY (CABA)"
+    x, y = espacial.separar_wkt(bloque["XY (CABA)"])
+    posicion = bloque.columns.get_loc("XY (CABA)")
+    bloque = bloque.drop(columns="XY (CABA)")
+    bloque.insert(posicion, "X (CABA)", x)
+    bloque.insert(posicion + 1, "Y (CABA)", y)
+    return bloque
+
+
+def convertir_hora(bloque):
+    '''
+    Convierte la columna "Hora" de un bloque a objetos time (None si no es posible).
+
+    La conversión se hace en bloque con tiempo.hora_a_segundos en lugar de llamar a
+    tools.convertir_a_time por cada fila.
+
+    Parámetros:
+        bloque (pandas.DataFrame): Un bloque de la hoja HECHOS.
+
+    Retorna:
+        pandas.DataFrame: El bloque con la columna "Hora" convertida.
+    '''
+    bloque["Hora"] = tiempo.segundos_a_time(tiempo.hora_a_segundos(bloque["Hora"]))
+    return bloque
+
+
+class EstadisticasImputacion:
+    '''
+    Acumula, bloque a bloque, los estadísticos que necesita la imputación del ETL.
+
+    Los conteos y sumas son combinables, de modo que basta una pasada por cada hoja para
+    obtener la hora más común, la moda de "Sexo" y "Rol" y la edad media según el sexo,
+    con memoria proporcional a la cantidad de valores distintos y no a la cantidad de filas.
+    '''
+
+    def __init__(self):
+        self.conteos = {"Hora": Counter(), "Sexo": Counter(), "Rol": Counter()}
+        self.suma_edad = Counter()
+        self.cantidad_edad = Counter()
+
+    def actualizar_hechos(self, bloque):
+        self.conteos["Hora"].update(bloque["Hora"].dropna().value_counts().to_dict())
+
+    def actualizar_victimas(self, bloque):
+        for columna in ("Sexo", "Rol"):
+            conteo = bloque[columna].value_counts().drop("SD", errors="ignore")
+            self.conteos[columna].update(conteo.to_dict())
+
+        # Agrupamos la edad por el sexo tal como viene; el grupo "SD" se resuelve al final
+        edad = pd.to_numeric(bloque["Edad"].replace("SD", np.nan), errors="coerce")
+        agregado = edad.groupby(bloque["Sexo"]).agg(["sum", "count"])
+        self.suma_edad.update(agregado["sum"].to_dict())
+        self.cantidad_edad.update(agregado["count"].to_dict())
+
+    def a_dict(self):
+        '''
+        Retorna:
+            dict: Los conteos y las sumas en un formato que se puede guardar en JSON (las horas
+            como "HH:MM:SS").
+        '''
+        return {"conteos": {columna: {(valor.isoformat() if columna == "Hora" else valor): int(cantidad)
+                                      for valor, cantidad in conteo.items()}
+                            for columna, conteo in self.conteos.items()},
+                "suma_edad": {sexo: float(suma) for sexo, suma in self.suma_edad.items()},
+                "cantidad_edad": {sexo: int(cantidad) for sexo, cantidad in self.cantidad_edad.items()}}
+
+    @classmethod
+    def desde_dict(cls, datos):
+        '''
+        Reconstruye los estadísticos guardados con a_dict.
+        '''
+        estadisticas = cls()
+        for columna, conteo in datos["conteos"].items():
+            estadisticas.conteos[columna] = Counter({(time.fromisoformat(valor) if columna == "Hora" else valor): cantidad
+                                                    for valor, cantidad in conteo.items()})
+        estadisticas.suma_edad = Counter(datos["suma_edad"])
+        estadisticas.cantidad_edad = Counter(datos["cantidad_edad"])
+        return estadisticas
+
+    def moda(self, columna):
+        '''
+        Devuelve el valor más frecuente acumulado para una columna (el menor en caso de empate).
+        '''
+        conteo = self.conteos[columna]
+        if not conteo:
+            return None
+        maximo = max(conteo.values())
+        return min(valor for valor, cantidad in conteo.items() if cantidad == maximo)
+
+    def edad_media_segun_sexo(self):
+        '''
+        Devuelve la edad media por sexo, asignando las filas con sexo "SD" al sexo más frecuente.
+        '''
+        sexo_moda = self.moda("Sexo")
+        suma, cantidad = Counter(), Counter()
+        for sexo in self.cantidad_edad:
+            destino = sexo_moda if sexo == "SD" else sexo
+            suma[destino] += self.suma_edad[sexo]
+            cantidad[destino] += self.cantidad_edad[sexo]
+        return {sexo: suma[sexo] / cantidad[sexo] for sexo in cantidad if cantidad[sexo]}
+
+
+def imputar_hechos(estadisticas):
+    '''
+    Crea una etapa que completa "Hora" y "Hora entera" con la hora más común.
+
+    Parámetros:
+        estadisticas (EstadisticasImputacion): Estadísticos acumulados de la hoja HECHOS.
+
+    Retorna:
+        function: La etapa de imputación.
+    '''
+    hora_moda = estadisticas.moda("Hora")
+
+    def etapa(bloque):
+        bloque["Hora"] = bloque["Hora"].fillna(hora_moda)
+        bloque["Hora entera"] = bloque["Hora entera"].replace("SD", hora_moda.hour).astype(int)
+        return bloque
+    return etapa
+
+
+def imputar_victimas(estadisticas):
+    '''
+    Crea una etapa que completa "Sexo" y "Rol" con su moda y "Edad" con la media según el sexo.
+
+    Parámetros:
+        estadisticas (EstadisticasImputacion): Estadísticos acumulados de la hoja VICTIMAS.
+
+    Retorna:
+        function: La etapa de imputación.
+    '''
+    sexo_moda = estadisticas.moda("Sexo")
+    rol_moda = estadisticas.moda("Rol")
+    edad_media = estadisticas.edad_media_segun_sexo()
+
+    def etapa(bloque):
+        bloque["Sexo"] = bloque["Sexo"].replace("SD", sexo_moda)
+        bloque["Rol"] = bloque["Rol"].replace("SD", rol_moda)
+        edad = pd.to_numeric(bloque["Edad"].replace("SD", np.nan), errors="coerce")
+        bloque["Edad"] = edad.fillna(bloque["Sexo"].map(edad_media)).astype(int)
+        return bloque
+    return etapa
+
+
+def _particionar(bloque, directorio, numero):
+    # Guardamos cada bloque dividido por el año del Id ("2016-0001" -> "2016"); codificar rechaza los Id
+    # con formato inválido en lugar de descartarlos en silencio
+    for clave, parte in bloque.groupby(ids.año(ids.codificar(bloque["Id"])), sort=False):
+        carpeta = os.path.join(directorio, str(clave))
+        os.makedirs(carpeta, exist_ok=True)
+        parte.to_pickle(os.path.join(carpeta, f"{numero:06d}.pkl"))
+
+
+def _leer_particion(directorio, clave):
+    carpeta = os.path.join(directorio, clave)
+    if not os.path.isdir(carpeta):
+        return None
+    archivos = sorted(os.listdir(carpeta))
+    return pd.concat([pd.read_pickle(os.path.join(carpeta, a)) for a in archivos], ignore_index=True)
+
+
+def escribir_csv(bloques, ruta):
+    '''
+    Escribe un flujo de bloques en un único archivo CSV, agregando un bloque por vez.
+
+    Parámetros:
+        bloques (iterable): Los bloques (pandas.DataFrame) a escribir.
+        ruta (str): Ruta del archivo CSV de salida. Se sobrescribe si ya existe.
+
+    Retorna:
+        int: La cantidad total de filas escritas.
+    '''
+    filas = 0
+    for numero, bloque in enumerate(bloques):
+        bloque.to_csv(ruta, mode="w" if numero == 0 else "a", header=numero == 0, index=False, encoding="utf-8")
+        filas += len(bloque)
+    return filas
+
+
+def unir_por_particiones(hechos, victimas, etapas_hechos=(), etapas_victimas=(), directorio=None):
+    '''
+    Une VICTIMAS con HECHOS por "Id" (left join) de forma incremental, particionando en disco.
+
+    Cada bloque de ambas hojas se reparte por el año del Id en archivos temporales. Luego se
+    une una partición por vez, aplicando antes las etapas indicadas, de modo que la memoria
+    máxima depende del tamaño de un año y no del historial completo. El resultado se entrega
+    ordenado por el código entero del "Id" (año y número, ver ids.py), conservando el orden
+    original de las víctimas dentro de cada hecho.
+
+    Parámetros:
+        hechos (iterable): Bloques de HECHOS ya normalizados.
+        victimas (iterable): Bloques de VICTIMAS ya normalizados.
+        etapas_hechos (list): Etapas que se aplican a cada partición de HECHOS antes de unir.
+        etapas_victimas (list): Etapas que se aplican a cada partición de VICTIMAS antes de unir.
+        directorio (str): Carpeta para los archivos temporales. Por defecto se crea una temporal.
+
+    Retorna:
+        generator: Un generador de pandas.DataFrame, un bloque unido por partición.
+    '''
+    temporal = tempfile.mkdtemp(dir=directorio)
+    try:
+        dir_hechos = os.path.join(temporal, "hechos")
+        dir_victimas = os.path.join(temporal, "victimas")
+
+        columnas_hechos = None
+        for numero, bloque in enumerate(hechos):
+            columnas_hechos = bloque.columns
+            _particionar(bloque, dir_hechos, numero)
+        for numero, bloque in enumerate(victimas):
+            _particionar(bloque, dir_victimas, numero)
+
+        if not os.path.isdir(dir_victimas):
+            return
+        for clave in sorted(os.listdir(dir_victimas)):
+            parte_victimas = _leer_particion(dir_victimas, clave)
+            parte_hechos = _leer_particion(dir_hechos, clave)
+            if parte_hechos is None:
+                parte_hechos = pd.DataFrame(columns=columnas_hechos if columnas_hechos is not None else ["Id"])
+
+            for etapa in etapas_victimas:
+                parte_victimas = etapa(parte_victimas)
+            for etapa in etapas_hechos:
+                parte_hechos = etapa(parte_hechos)
+
+            # Merge join ordenado sobre el Id empaquetado en un entero (ver ids.py)
+            yield ids.unir_por_id(parte_victimas, parte_hechos)
+    finally:
+        shutil.rmtree(temporal, ignore_errors=True)
+
+
+def ejecutar_etl(ruta_xlsx, ruta_salida, tamaño_bloque=TAMAÑO_BLOQUE, directorio_temporal=None, formato="csv"):
+    '''
+    Ejecuta el ETL completo de homicidios.xlsx por bloques y escribe homicidios_cleaned.
+
+    Cada hoja se lee una sola vez en modo streaming: se normaliza, se limpia y se acumulan los
+    estadísticos de imputación mientras los bloques se particionan en disco. Luego se imputan
+    y se unen las particiones una por vez y el resultado se escribe progresivamente.
+
+    Parámetros:
+        ruta_xlsx (str): Ruta del archivo homicidios.xlsx.
+        ruta_salida (str): Ruta del CSV de salida, o carpeta del dataset si el formato es "parquet".
+        tamaño_bloque (int): Cantidad de filas por bloque leído.
+        directorio_temporal (str): Carpeta para los archivos temporales de la unión.
+        formato (str): "csv" o "parquet" (dataset tipado particionado por "Año", ver esquema.py).
+
+    Retorna:
+        tuple: La cantidad de filas escritas y las EstadisticasImputacion utilizadas.
+    '''
+    estadisticas = EstadisticasImputacion()
+
+    def acumular_hechos(bloque):
+        estadisticas.actualizar_hechos(bloque)
+        return bloque
+
+    def acumular_victimas(bloque):
+        estadisticas.actualizar_victimas(bloque)
+        return bloque
+
+    hechos = aplicar_etapas(leer_hoja_por_bloques(ruta_xlsx, "HECHOS", tamaño_bloque),
+                            [normalizar_columnas(RENOMBRES_HECHOS), descartar_columnas(["Altura"]),
+                             limpiar_hechos, convertir_hora, acumular_hechos])
+    victimas = aplicar_etapas(leer_hoja_por_bloques(ruta_xlsx, "VICTIMAS", tamaño_bloque),
+                              [normalizar_columnas(RENOMBRES_VICTIMAS), descartar_columnas(DESCARTES_VICTIMAS),
+                               acumular_victimas])
+
+    # Las etapas de imputación se crean recién cuando los estadísticos están completos
+    def imputacion_hechos(bloque):
+        return imputar_hechos(estadisticas)(bloque)
+
+    def imputacion_victimas(bloque):
+        return imputar_victimas(estadisticas)(bloque)
+
+    unidos = unir_por_particiones(hechos, victimas, [imputacion_hechos], [imputacion_victimas],
+                                  directorio=directorio_temporal)
+    if formato == "parquet":
+        from esquema import escribir_parquet
+        filas = escribir_parquet(unidos, ruta_salida)
+    elif formato == "csv":
+        filas = escribir_csv(unidos, ruta_salida)
+    else:
+        raise ValueError(f"Formato desconocido: {formato!r}. Opciones: 'csv', 'parquet'")
+    return filas, estadisticas
+
+
+def huellas_por_hecho(hechos, victimas):
+    '''
+    Calcula una huella de 64 bits del contenido de cada hecho: su fila de HECHOS y sus filas de
+    VICTIMAS (en orden). Si cambia cualquier valor del hecho o de sus víctimas, cambia su huella.
+
+    Parámetros:
+        hechos (pandas.DataFrame): La hoja HECHOS con las columnas normalizadas.
+        victimas (pandas.DataFrame): La hoja VICTIMAS con las columnas normalizadas.
+
+    Retorna:
+        pandas.Series: La huella (uint64) de cada hecho, indexada por el código del Id (ver ids.py).
+    '''
+    codigos_hechos = ids.codificar(hechos["Id"])
+    codigos_victimas = ids.codificar(victimas["Id"])
+    # La posición de cada víctima dentro de su hecho también forma parte de la huella
+    posicion = victimas.groupby(codigos_victimas, sort=False).cumcount().to_numpy()
+    huellas_hechos = duplicados.huellas(hechos, list(hechos.columns))
+    huellas_victimas = duplicados.huellas(victimas.assign(_posicion=posicion), list(victimas.columns) + ["_posicion"])
+
+    codigos, inversa = np.unique(np.concatenate([codigos_hechos, codigos_victimas]), return_inverse=True)
+    total = np.zeros(len(codigos), dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        np.add.at(total, inversa, np.concatenate([huellas_hechos, huellas_victimas]))
+    return pd.Series(total, index=codigos)
+
+
+def deriva(base, actual, umbral_edad=UMBRAL_DERIVA_EDAD):
+    '''
+    Compara los estadísticos con los que se imputó el CSV con los de todo el historial actual.
+
+    Parámetros:
+        base (EstadisticasImputacion): Los estadísticos usados para imputar el CSV.
+        actual (EstadisticasImputacion): Los estadísticos del historial completo.
+        umbral_edad (float): La diferencia máxima aceptada en la edad media de cada sexo.
+
+    Retorna:
+        list: Los motivos por los que hay que recalcular todo; vacía si no hay deriva.
+    '''
+    motivos = []
+    for columna in ("Hora", "Sexo", "Rol"):
+        if base.moda(columna) != actual.moda(columna):
+            motivos.append(f"la moda de {columna!r} pasó de {base.moda(columna)} a {actual.moda(columna)}")
+    edad_base, edad_actual = base.edad_media_segun_sexo(), actual.edad_media_segun_sexo()
+    for sexo, media in edad_actual.items():
+        if sexo not in edad_base:
+            motivos.append(f"no hay edad media para el sexo {sexo!r}")
+        elif abs(media - edad_base[sexo]) > umbral_edad:
+            motivos.append(f"la edad media de {sexo!r} pasó de {edad_base[sexo]:.2f} a {media:.2f}")
+    return motivos
+
+
+def _leer_estado(ruta):
+    try:
+        with open(ruta, encoding="utf-8") as archivo:
+            estado = json.load(archivo)
+    except (OSError, ValueError):
+        return None
+    return estado if estado.get("version") == VERSION_ESTADO else None
+
+
+def _guardar_estado(ruta, estadisticas, huellas, hechos):
+    # La marca de agua es el último hecho procesado (por Id y por fecha)
+    estado = {"version": VERSION_ESTADO,
+              "marca_de_agua": {"id": str(ids.decodificar(huellas.index[-1:]).iloc[0]) if len(huellas) else None,
+                                "fecha": str(hechos["Fecha"].max().date()) if len(hechos) else None},
+              "estadisticas": estadisticas.a_dict(),
+              "huellas": {"codigos": huellas.index.tolist(), "valores": huellas.to_numpy().tolist()}}
+    # Escribimos en un archivo temporal y lo renombramos para no dejar el estado a medias
+    descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(ruta)), suffix=".tmp")
+    with os.fdopen(descriptor, "w", encoding="utf-8") as archivo:
+        json.dump(estado, archivo, ensure_ascii=False)
+    os.replace(temporal, ruta)
+
+
+def _como_texto(bloques):
+    # Pasamos los bloques por el CSV para que las filas nuevas tengan el mismo texto que las ya escritas
+    for bloque in bloques:
+        yield pd.read_csv(io.StringIO(bloque.to_csv(index=False)), dtype=str, keep_default_na=False)
+
+
+def _reescribir_csv(ruta, descartar, nuevos, tamaño_bloque):
+    # Mezcla ordenada por el código del Id: las filas de los hechos a descartar se quitan y las nuevas se
+    # intercalan en su lugar, leyendo el CSV por bloques (ya está ordenado por código)
+    nuevos = pd.concat(list(_como_texto(nuevos)) or [pd.DataFrame()], ignore_index=True)
+    codigos_nuevos = ids.codificar(nuevos["Id"]) if len(nuevos) else np.array([], dtype=np.int32)
+    orden = np.argsort(codigos_nuevos, kind="stable")
+    nuevos, codigos_nuevos = nuevos.iloc[orden], codigos_nuevos[orden]
+
+    def mezclar():
+        pendientes = 0
+        for bloque in pd.read_csv(ruta, dtype=str, keep_default_na=False, chunksize=tamaño_bloque):
+            codigos = ids.codificar(bloque["Id"])
+            conservar = ~np.isin(codigos, descartar)
+            hasta = int(np.searchsorted(codigos_nuevos, codigos.max(), side="right")) if len(codigos) else pendientes
+            partes = [bloque[conservar], nuevos.iloc[pendientes:hasta]]
+            codigos_partes = np.concatenate([codigos[conservar], codigos_nuevos[pendientes:hasta]])
+            pendientes = hasta
+            yield pd.concat(partes, ignore_index=True).iloc[np.argsort(codigos_partes, kind="stable")]
+        if pendientes < len(nuevos):
+            yield nuevos.iloc[pendientes:]
+
+    descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(ruta)), suffix=".tmp")
+    os.close(descriptor)
+    try:
+        filas = escribir_csv(mezclar(), temporal)
+        os.replace(temporal, ruta)
+    except BaseException:
+        os.remove(temporal)
+        raise
+    return filas
+
+
+def ejecutar_etl_incremental(ruta_xlsx, ruta_salida, ruta_estado=None, umbral_edad=UMBRAL_DERIVA_EDAD,
+                             directorio_temporal=None, directorio_planillas=planillas.DIRECTORIO,
+                             tamaño_bloque=TAMAÑO_BLOQUE):
+    '''
+    Actualiza homicidios_cleaned.csv procesando solo los hechos nuevos o corregidos.
+
+    El estado guardado junto al CSV tiene la marca de agua (último Id y última fecha procesados),
+    los estadísticos de imputación con los que se escribió el CSV y una huella del contenido de
+    cada hecho (ver huellas_por_hecho). En cada ejecución se leen las hojas (con la caché de
+    planillas.py) y se comparan las huellas: los hechos posteriores a la marca de agua se limpian,
+    se imputan con los estadísticos guardados y se agregan al final del CSV; los hechos anteriores
+    que cambiaron, aparecieron o desaparecieron se reemplazan en su lugar, reescribiendo el CSV
+    por bloques. Volver a ejecutar sin cambios no modifica nada.
+
+    Como la planilla se lee entera de todos modos, los estadísticos del historial completo se
+    vuelven a acumular (solo conteos). Si la moda de "Hora", "Sexo" o "Rol" cambió o la edad media
+    de algún sexo se movió más de umbral_edad años (ver deriva), se recalcula todo el CSV. También
+    se recalcula todo si no hay estado o falta el CSV.
+
+    Parámetros:
+        ruta_xlsx (str): Ruta del archivo homicidios.xlsx.
+        ruta_salida (str): Ruta del CSV de salida.
+        ruta_estado (str): Ruta del archivo JSON de estado. Por defecto, ruta_salida + ".estado.json".
+        umbral_edad (float): La deriva máxima de la edad media por sexo, en años.
+        directorio_temporal (str): Carpeta para los archivos temporales de la unión.
+        directorio_planillas (str): Carpeta de las instantáneas de la planilla (None: sin caché).
+        tamaño_bloque (int): Cantidad de filas por bloque al reescribir el CSV.
+
+    Retorna:
+        dict: El modo ("completo", "incremental" o "sin cambios"), el motivo si fue completo, la
+        cantidad de hechos nuevos, corregidos y eliminados, las filas escritas y la marca de agua.
+    '''
+    ruta_estado = ruta_estado or ruta_salida + ".estado.json"
+    hojas = planillas.leer_hojas(ruta_xlsx, ["HECHOS", "VICTIMAS"], directorio_planillas)
+    hechos = normalizar_columnas(RENOMBRES_HECHOS)(hojas["HECHOS"].copy())
+    victimas = normalizar_columnas(RENOMBRES_VICTIMAS)(hojas["VICTIMAS"].copy())
+    huellas = huellas_por_hecho(hechos, victimas)
+
+    # Estadísticos del historial completo (solo la hora necesita convertirse)
+    actual = EstadisticasImputacion()
+    actual.actualizar_hechos(convertir_hora(hechos[["Hora"]].copy()))
+    actual.actualizar_victimas(victimas)
+
+    def procesar(codigos, estadisticas):
+        # Limpieza, imputación y unión de los hechos indicados (las mismas etapas que ejecutar_etl)
+        parte_hechos = hechos[np.isin(ids.codificar(hechos["Id"]), codigos)]
+        parte_victimas = victimas[np.isin(ids.codificar(victimas["Id"]), codigos)]
+        bloques_hechos = aplicar_etapas([parte_hechos.copy()], [descartar_columnas(["Altura"]), limpiar_hechos,
+                                                                convertir_hora])
+        bloques_victimas = aplicar_etapas([parte_victimas.copy()], [descartar_columnas(DESCARTES_VICTIMAS)])
+        return unir_por_particiones(bloques_hechos, bloques_victimas, [imputar_hechos(estadisticas)],
+                                    [imputar_victimas(estadisticas)], directorio=directorio_temporal)
+
+    estado = _leer_estado(ruta_estado)
+    motivos = ["no hay estado guardado"] if estado is None else \
+        ["no existe el CSV de salida"] if not os.path.exists(ruta_salida) else []
+    if estado is not None and not motivos:
+        base = EstadisticasImputacion.desde_dict(estado["estadisticas"])
+        motivos = deriva(base, actual, umbral_edad)
+
+    if motivos:
+        filas = escribir_csv(procesar(huellas.index.to_numpy(), actual), ruta_salida)
+        _guardar_estado(ruta_estado, actual, huellas, hechos)
+        return {"modo": "completo", "motivo": "; ".join(motivos), "nuevos": len(huellas), "corregidos": 0,
+                "eliminados": 0, "filas": filas, "marca_de_agua": _leer_estado(ruta_estado)["marca_de_agua"]}
+
+    # Clasificamos los hechos comparando las huellas con las guardadas
+    anteriores = pd.Series(np.array(estado["huellas"]["valores"], dtype=np.uint64),
+                           index=np.array(estado["huellas"]["codigos"], dtype=np.int64))
+    marca = ids.codificar([estado["marca_de_agua"]["id"]])[0] if estado["marca_de_agua"]["id"] else -1
+    comunes = huellas.index.intersection(anteriores.index)
+    nuevos = huellas.index[(huellas.index > marca) & ~huellas.index.isin(anteriores.index)].to_numpy()
+    corregidos = np.union1d(comunes[huellas[comunes].to_numpy() != anteriores[comunes].to_numpy()],
+                            huellas.index[(huellas.index <= marca) & ~huellas.index.isin(anteriores.index)])
+    eliminados = anteriores.index[~anteriores.index.isin(huellas.index)].to_numpy()
+
+    if len(corregidos) or len(eliminados):
+        filas = _reescribir_csv(ruta_salida, np.union1d(corregidos, eliminados),
+                                procesar(np.union1d(corregidos, nuevos), base), tamaño_bloque)
+        modo = "incremental"
+    elif len(nuevos):
+        # Los nuevos van después de la marca de agua: alcanza con agregarlos al final del CSV
+        filas = 0
+        for bloque in procesar(nuevos, base):
+            bloque.to_csv(ruta_salida, mode="a", header=False, index=False, encoding="utf-8")
+            filas += len(bloque)
+        modo = "incremental"
+    else:
+        filas, modo = 0, "sin cambios"
+    # Los estadísticos guardados siguen siendo los usados para imputar el CSV
+    _guardar_estado(ruta_estado, base, huellas, hechos)
+    return {"modo": modo, "motivo": None, "nuevos": len(nuevos), "corregidos": len(corregidos),
+            "eliminados": len(eliminados), "filas": filas, "marca_de_agua": _leer_estado(ruta_estado)["marca_de_agua"]}
@@ -0,0 +1,182 @@
+## CACHÉ EN DISCO DE LAS HOJAS DE homicidios.xlsx
+# Leer la planilla con pd.read_excel (openpyxl) es el paso más lento del ETL. leer_hojas lee todas las hojas
+# pedidas en una sola pasada por el libro y guarda cada una como una instantánea binaria de Arrow (Feather
+# sin comprimir, que se lee con memory map). La clave de cada instantánea es la huella del contenido del
+# archivo, la hoja, las opciones de lectura y la versión de pandas: si el archivo cambia la clave cambia y
+# la hoja se vuelve a leer, y las instantáneas de las versiones anteriores del archivo se borran.
+# Importaciones
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+
+# Carpeta por defecto de las instantáneas
+DIRECTORIO = os.path.join(os.path.expanduser("~"), ".cache", "homicidios_viales", "planillas")
+
+# Cambia si cambia el formato de las instantáneas (invalida todas las anteriores)
+VERSION = 1
+
+# Tamaño de los bloques leídos al calcular la huella del archivo
+_BLOQUE_LECTURA = 1024 ** 2
+
+
+def huella_archivo(ruta):
+    '''
+    Retorna:
+        str: El SHA-256 del contenido del archivo, en hexadecimal.
+    '''
+    huella = hashlib.sha256()
+    with open(ruta, "rb") as archivo:
+        for bloque in iter(lambda: archivo.read(_BLOQUE_LECTURA), b""):
+            huella.update(bloque)
+    return huella.hexdigest()
+
+
+def _clave(huella, hoja, opciones):
+    # Las opciones se ordenan para que el orden de los argumentos no cambie la clave
+    descripcion = json.dumps([VERSION, pd.__version__, huella, hoja, opciones], sort_keys=True, default=repr)
+    return hashlib.sha1(descripcion.encode()).hexdigest()
+
+
+def _ruta(ruta_xlsx, hoja, huella, clave, directorio):
+    # El nombre lleva el archivo, la hoja y la huella del contenido para encontrar las instantáneas viejas
+    return os.path.join(directorio, f"{os.path.basename(ruta_xlsx)}.{hoja}.{huella[:16]}.{clave}.feather")
+
+
+def _columna_mixta(serie):
+    # Una columna object con valores de varios tipos de Python (int y "SD", time y str) no entra en un tipo
+    # de Arrow: la guardamos como unión densa, con un hijo por tipo, para recuperar cada valor tal cual
+    valores = serie.to_numpy(dtype=object)
+    tipos, nombres = pd.factorize(pd.Series([type(v).__name__ for v in valores]))
+    desplazamientos = pd.Series(tipos).groupby(tipos).cumcount().to_numpy(dtype=np.int32)
+    hijos = [pa.array(valores[tipos == i].tolist(), from_pandas=False) for i in range(len(nombres))]
+    return pa.UnionArray.from_dense(pa.array(tipos, type=pa.int8()), pa.array(desplazamientos, type=pa.int32()),
+                                    hijos, field_names=list(nombres))
+
+
+def _serie_mixta(columna):
+    # Inversa de _columna_mixta: cada hijo se convierte de una vez y se reparte por posición
+    columna = columna.combine_chunks() if isinstance(columna, pa.ChunkedArray) else columna
+    tipos = columna.type_codes.to_numpy()
+    desplazamientos = columna.offsets.to_numpy()
+    valores = np.empty(len(columna), dtype=object)
+    for i, campo in enumerate(columna.type):
+        hijo = columna.field(i)
+        # Los Timestamp de pandas vuelven como Timestamp (to_pylist devolvería datetime)
+        convertidos = hijo.to_pandas().to_numpy(dtype=object) if campo.name == "Timestamp" \
+            else np.array(hijo.to_pylist() + [None], dtype=object)[:-1]
+        posiciones = tipos == i
+        valores[posiciones] = convertidos[desplazamientos[posiciones]]
+    return valores
+
+
+def _a_tabla(df):
+    mixtas = {}
+    for columna in df.columns:
+        if df[columna].dtype == object and df[columna].map(type).nunique() > 1:
+            mixtas[columna] = _columna_mixta(df[columna])
+    tabla = pa.Table.from_pandas(df.drop(columns=list(mixtas)), preserve_index=False)
+    for columna, arreglo in mixtas.items():
+        tabla = tabla.append_column(columna, arreglo)
+    # Guardamos el orden original de las columnas en los metadatos
+    metadatos = dict(tabla.schema.metadata or {}, columnas_planilla=json.dumps(list(map(str, df.columns))))
+    return tabla.replace_schema_metadata(metadatos)
+
+
+def _a_pandas(tabla):
+    mixtas = [campo.name for campo in tabla.schema if pa.types.is_union(campo.type)]
+    df = tabla.drop_columns(mixtas).to_pandas()
+    for columna in mixtas:
+        df[columna] = pd.Series(_serie_mixta(tabla.column(columna)), index=df.index, dtype=object)
+    orden = json.loads(tabla.schema.metadata[b"columnas_planilla"])
+    return df[orden] if list(df.columns) != orden else df
+
+
+def _guardar(df, ruta):
+    # Escribimos en un archivo temporal y lo renombramos para no dejar instantáneas a medias
+    descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(ruta), suffix=".tmp")
+    os.close(descriptor)
+    try:
+        feather.write_feather(_a_tabla(df), temporal, compression="uncompressed")
+        os.replace(temporal, ruta)
+    except BaseException:
+        os.remove(temporal)
+        raise
+
+
+def leer_hojas(ruta, hojas=("HECHOS", "VICTIMAS"), directorio=DIRECTORIO, **opciones):
+    '''
+    Lee hojas de un archivo Excel como pd.read_excel, usando las instantáneas guardadas si existen.
+
+    Las hojas que no tienen una instantánea válida se leen todas juntas, en una sola pasada por
+    el libro, y se guardan en directorio. Las demás se cargan de su instantánea con memory map,
+    sin volver a abrir el libro. Los valores de las columnas con tipos mezclados (por ejemplo,
+    EDAD con números y "SD") se recuperan con su tipo original.
+
+    Parámetros:
+        ruta (str): Ruta del archivo .xlsx.
+        hojas (list): Los nombres de las hojas a leer.
+        directorio (str): La carpeta de las instantáneas. Con None no se usa caché.
+        **opciones: Opciones de pd.read_excel (usecols, dtype, ...); forman parte de la clave.
+
+    Retorna:
+        dict: Para cada hoja, su pandas.DataFrame.
+    '''
+    hojas = [hojas] if isinstance(hojas, str) else list(hojas)
+    if directorio is None:
+        return pd.read_excel(ruta, sheet_name=hojas, **opciones)
+    os.makedirs(directorio, exist_ok=True)
+    huella = huella_archivo(ruta)
+    rutas = {hoja: _ruta(ruta, hoja, huella, _clave(huella, hoja, opciones), directorio) for hoja in hojas}
+
+    resultado = {}
+    for hoja, ruta_hoja in rutas.items():
+        try:
+            resultado[hoja] = _a_pandas(feather.read_table(ruta_hoja, memory_map=True))
+        except (OSError, pa.ArrowInvalid, KeyError):
+            pass
+    faltantes = [hoja for hoja in hojas if hoja not in resultado]
+    if faltantes:
+        leidas = pd.read_excel(ruta, sheet_name=faltantes, **opciones)
+        for hoja in faltantes:
+            _guardar(leidas[hoja], rutas[hoja])
+            _borrar_anteriores(ruta, hoja, huella, directorio)
+            resultado[hoja] = leidas[hoja]
+    return {hoja: resultado[hoja] for hoja in hojas}
+
+
+def leer_hoja(ruta, hoja, directorio=DIRECTORIO, **opciones):
+    '''
+    Lee una sola hoja con leer_hojas.
+
+    Retorna:
+        pandas.DataFrame: La hoja.
+    '''
+    return leer_hojas(ruta, [hoja], directorio, **opciones)[hoja]
+
+
+def _borrar_anteriores(ruta_xlsx, hoja, huella, directorio):
+    # Borramos las instantáneas de la hoja de versiones anteriores del archivo (las de otras opciones
+    # de lectura del mismo contenido siguen siendo válidas)
+    prefijo = f"{os.path.basename(ruta_xlsx)}.{hoja}."
+    for nombre in os.listdir(directorio):
+        if nombre.startswith(prefijo) and nombre.endswith(".feather") \
+                and not nombre.startswith(f"{prefijo}{huella[:16]}."):
+            os.remove(os.path.join(directorio, nombre))
+
+
+def limpiar(directorio=DIRECTORIO):
+    '''
+    Borra todas las instantáneas guardadas.
+    '''
+    if not os.path.isdir(directorio):
+        return
+    for nombre in os.listdir(directorio):
+        if nombre.endswith(".feather"):
+            os.remove(os.path.join(directorio, nombre))
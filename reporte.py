@@ -0,0 +1,415 @@
+## REPORTE DEL EDA EN LOTE
+# Importaciones
+import html
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from matplotlib.figure import Figure
+
+import derivadas
+import efecto
+import graficos_rapidos
+
+
+# Formatos de imagen que se escriben por defecto para cada gráfico
+FORMATOS = ("png", "svg")
+
+
+## PREPARACIÓN: agregados calculados una sola vez en el proceso principal
+
+def _orden(serie):
+    # Valores presentes en orden de aparición (el orden de seaborn con columnas de texto); con una columna
+    # categórica (ver compactacion.py) descartamos las categorías del diccionario sin casos
+    return list(pd.unique(serie.dropna()))
+
+
+def _conteo(serie, por_cantidad=False):
+    # Conteo de los valores presentes en orden de aparición (como los countplot de seaborn) o de mayor a
+    # menor desempatando por aparición (como value_counts sobre texto), igual que tools.graficos._conteo
+    conteo = serie.value_counts(sort=False).reindex(_orden(serie))
+    conteo.index = conteo.index.astype(str)
+    return conteo.sort_values(ascending=False, kind="stable") if por_cantidad else conteo
+
+
+def _por_sexo(df, columna):
+    # Víctimas por valor y sexo, solo con los valores presentes y ordenados como agrupando columnas de texto
+    tabla = df.groupby([columna, "Sexo"], observed=True).size().unstack(fill_value=0)
+    tabla.index, tabla.columns = tabla.index.astype(str), tabla.columns.astype(str)
+    return tabla.sort_index().sort_index(axis=1)
+
+
+def preparar_distribucion_edad(df):
+    return graficos_rapidos.frecuencias(df, "Edad")
+
+
+def preparar_distribucion_edad_por_anio(df):
+    return graficos_rapidos.frecuencias(df, "Edad", ["Año"])
+
+
+def preparar_accidentes_por_anio_y_sexo(df):
+    return graficos_rapidos.frecuencias(df, "Edad", ["Año", "Sexo"])
+
+
+def preparar_cohen_por_año(df):
+    return efecto.cohen_por_grupo(df, grupo="Año", comparar="Sexo", niveles=("MASCULINO", "FEMENINO"), valor="Edad")
+
+
+def preparar_edad_y_rol_victimas(df):
+    return graficos_rapidos.frecuencias(df, "Edad", ["Rol"])
+
+
+def preparar_distribucion_edad_por_victima(df):
+    return graficos_rapidos.frecuencias(df, "Edad", ["Víctima"])
+
+
+def preparar_victimas_sexo_rol_victima(df):
+    return {
+        "sexo": _conteo(df["Sexo"]),
+        "rol": _por_sexo(df, "Rol"),
+        "victima": _por_sexo(df, "Víctima"),
+    }
+
+
+def preparar_victimas_participantes(df):
+    return _conteo(df["Participantes"], por_cantidad=True)
+
+
+def preparar_cantidad_acusados(df):
+    return _conteo(df["Acusado"], por_cantidad=True)
+
+
+def preparar_tipo_de_calle(df):
+    return {"Tipo de calle": _conteo(df["Tipo de calle"]), "Cruce": _conteo(df["Cruce"])}
+
+
+def preparar_accidentes_mensuales(df):
+    return df.groupby(["Año", "Mes"])["Cantidad víctimas"].sum()
+
+
+def preparar_victimas_mensuales(df):
+    return df.groupby("Mes")["Cantidad víctimas"].sum()
+
+
+def preparar_victimas_por_dia_semana(df):
+    nombre_dia = derivadas.obtener_derivada(df, "Nombre día")
+    suma = df["Cantidad víctimas"].groupby(nombre_dia.rename("Nombre día"), observed=True).sum()
+    suma.index = suma.index.astype(str)
+    return suma.reindex(derivadas.DIAS_SEMANA)
+
+
+def preparar_accidentes_por_tiempo_del_dia(df):
+    conteo = derivadas.obtener_derivada(df, "Categoria tiempo").value_counts()
+    conteo.index = conteo.index.astype(str)
+    return conteo[conteo > 0]
+
+
+def preparar_accidentes_por_horas_del_dia(df):
+    hora_del_dia = derivadas.obtener_derivada(df, "Hora del día")
+    return hora_del_dia[hora_del_dia >= 0].value_counts().sort_index()
+
+
+def preparar_accidentes_fin_de_semana(df):
+    conteo = derivadas.obtener_derivada(df, "Tipo de día").value_counts()
+    conteo.index = conteo.index.astype(str)
+    return conteo[conteo > 0]
+
+
+def preparar_mapa_densidad(df, ancho_banda=200):
+    import espacial
+
+    indice = espacial.IndiceEspacial.desde_dataframe(df)
+    lon, lat = indice.centros()
+    return {"densidad": indice.densidad(ancho_banda), "extension": [lon.min(), lon.max(), lat.min(), lat.max()]}
+
+
+## DIBUJO: las primitivas del modo rápido de tools.graficos (ver graficos_rapidos.py) sobre los agregados
+
+def _figura(tamaño, filas=1, columnas=1, **kwargs):
+    # Figura independiente de pyplot: se dibuja sin backend interactivo y sin estado global
+    fig = Figure(figsize=tamaño)
+    return fig, fig.subplots(filas, columnas, **kwargs)
+
+
+def _anotar(ax, posiciones, valores):
+    # Agregamos las cantidades en las barras
+    for posicion, valor in zip(posiciones, valores):
+        ax.annotate(f"{valor}", (posicion, valor), ha="center", va="bottom")
+
+
+def _barras(ax, datos, paleta=None, nombre_x=None, nombre_y=None):
+    # Como tools.graficos._barplot en el modo rápido: sin paleta, el próximo color del ciclo de los ejes
+    colores = graficos_rapidos.colores(paleta, len(datos)) if paleta is not None \
+        else graficos_rapidos.desaturar(graficos_rapidos.color_siguiente(ax))
+    return graficos_rapidos.barras(ax, list(datos.index), datos.to_numpy(), colores, nombre_x=nombre_x,
+                                   nombre_y=nombre_y)
+
+
+def _rotar(ax):
+    ax.set_xticklabels(ax.get_xticklabels(), rotation=45, horizontalalignment="right")
+
+
+def dibujar_distribucion_edad(datos):
+    fig, ax = _figura((12, 6), 2, 1, sharex=True)
+    graficos_rapidos.histograma_densidad(ax[0], datos, color="green", edgecolor="black")
+    ax[0].set_title("Histograma de Edad") ; ax[0].set_ylabel("Frecuencia")
+    graficos_rapidos.cajas(ax[1], [graficos_rapidos.resumen_caja(datos)], [graficos_rapidos.desaturar("skyblue")],
+                           vertical=False)
+    ax[1].set_title("Boxplot de Edad") ; ax[1].set_xlabel("Edad")
+    fig.tight_layout()
+    return fig
+
+
+def dibujar_distribucion_edad_por_anio(datos):
+    fig, ax = _figura((12, 6))
+    graficos_rapidos.cajas_por_grupo(ax, datos, "Set3", True, "Año", "Edad")
+    ax.set_title("Boxplot de Edades de Víctimas por Año") ; ax.set_xlabel("Año") ; ax.set_ylabel("Edad de las Víctimas")
+    return fig
+
+
+def dibujar_accidentes_por_anio_y_sexo(datos):
+    fig, ax = _figura((12, 4))
+    graficos_rapidos.medias_por_grupo(ax, datos, "coolwarm", "Año", "Edad")
+    ax.set_title("Accidentes por Año y Sexo")
+    ax.set_xlabel("Año") ; ax.set_ylabel("Edad de las víctimas") ; ax.legend(title="Sexo")
+    return fig
+
+
+def dibujar_cohen_por_año(datos):
+    fig, ax = _figura((8, 4))
+    ax.bar(datos["Año"], datos["Estadistico de Cohen"], color="LightSalmon")
+    ax.set_xlabel("Año") ; ax.set_ylabel("Estadístico de Cohen") ; ax.set_title("Estadístico de Cohen por Año")
+    ax.set_xticks(datos["Año"])
+    return fig
+
+
+def dibujar_edad_y_rol_victimas(datos):
+    fig, ax = _figura((8, 4))
+    graficos_rapidos.cajas_por_grupo(ax, datos, "tab20", False, "Edad", "Rol")
+    ax.set_title("Edades por Condición")
+    return fig
+
+
+def dibujar_distribucion_edad_por_victima(datos):
+    fig, ax = _figura((14, 6))
+    graficos_rapidos.cajas_por_grupo(ax, datos, "Set2", True, "Víctima", "Edad")
+    ax.set_title("Vehículo usado en relación a la edad de la víctima") ; ax.set_xlabel("Tipo de vehiculo") ; ax.set_ylabel("Edad")
+    return fig
+
+
+def dibujar_victimas_sexo_rol_victima(datos):
+    fig, axes = _figura((15, 4), 1, 3)
+    colores = ["dodgerblue", "y"]
+
+    # Sin hue, seaborn pinta todas las barras con el primer color de la paleta
+    graficos_rapidos.barras(axes[0], list(datos["sexo"].index), datos["sexo"].to_numpy(),
+                            graficos_rapidos.desaturar(colores[0]))
+    axes[0].set_xlabel("Sexo")
+    axes[0].set_title("Víctimas por sexo") ; axes[0].set_ylabel("Cantidad de víctimas")
+
+    # Los gráficos apilados invierten los colores
+    for ax, tabla, titulo in [(axes[1], datos["rol"], "Víctimas por rol"),
+                              (axes[2], datos["victima"], "Víctimas por tipo de vehículo")]:
+        tabla.plot(kind="bar", stacked=True, ax=ax, color=colores[::-1], legend=False)
+        ax.set_title(titulo) ; ax.set_ylabel("Cantidad de víctimas") ; ax.tick_params(axis="x", rotation=45)
+    return fig
+
+
+def dibujar_victimas_participantes(datos):
+    fig, ax = _figura((15, 4))
+    _barras(ax, datos, "Set3", "Participantes", "count")
+    ax.set_title("Víctimas por participantes") ; ax.set_ylabel("Cantidad de víctimas")
+    _rotar(ax)
+    return fig
+
+
+def dibujar_cantidad_acusados(datos):
+    fig, ax = _figura((15, 4))
+    _barras(ax, datos, nombre_x="Acusado", nombre_y="count")
+    ax.set_title("Cantidad de acusados en los hechos") ; ax.set_ylabel("Cantidad de acusados")
+    _rotar(ax)
+    return fig
+
+
+def dibujar_tipo_de_calle(datos):
+    fig, axes = _figura((10, 4), 1, 2)
+    for ax, (columna, conteo), titulo in zip(axes, datos.items(), ["Víctimas por tipo de calle", "Víctimas en cruces"]):
+        _barras(ax, conteo, "Set2", columna, "count")
+        ax.set_title(titulo) ; ax.set_ylabel("Cantidad de víctimas")
+    return fig
+
+
+def dibujar_accidentes_mensuales(datos):
+    n_filas, n_columnas = 3, 2
+    fig, axes = _figura((14, 8), n_filas, n_columnas)
+    for i, year in enumerate(datos.index.unique(level="Año")):
+        ax = axes[i // n_columnas, i % n_columnas]
+        datos.loc[year].to_frame("Cantidad víctimas").plot(ax=ax, kind="bar", legend=False)
+        ax.set_title("Año " + str(year)) ; ax.set_xlabel("Mes") ; ax.set_ylabel("Cantidad de Víctimas")
+    fig.tight_layout()
+    return fig
+
+
+def dibujar_victimas_mensuales(datos):
+    fig, ax = _figura((6, 4))
+    _barras(ax, datos, "Set2", "Mes", "Cantidad víctimas")
+    ax.set_title("Cantidad de víctimas mensuales") ; ax.set_xlabel("Mes") ; ax.set_ylabel("Cantidad de accidentes")
+    return fig
+
+
+def dibujar_victimas_por_dia_semana(datos):
+    fig, ax = _figura((6, 3))
+    _barras(ax, datos, "Set3", "Nombre día", "Cantidad víctimas")
+    ax.set_title("Accidentes por Día de la Semana") ; ax.set_xlabel("Día de la Semana") ; ax.set_ylabel("Cantidad de Accidentes")
+    ax.tick_params(axis="x", rotation=45)
+    return fig
+
+
+def dibujar_accidentes_por_tiempo_del_dia(datos):
+    fig, ax = _figura((8, 6))
+    _barras(ax, datos, "YlGn", "Categoria tiempo", "Cantidad accidentes")
+    ax.set_title("Accidentes por Momento del Día") ; ax.set_xlabel("Momento del día") ; ax.set_ylabel("Cantidad")
+    _anotar(ax, range(len(datos)), datos.to_numpy())
+    return fig
+
+
+def dibujar_accidentes_por_horas_del_dia(datos):
+    fig, ax = _figura((15, 6))
+    _barras(ax, datos, "Set3", "Hora del día", "Cantidad de accidentes")
+    ax.set_title("Accidentes por Hora del Día") ; ax.set_xlabel("Hora del día") ; ax.set_ylabel("Cantidad de accidentes")
+    _anotar(ax, datos.index, datos.to_numpy())
+    return fig
+
+
+def dibujar_accidentes_fin_de_semana(datos):
+    fig, ax = _figura((6, 4))
+    _barras(ax, datos, "RdBu", "Tipo de día", "Cantidad de accidentes")
+    ax.set_title("Accidentes por tipo de día") ; ax.set_xlabel("Tipo de día") ; ax.set_ylabel("Cantidad")
+    _anotar(ax, range(len(datos)), datos.to_numpy())
+    return fig
+
+
+def dibujar_mapa_densidad(datos):
+    fig, ax = _figura((7, 7))
+    imagen = ax.imshow(datos["densidad"], origin="lower", cmap="magma", extent=datos["extension"], aspect="auto")
+    fig.colorbar(imagen, label="Víctimas por km²")
+    ax.set_title("Densidad de víctimas") ; ax.set_xlabel("Longitud") ; ax.set_ylabel("Latitud")
+    return fig
+
+
+# Gráficos del reporte en el orden del EDA: nombre -> (título, preparación, dibujo)
+GRAFICOS = {
+    "distribucion_edad": ("Distribución de la edad", preparar_distribucion_edad, dibujar_distribucion_edad),
+    "distribucion_edad_por_anio": ("Edad de las víctimas por año", preparar_distribucion_edad_por_anio, dibujar_distribucion_edad_por_anio),
+    "accidentes_por_anio_y_sexo": ("Accidentes por año y sexo", preparar_accidentes_por_anio_y_sexo, dibujar_accidentes_por_anio_y_sexo),
+    "cohen_por_año": ("Estadístico de Cohen por año", preparar_cohen_por_año, dibujar_cohen_por_año),
+    "edad_y_rol_victimas": ("Edad por rol", preparar_edad_y_rol_victimas, dibujar_edad_y_rol_victimas),
+    "distribucion_edad_por_victima": ("Edad por tipo de vehículo", preparar_distribucion_edad_por_victima, dibujar_distribucion_edad_por_victima),
+    "victimas_sexo_rol_victima": ("Víctimas por sexo, rol y vehículo", preparar_victimas_sexo_rol_victima, dibujar_victimas_sexo_rol_victima),
+    "victimas_participantes": ("Víctimas por participantes", preparar_victimas_participantes, dibujar_victimas_participantes),
+    "cantidad_acusados": ("Acusados", preparar_cantidad_acusados, dibujar_cantidad_acusados),
+    "tipo_de_calle": ("Tipo de calle y cruces", preparar_tipo_de_calle, dibujar_tipo_de_calle),
+    "accidentes_mensuales": ("Víctimas mensuales por año", preparar_accidentes_mensuales, dibujar_accidentes_mensuales),
+    "victimas_mensuales": ("Víctimas por mes", preparar_victimas_mensuales, dibujar_victimas_mensuales),
+    "victimas_por_dia_semana": ("Víctimas por día de la semana", preparar_victimas_por_dia_semana, dibujar_victimas_por_dia_semana),
+    "accidentes_por_tiempo_del_dia": ("Accidentes por momento del día", preparar_accidentes_por_tiempo_del_dia, dibujar_accidentes_por_tiempo_del_dia),
+    "accidentes_por_horas_del_dia": ("Accidentes por hora del día", preparar_accidentes_por_horas_del_dia, dibujar_accidentes_por_horas_del_dia),
+    "accidentes_fin_de_semana": ("Accidentes por tipo de día", preparar_accidentes_fin_de_semana, dibujar_accidentes_fin_de_semana),
+    "mapa_densidad": ("Densidad de víctimas", preparar_mapa_densidad, dibujar_mapa_densidad),
+}
+
+
+## RENDERIZADO
+
+def renderizar(nombre, datos, directorio, formatos=FORMATOS):
+    '''
+    Dibuja un gráfico a partir de sus agregados y lo guarda en los formatos indicados.
+
+    Parámetros:
+        nombre (str): El nombre del gráfico (una clave de GRAFICOS).
+        datos: Los agregados devueltos por su función de preparación.
+        directorio (str): La carpeta donde se escriben las imágenes.
+        formatos (tuple): Las extensiones de las imágenes ("png", "svg", "pdf", ...).
+
+    Retorna:
+        tuple: El nombre, la lista de archivos escritos y los segundos que tomó dibujarlo.
+    '''
+    inicio = time.perf_counter()
+    fig = GRAFICOS[nombre][2](datos)
+    archivos = []
+    for formato in formatos:
+        archivo = f"{nombre}.{formato}"
+        fig.savefig(os.path.join(directorio, archivo), bbox_inches="tight")
+        archivos.append(archivo)
+    return nombre, archivos, time.perf_counter() - inicio
+
+
+def _indice_html(filas):
+    # Una sección por gráfico con la imagen y los enlaces a cada formato
+    secciones = []
+    for fila in filas:
+        imagen = next((a for a in fila["archivos"] if a.endswith((".png", ".svg"))), fila["archivos"][0])
+        enlaces = " | ".join(f'<a href="{html.escape(a)}">{html.escape(a.rsplit(".", 1)[1])}</a>' for a in fila["archivos"])
+        secciones.append(f'<section>\n<h2>{html.escape(fila["titulo"])}</h2>\n'
+                         f'<img src="{html.escape(imagen)}" alt="{html.escape(fila["titulo"])}">\n'
+                         f'<p>{enlaces}</p>\n</section>')
+    return ('<!DOCTYPE html>\n<html lang="es">\n<head>\n<meta charset="utf-8">\n<title>Reporte EDA - Homicidios viales</title>\n'
+            '<style>body{font-family:sans-serif;max-width:1100px;margin:auto} img{max-width:100%}</style>\n</head>\n<body>\n'
+            '<h1>Reporte EDA - Homicidios viales</h1>\n' + "\n".join(secciones) + '\n</body>\n</html>\n')
+
+
+def generar_reporte(df, directorio="reporte", graficos=None, formatos=FORMATOS, procesos=None):
+    '''
+    Genera todos los gráficos del EDA sin pantalla y escribe un índice HTML.
+
+    Las figuras se crean con matplotlib.figure.Figure y se guardan con el lienzo Agg, sin pasar
+    por pyplot, así que no se abren ventanas ni cambia el backend de la sesión.
+
+    Los agregados de cada gráfico (conteos, sumas y las tablas de frecuencias de la edad) se
+    calculan una sola vez en este proceso, y a los procesos del pool solo se les envían esos
+    agregados, nunca el DataFrame. El dibujo usa las primitivas del modo rápido de tools.graficos
+    (ver graficos_rapidos.py), así que el reporte se ve igual que ese modo: las cajas, las medias
+    con su intervalo normal del 95% y la densidad del histograma salen de las frecuencias, sin las
+    estadísticas de seaborn. Con suficientes procesos, el reporte tarda aproximadamente lo que el
+    gráfico más lento.
+
+    Parámetros:
+        df (pandas.DataFrame): El DataFrame de víctimas limpio.
+        directorio (str): La carpeta donde se escriben las imágenes y el índice "index.html".
+        graficos (list): Los nombres de los gráficos a generar (claves de GRAFICOS). Por defecto, todos.
+        formatos (tuple): Las extensiones de las imágenes.
+        procesos (int): Cantidad de procesos. Con 1 se dibuja en este mismo proceso; por defecto,
+            uno por CPU (sin superar la cantidad de gráficos).
+
+    Retorna:
+        pandas.DataFrame: Una fila por gráfico con su título, los archivos escritos y los
+        segundos de preparación y de dibujo.
+    '''
+    graficos = list(GRAFICOS) if graficos is None else list(graficos)
+    desconocidos = [nombre for nombre in graficos if nombre not in GRAFICOS]
+    if desconocidos:
+        raise KeyError(f"Gráficos desconocidos: {desconocidos}. Opciones: {list(GRAFICOS)}")
+    os.makedirs(directorio, exist_ok=True)
+
+    # Calculamos los agregados de cada gráfico en el proceso principal
+    agregados, preparacion = {}, {}
+    for nombre in graficos:
+        inicio = time.perf_counter()
+        agregados[nombre] = GRAFICOS[nombre][1](df)
+        preparacion[nombre] = time.perf_counter() - inicio
+
+    procesos = min(procesos or os.cpu_count() or 1, len(graficos))
+    if procesos > 1:
+        with ProcessPoolExecutor(procesos) as ejecutor:
+            futuros = [ejecutor.submit(renderizar, nombre, agregados[nombre], directorio, formatos) for nombre in graficos]
+            resultados = [futuro.result() for futuro in futuros]
+    else:
+        resultados = [renderizar(nombre, agregados[nombre], directorio, formatos) for nombre in graficos]
+
+    filas = [{"grafico": nombre, "titulo": GRAFICOS[nombre][0], "archivos": archivos,
+              "preparacion (s)": preparacion[nombre], "dibujo (s)": segundos}
+             for nombre, archivos, segundos in resultados]
+    with open(os.path.join(directorio, "index.html"), "w", encoding="utf-8") as archivo:
+        archivo.write(_indice_html(filas))
+    return pd.DataFrame(filas)
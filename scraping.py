@@ -0,0 +1,323 @@
+## WEBSCRAPING DE LA POBLACIÓN HISTÓRICA
+# Importaciones
+import asyncio
+import hashlib
+import json
+import os
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+
+import pandas as pd
+
+# aiohttp es opcional: si está instalado, las descargas comparten un pool de conexiones persistentes
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+# Páginas con una tabla "Población histórica": nombre -> URL
+FUENTES = {"CABA": "https://es.wikipedia.org/wiki/Buenos_Aires"}
+
+# Título de la tabla buscada (encabezado th.navbox-title)
+TITULO_TABLA = "Población histórica"
+
+# Carpetas de la caché HTTP y de las páginas guardadas para el modo sin conexión
+DIRECTORIO_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "homicidios_viales", "scraping")
+DIRECTORIO_FIXTURES = "datasets/fixtures"
+
+RUTA_POBLACION = "datasets/poblacion_CABA.csv"
+
+# Conexiones simultáneas y tiempo de espera (segundos) de cada descarga
+CONEXIONES = 8
+TIEMPO_ESPERA = 30
+
+AGENTE = "Proyecto-Individual-2-Data-Analyst/1.0 (poblacion CABA)"
+
+
+## CACHÉ HTTP (ETag / Last-Modified)
+
+def _rutas_cache(url, directorio):
+    clave = hashlib.sha1(url.encode()).hexdigest()
+    return os.path.join(directorio, f"{clave}.html"), os.path.join(directorio, f"{clave}.json")
+
+
+def _leer_cache(url, directorio):
+    # Devuelve (html, metadatos) de la última descarga o (None, {})
+    ruta_html, ruta_meta = _rutas_cache(url, directorio)
+    try:
+        with open(ruta_meta, encoding="utf-8") as archivo:
+            metadatos = json.load(archivo)
+        with open(ruta_html, encoding="utf-8") as archivo:
+            return archivo.read(), metadatos
+    except (OSError, ValueError):
+        return None, {}
+
+
+def _validadores(cabeceras):
+    # ETag y Last-Modified de la respuesta: se leen del objeto de cabeceras de aiohttp o urllib, que no
+    # distingue mayúsculas (algunos servidores, como los de Wikimedia, envían "etag" en minúsculas)
+    return {"etag": cabeceras.get("ETag"), "last_modified": cabeceras.get("Last-Modified")}
+
+
+def _guardar_cache(url, directorio, html, validadores):
+    os.makedirs(directorio, exist_ok=True)
+    ruta_html, ruta_meta = _rutas_cache(url, directorio)
+    with open(ruta_html, "w", encoding="utf-8") as archivo:
+        archivo.write(html)
+    metadatos = dict(validadores, url=url)
+    with open(ruta_meta, "w", encoding="utf-8") as archivo:
+        json.dump(metadatos, archivo)
+
+
+def _cabeceras_condicionales(metadatos):
+    # Con estas cabeceras el servidor responde 304 (sin cuerpo) si la página no cambió
+    cabeceras = {"User-Agent": AGENTE}
+    if metadatos.get("etag"):
+        cabeceras["If-None-Match"] = metadatos["etag"]
+    if metadatos.get("last_modified"):
+        cabeceras["If-Modified-Since"] = metadatos["last_modified"]
+    return cabeceras
+
+
+## DESCARGA CONCURRENTE
+
+async def _descargar_aiohttp(sesion, url, cabeceras):
+    async with sesion.get(url, headers=cabeceras) as respuesta:
+        if respuesta.status == 304:
+            return 304, None, {}
+        respuesta.raise_for_status()
+        return respuesta.status, await respuesta.text(), _validadores(respuesta.headers)
+
+
+def _descargar_urllib(url, cabeceras, tiempo_espera):
+    pedido = urllib.request.Request(url, headers=cabeceras)
+    try:
+        with urllib.request.urlopen(pedido, timeout=tiempo_espera) as respuesta:
+            charset = respuesta.headers.get_content_charset() or "utf-8"
+            return respuesta.status, respuesta.read().decode(charset, errors="replace"), _validadores(respuesta.headers)
+    except urllib.error.HTTPError as error:
+        if error.code == 304:
+            return 304, None, {}
+        raise
+
+
+async def descargar(urls, conexiones=CONEXIONES, directorio_cache=DIRECTORIO_CACHE, tiempo_espera=TIEMPO_ESPERA):
+    '''
+    Descarga varias páginas de forma concurrente, reutilizando la copia en caché si no cambiaron.
+
+    Cada pedido envía If-None-Match / If-Modified-Since con el ETag y la fecha de la última
+    descarga; si el servidor responde 304 se usa el HTML guardado. Con aiohttp las descargas
+    comparten un pool de conexiones (limitado a "conexiones"); sin aiohttp se usa urllib en
+    hilos, con la misma cantidad máxima de pedidos simultáneos.
+
+    Parámetros:
+        urls (dict): Las páginas a descargar, {nombre: url}.
+        conexiones (int): Cantidad máxima de conexiones simultáneas.
+        directorio_cache (str): Carpeta de la caché HTTP. Con None no se usa caché.
+        tiempo_espera (float): Segundos máximos por pedido.
+
+    Retorna:
+        dict: {nombre: html}.
+    '''
+    semaforo = asyncio.Semaphore(conexiones)
+    hilos = None
+
+    async def una(nombre, url, sesion):
+        anterior, metadatos = _leer_cache(url, directorio_cache) if directorio_cache else (None, {})
+        cabeceras = _cabeceras_condicionales(metadatos if anterior is not None else {})
+        async with semaforo:
+            if sesion is not None:
+                estado, html, validadores = await _descargar_aiohttp(sesion, url, cabeceras)
+            else:
+                estado, html, validadores = await asyncio.get_running_loop().run_in_executor(
+                    hilos, _descargar_urllib, url, cabeceras, tiempo_espera)
+        if estado == 304:
+            return nombre, anterior
+        if directorio_cache:
+            _guardar_cache(url, directorio_cache, html, validadores)
+        return nombre, html
+
+    if aiohttp is not None:
+        conector = aiohttp.TCPConnector(limit=conexiones)
+        async with aiohttp.ClientSession(connector=conector, timeout=aiohttp.ClientTimeout(total=tiempo_espera)) as sesion:
+            resultados = await asyncio.gather(*(una(nombre, url, sesion) for nombre, url in urls.items()))
+    else:
+        with ThreadPoolExecutor(conexiones) as hilos:
+            resultados = await asyncio.gather(*(una(nombre, url, None) for nombre, url in urls.items()))
+    return dict(resultados)
+
+
+def leer_fixtures(nombres, directorio=DIRECTORIO_FIXTURES):
+    '''
+    Lee las páginas guardadas para el modo sin conexión ("<directorio>/<nombre>.html").
+
+    Parámetros:
+        nombres (iterable): Los nombres de las fuentes.
+        directorio (str): La carpeta de las páginas guardadas.
+
+    Retorna:
+        dict: {nombre: html}.
+    '''
+    paginas = {}
+    for nombre in nombres:
+        with open(os.path.join(directorio, f"{nombre}.html"), encoding="utf-8") as archivo:
+            paginas[nombre] = archivo.read()
+    return paginas
+
+
+## LECTURA DE LA TABLA
+
+class _LectorTabla(HTMLParser):
+    # Junta el texto de las celdas (th y td) de cada fila de una sola tabla, sin armar un árbol del documento
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.filas = []
+        self.profundidad = 0
+        self.celda = None
+        self.terminada = False
+
+    def handle_starttag(self, etiqueta, atributos):
+        if self.terminada:
+            return
+        if etiqueta == "table":
+            self.profundidad += 1
+        elif etiqueta == "tr" and self.profundidad == 1:
+            self.filas.append([])
+        elif etiqueta in ("th", "td") and self.profundidad == 1 and self.filas:
+            self.celda = []
+
+    def handle_endtag(self, etiqueta):
+        if self.terminada:
+            return
+        if etiqueta in ("th", "td") and self.celda is not None:
+            self.filas[-1].append("".join(self.celda).strip())
+            self.celda = None
+        elif etiqueta == "table":
+            self.profundidad -= 1
+            self.terminada = self.profundidad == 0
+
+    def handle_data(self, datos):
+        if self.celda is not None:
+            self.celda.append(datos)
+
+
+def _fin_tabla(html, inicio):
+    # Posición del </table> que cierra la tabla que empieza en "inicio" (contando tablas anidadas)
+    profundidad, posicion = 0, inicio
+    while True:
+        apertura = html.find("<table", posicion + 1)
+        cierre = html.find("</table", posicion + 1)
+        if cierre < 0:
+            return len(html)
+        if 0 <= apertura < cierre:
+            profundidad, posicion = profundidad + 1, apertura
+        elif profundidad:
+            profundidad, posicion = profundidad - 1, cierre
+        else:
+            return html.find(">", cierre) + 1
+
+
+def extraer_tabla(html, titulo=TITULO_TABLA):
+    '''
+    Extrae las filas de la tabla cuyo encabezado contiene el título indicado.
+
+    En lugar de interpretar la página completa y recorrer todas sus tablas, se busca el título
+    en el texto, se retrocede hasta el <table> que lo contiene y solo ese fragmento pasa por el
+    parser (html.parser de la biblioteca estándar, en una sola pasada y sin armar un árbol).
+
+    Parámetros:
+        html (str): El HTML de la página.
+        titulo (str): El texto del encabezado de la tabla.
+
+    Retorna:
+        list: Las filas de la tabla, cada una como lista con el texto de sus celdas.
+
+    Excepciones:
+        ValueError: Si la página no tiene una tabla con ese título.
+    '''
+    posicion = html.find(titulo)
+    while posicion >= 0:
+        inicio = html.rfind("<table", 0, posicion)
+        # El título debe estar en un encabezado navbox-title dentro de la tabla
+        encabezado = html.rfind("<th", inicio, posicion)
+        if inicio >= 0 and encabezado >= 0 and "navbox-title" in html[encabezado:html.find(">", encabezado)]:
+            lector = _LectorTabla()
+            lector.feed(html[inicio:_fin_tabla(html, inicio)])
+            lector.close()
+            return lector.filas
+        posicion = html.find(titulo, posicion + len(titulo))
+    raise ValueError(f"No se encontró la tabla {titulo!r} en la página")
+
+
+def poblacion_historica(html, titulo=TITULO_TABLA):
+    '''
+    Convierte la tabla "Población histórica" de una página en un DataFrame.
+
+    Se descartan el título, el encabezado y la columna del cambio porcentual, y se quitan los
+    espacios (comunes y no separables) usados para separar los miles.
+
+    Parámetros:
+        html (str): El HTML de la página.
+        titulo (str): El texto del encabezado de la tabla.
+
+    Retorna:
+        pandas.DataFrame: Las columnas "Año" y "Población" (enteros).
+    '''
+    años, poblaciones = [], []
+    año_actual = None
+    for fila in extraer_tabla(html, titulo):
+        # Filas de tres celdas (año, población, cambio) o de dos que continúan el año anterior
+        if len(fila) == 3:
+            año_actual, poblacion = fila[0], fila[1]
+        elif len(fila) == 2 and año_actual:
+            poblacion = fila[0]
+        else:
+            continue
+        cifras = poblacion.replace(" ", "").replace("\xa0", "")
+        if año_actual.isdigit() and cifras.isdigit():
+            años.append(int(año_actual))
+            poblaciones.append(int(cifras))
+    return pd.DataFrame({"Año": años, "Población": poblaciones})
+
+
+def obtener_poblaciones(fuentes=None, sin_conexion=False, directorio_fixtures=DIRECTORIO_FIXTURES, **kwargs):
+    '''
+    Obtiene la población histórica de varias fuentes, en línea o desde las páginas guardadas.
+
+    Parámetros:
+        fuentes (dict): Las páginas, {nombre: url}. Por defecto, FUENTES.
+        sin_conexion (bool): Si es True, se leen las páginas guardadas en directorio_fixtures en
+            lugar de descargarlas.
+        directorio_fixtures (str): La carpeta de las páginas guardadas.
+        **kwargs: Opciones de descargar (conexiones, directorio_cache, tiempo_espera).
+
+    Retorna:
+        dict: {nombre: DataFrame con "Año" y "Población"}.
+    '''
+    fuentes = FUENTES if fuentes is None else fuentes
+    if sin_conexion:
+        paginas = leer_fixtures(fuentes, directorio_fixtures)
+    else:
+        paginas = asyncio.run(descargar(fuentes, **kwargs))
+    return {nombre: poblacion_historica(html) for nombre, html in paginas.items()}
+
+
+def actualizar_poblacion_caba(ruta=RUTA_POBLACION, sin_conexion=False, **kwargs):
+    '''
+    Vuelve a generar poblacion_CABA.csv a partir de Wikipedia (o de la página guardada).
+
+    Parámetros:
+        ruta (str): El archivo CSV de salida.
+        sin_conexion (bool): Si es True, se usa la página guardada en lugar de descargarla.
+        **kwargs: Opciones de obtener_poblaciones.
+
+    Retorna:
+        pandas.DataFrame: La población por año que se guardó.
+    '''
+    df_CABA = obtener_poblaciones({"CABA": FUENTES["CABA"]}, sin_conexion=sin_conexion, **kwargs)["CABA"]
+    df_CABA.to_csv(ruta, index=False, encoding="utf-8")
+    print(f"Se guardó el archivo {ruta}")
+    return df_CABA
@@ -0,0 +1,203 @@
+## CONVERSIÓN VECTORIZADA DE HORAS
+# Importaciones
+from datetime import datetime, time
+
+import numpy as np
+import pandas as pd
+
+
+# Valor que representa una hora faltante o inválida en los arreglos de segundos
+SIN_HORA = -1
+
+# Momentos del día: límites inferiores (en horas) de cada categoría después de "Madrugada"
+LIMITES_MOMENTO_DIA = np.array([6, 11, 14, 19])
+MOMENTOS_DIA = ["Madrugada", "Mañana", "Mediodía", "Tarde", "Noche"]
+
+
+def _texto_a_segundos(textos):
+    # Camino rápido: "HH:MM:SS" de 8 caracteres se decodifica leyendo los dígitos como enteros
+    arreglo = np.asarray(textos, dtype="U")
+    resultado = np.full(len(arreglo), SIN_HORA, dtype=np.int32)
+    if len(arreglo) == 0:
+        return resultado
+
+    canonicos = np.char.str_len(arreglo) == 8
+    if arreglo.dtype.itemsize >= 8 * 4 and canonicos.any():
+        caracteres = arreglo[canonicos].astype("U8").view(np.uint32).reshape(-1, 8)
+        digitos = caracteres[:, [0, 1, 3, 4, 6, 7]].astype(np.int32) - ord("0")
+        validos = ((digitos >= 0) & (digitos <= 9)).all(axis=1)
+        validos &= (caracteres[:, 2] == ord(":")) & (caracteres[:, 5] == ord(":"))
+        h = digitos[:, 0] * 10 + digitos[:, 1]
+        m = digitos[:, 2] * 10 + digitos[:, 3]
+        s = digitos[:, 4] * 10 + digitos[:, 5]
+        validos &= (h < 24) & (m < 60) & (s < 60)
+        segundos = np.where(validos, h * 3600 + m * 60 + s, SIN_HORA).astype(np.int32)
+        resultado[canonicos] = segundos
+        # Los textos de 8 caracteres inválidos se reintentan con el parser general
+        canonicos[np.flatnonzero(canonicos)[~validos]] = False
+
+    # El resto (por ejemplo "4:00:00") usa el parser de pandas con el mismo formato que strptime
+    otros = ~canonicos
+    if otros.any():
+        fechas = pd.to_datetime(pd.Series(arreglo[otros]), format="%H:%M:%S", errors="coerce")
+        resultado[otros] = _fechas_a_segundos(fechas)
+    return resultado
+
+
+def _fechas_a_segundos(fechas):
+    # Segundos desde la medianoche para un arreglo datetime64 (NaT -> SIN_HORA)
+    fechas = pd.DatetimeIndex(fechas)
+    segundos = (fechas.hour * 3600 + fechas.minute * 60 + fechas.second).to_numpy()
+    return np.where(fechas.isna(), SIN_HORA, segundos).astype(np.int32)
+
+
+def hora_a_segundos(valores):
+    '''
+    Convierte una columna de horas de tipos mezclados en segundos desde la medianoche.
+
+    Acepta textos "HH:MM:SS", objetos datetime.time, datetime o Timestamp, columnas datetime64
+    y centinelas como "SD" o None. Los textos se decodifican en bloque y el resto de los tipos
+    se agrupa para convertirse de una sola vez, sin llamar a strptime por cada fila.
+
+    Parámetros:
+        valores (pandas.Series, numpy.ndarray o list): Las horas a convertir.
+
+    Retorna:
+        numpy.ndarray: Un arreglo int32 con los segundos desde la medianoche, o SIN_HORA (-1)
+        cuando el valor falta o no puede interpretarse.
+    '''
+    serie = valores if isinstance(valores, pd.Series) else pd.Series(valores, dtype=object)
+
+    if pd.api.types.is_datetime64_any_dtype(serie.dtype):
+        return _fechas_a_segundos(serie)
+    if pd.api.types.is_timedelta64_dtype(serie.dtype):
+        segundos = serie.dt.total_seconds().to_numpy() % 86400
+        return np.where(serie.isna(), SIN_HORA, segundos).astype(np.int32)
+    if pd.api.types.is_string_dtype(serie.dtype) and not pd.api.types.is_object_dtype(serie.dtype):
+        nulos = serie.isna().to_numpy()
+        resultado = np.full(len(serie), SIN_HORA, dtype=np.int32)
+        resultado[~nulos] = _texto_a_segundos(serie[~nulos].to_numpy(dtype=str))
+        return resultado
+
+    arreglo = serie.to_numpy(dtype=object)
+    # Obtenemos el tipo de cada valor en una sola pasada (map en C) y separamos por tipo
+    tipos = np.fromiter(map(type, arreglo), dtype=object, count=len(arreglo))
+    resultado = np.full(len(arreglo), SIN_HORA, dtype=np.int32)
+
+    es_texto = tipos == str
+    if es_texto.any():
+        resultado[es_texto] = _texto_a_segundos(arreglo[es_texto])
+    es_time = tipos == time
+    if es_time.any():
+        resultado[es_time] = [t.hour * 3600 + t.minute * 60 + t.second for t in arreglo[es_time]]
+    es_datetime = (tipos == datetime) | (tipos == pd.Timestamp)
+    if es_datetime.any():
+        resultado[es_datetime] = _fechas_a_segundos(pd.to_datetime(arreglo[es_datetime]))
+    return resultado
+
+
+def valor_a_segundos(valor):
+    '''
+    Convierte una sola hora en segundos desde la medianoche, con las mismas reglas que hora_a_segundos.
+
+    Sirve para quien convierte valor por valor (por ejemplo con Series.apply): evita armar
+    arreglos para un solo elemento. Para una columna, hora_a_segundos es mucho más rápida.
+
+    Parámetros:
+        valor: Un texto "HH:MM:SS", un objeto time, datetime o Timestamp, o un centinela.
+
+    Retorna:
+        int: Los segundos desde la medianoche, o SIN_HORA (-1) si el valor falta o no puede interpretarse.
+    '''
+    tipo = type(valor)
+    if tipo is str:
+        if len(valor) == 8 and valor[2] == ":" and valor[5] == ":" and (valor[:2] + valor[3:5] + valor[6:]).isascii() \
+                and (valor[:2] + valor[3:5] + valor[6:]).isdigit():
+            h, m, s = int(valor[:2]), int(valor[3:5]), int(valor[6:])
+            return h * 3600 + m * 60 + s if h < 24 and m < 60 and s < 60 else SIN_HORA
+        # Otros formatos (por ejemplo "4:00:00") pasan por el parser general
+        return int(_texto_a_segundos([valor])[0])
+    if tipo is time or tipo is datetime or tipo is pd.Timestamp:
+        return valor.hour * 3600 + valor.minute * 60 + valor.second
+    return SIN_HORA
+
+
+def hora(segundos):
+    '''
+    Devuelve la hora (0 a 23) de un arreglo de segundos desde la medianoche.
+
+    Parámetros:
+        segundos (numpy.ndarray): Arreglo devuelto por hora_a_segundos.
+
+    Retorna:
+        numpy.ndarray: Un arreglo int8 con la hora, o -1 donde falta el dato.
+    '''
+    segundos = np.asarray(segundos)
+    return np.where(segundos >= 0, segundos // 3600, -1).astype(np.int8)
+
+
+def minuto(segundos):
+    '''
+    Devuelve el minuto (0 a 59) de un arreglo de segundos desde la medianoche.
+
+    Parámetros:
+        segundos (numpy.ndarray): Arreglo devuelto por hora_a_segundos.
+
+    Retorna:
+        numpy.ndarray: Un arreglo int8 con el minuto, o -1 donde falta el dato.
+    '''
+    segundos = np.asarray(segundos)
+    return np.where(segundos >= 0, segundos // 60 % 60, -1).astype(np.int8)
+
+
+def codigos_momento_dia(segundos):
+    '''
+    Clasifica cada hora en un momento del día usando límites de intervalo en lugar de if/elif.
+
+    Parámetros:
+        segundos (numpy.ndarray): Arreglo devuelto por hora_a_segundos.
+
+    Retorna:
+        numpy.ndarray: Un arreglo int8 con el índice en MOMENTOS_DIA, o -1 donde falta el dato.
+        Las horas de 0 a 5 son "Madrugada" (0); las de 6 a 10, "Mañana" (1); y así sucesivamente.
+        Las horas de 19 a 23 son "Noche" (4).
+    '''
+    horas = hora(segundos)
+    codigos = np.searchsorted(LIMITES_MOMENTO_DIA, horas, side="right").astype(np.int8)
+    return np.where(horas >= 0, codigos, -1).astype(np.int8)
+
+
+def momento_del_dia(segundos):
+    '''
+    Devuelve la categoría de momento del día de cada hora como pandas.Categorical.
+
+    Parámetros:
+        segundos (numpy.ndarray): Arreglo devuelto por hora_a_segundos.
+
+    Retorna:
+        pandas.Categorical: Categorías "Madrugada", "Mañana", "Mediodía", "Tarde" y "Noche";
+        nulo donde falta el dato.
+    '''
+    return pd.Categorical.from_codes(codigos_momento_dia(segundos), MOMENTOS_DIA)
+
+
+def segundos_a_time(segundos):
+    '''
+    Convierte un arreglo de segundos desde la medianoche en objetos datetime.time.
+
+    Se usa para mantener la compatibilidad con el CSV limpio, que guarda la hora como time.
+
+    Parámetros:
+        segundos (numpy.ndarray): Arreglo devuelto por hora_a_segundos.
+
+    Retorna:
+        numpy.ndarray: Un arreglo de objetos time, con None donde falta el dato.
+    '''
+    segundos = np.asarray(segundos)
+    # Construimos un objeto time por cada segundo distinto del día y luego indexamos
+    validos = segundos >= 0
+    unicos, inversa = np.unique(segundos[validos], return_inverse=True)
+    tabla = np.array([time(int(s) // 3600, int(s) // 60 % 60, int(s) % 60) for s in unicos] + [None], dtype=object)
+    resultado = np.full(len(segundos), None, dtype=object)
+    resultado[validos] = tabla[inversa]
+    return resultado
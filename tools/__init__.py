@@ -0,0 +1,46 @@
+## FUNCIONES DE UTILIDAD PARA EL ETL Y EDA
+# Las funciones se reparten en tres submódulos que se importan recién cuando se usa alguna de sus
+# funciones: así "import tools" no carga matplotlib ni seaborn en los procesos del ETL.
+#   tools.etl:          revisión de duplicados, tipos de datos, imputación y conversión de horas
+#   tools.estadistica:  d de Cohen y KPI
+#   tools.graficos:     gráficos del EDA (matplotlib y seaborn)
+import importlib
+
+
+# Submódulo de cada función pública
+FUNCIONES = {
+    "etl": ["ver_duplicados", "ver_variables", "convertir_a_time", "imputa_valor_frecuente",
+            "imputa_edad_media_segun_sexo", "ver_tipo_datos", "cargar_homicidios", "categoria_momento_dia"],
+    "estadistica": ["cohen", "kpis"],
+    "graficos": ["distribucion_edad", "distribucion_edad_por_anio", "accidentes_por_anio_y_sexo", "cohen_por_año",
+                 "edad_y_rol_victimas", "distribucion_edad_por_victima", "cant_accidentes_sexo",
+                 "victimas_sexo_rol_victima", "victimas_participantes", "cantidad_acusados", "tipo_de_calle",
+                 "accidentes_mensuales", "victimas_mensuales", "victimas_por_dia_semana",
+                 "accidentes_por_tiempo_del_dia", "accidentes_por_horas_del_dia", "accidentes_fin_de_semana",
+                 "mapa_densidad"],
+}
+
+_MODULO_DE = {funcion: modulo for modulo, funciones in FUNCIONES.items() for funcion in funciones}
+
+__all__ = list(_MODULO_DE)
+
+# Envoltura que se aplica a cada función al cargarla (la instala instrumentacion.activar); None: ninguna
+_envolver = None
+
+
+def __getattr__(nombre):
+    # Importamos el submódulo la primera vez que se pide una de sus funciones (o el submódulo mismo)
+    if nombre in FUNCIONES:
+        return importlib.import_module(f"{__name__}.{nombre}")
+    if nombre not in _MODULO_DE:
+        raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+    valor = getattr(importlib.import_module(f"{__name__}.{_MODULO_DE[nombre]}"), nombre)
+    if _envolver is not None:
+        valor = _envolver(valor)
+    # Lo guardamos en el paquete para que las siguientes consultas no pasen por __getattr__
+    globals()[nombre] = valor
+    return valor
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
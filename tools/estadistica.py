@@ -0,0 +1,45 @@
+## FUNCIONES ESTADÍSTICAS DEL EDA
+# Importaciones
+import numpy as np
+
+
+def cohen(group1, group2):
+    '''
+    Calcula el tamaño del efecto de la d de Cohen para dos grupos.
+
+    Parameters:
+        grupo1: El primer grupo.
+        grupo2: El segundo grupo.
+
+    Returns:
+        El tamaño del efecto de la d de Cohen.
+    '''
+    diff = group1.mean() - group2.mean()
+    var1, var2 = group1.var(), group2.var()
+    n1, n2 = len(group1), len(group2)
+    pooled_var = (n1 * var1 + n2 * var2) / (n1 + n2)
+    d = diff / np.sqrt(pooled_var)
+    return d
+
+def kpis(df, panel=None):
+    '''
+    Calcula los tres KPI del proyecto y muestra el valor del último período de cada uno.
+
+    Parámetros:
+        df (pandas.DataFrame): El DataFrame de víctimas. Puede ser None si se indica panel.
+        panel (PanelKPI): Panel de indicadores ya actualizado (ver kpi.py). Si se indica, los
+            valores se leen de sus contadores en lugar de recorrer df.
+
+    Retorna:
+        pandas.DataFrame: El resumen del último período de cada indicador.
+    '''
+    import kpi
+
+    if panel is None:
+        panel = kpi.PanelKPI.desde_dataframe(df)
+    resumen = panel.resumen()
+
+    for nombre, fila in resumen.iterrows():
+        print(f"{nombre} ({fila['Periodo']}): {fila['Valor']:.2f} | objetivo {fila['Objetivo']:.2f} | variación {fila['Variación (%)']:.2f}%")
+
+    return resumen
@@ -0,0 +1,205 @@
+## FUNCIONES DE UTILIDAD PARA EL ETL
+# Importaciones
+from datetime import time
+
+import numpy as np
+import pandas as pd
+
+from imputacion import imputar
+import duplicados
+import perfilado
+import tiempo
+
+
+def ver_duplicados(df, columna, normalizar=None):
+    '''
+    Examina y presenta las filas duplicadas en un DataFrame según una columna específica.
+
+    Esta función requiere un DataFrame y el nombre de una columna en particular como entrada.
+    Posteriormente, identifica las filas duplicadas basándose en el contenido de la columna especificada
+    (ver duplicados.py), las filtra y las ordena para facilitar la comparación.
+
+    Parameters:
+        df (pandas.DataFrame): El DataFrame donde se buscarán las filas duplicadas.
+        columna (str o list): El nombre de la columna (o las columnas) según la cual se evaluarán las duplicaciones.
+        normalizar (dict): Funciones de normalización por columna para detectar casi duplicados, por ejemplo
+            {"Dirección normalizada": duplicados.normalizar_direccion}.
+
+    Returns:
+        pandas.DataFrame: Un DataFrame que incluye las filas duplicadas, filtradas y organizadas, con las
+        columnas "grupo" y "tamaño_grupo", listo para ser revisado y comparado. Si no se encuentran
+        duplicados, se informa "No hay duplicados" y el DataFrame está vacío.
+    '''
+    # Filtramos y ordenamos las filas duplicadas para comparar entre sí
+    duplicated_rows_sorted = duplicados.grupos_duplicados(df, columna, normalizar)
+    if duplicated_rows_sorted.empty:
+        print("No hay duplicados")
+    
+    return duplicated_rows_sorted
+
+def ver_variables(df, muestra=None):
+    '''
+    Conduce un análisis de los tipos de datos y la existencia de valores nulos en un DataFrame.
+
+    Esta función acepta un DataFrame como entrada y produce un resumen que abarca detalles sobre
+    los tipos de datos presentes en cada columna. El perfil de cada columna se calcula con
+    perfilado.perfilar y queda en caché, así que repetir la llamada sobre columnas sin cambios
+    es inmediato.
+
+    Parámetros:
+        df (pandas.DataFrame): El DataFrame que será objeto de análisis.
+        muestra (int): Cantidad de filas a muestrear en DataFrames grandes. Por defecto, todas.
+
+    Retorna:
+        - pandas.DataFrame: Un DataFrame que proporciona una visión general de cada columna, incluyendo:
+        - "nombre_campo": Denominación de cada columna.
+        - "tipo_datos":   Tipos de datos distintos presentes en cada columna.
+    '''
+    info = perfilado.perfilar(df, muestra=muestra)[["nombre_campo", "tipo_datos"]]
+        
+    return info
+    
+def convertir_a_time(h):
+    '''
+    Transforma un valor en un objeto de tiempo (time) de Python si es factible.
+
+    Esta función acepta diversas formas de entrada y procura convertirlas en objetos de tiempo (time) de Python.
+    Si la conversión no es factible, retorna None. La conversión la hacen tiempo.hora_a_segundos y
+    tiempo.segundos_a_time (tiempo.valor_a_segundos para un solo valor), así que también acepta una columna
+    completa: pasar la columna entera es mucho más rápido que aplicar la función valor por valor.
+
+    Parámetros:
+        h (str, datetime, time, pandas.Series u otro): El valor (o la columna) que se desea convertir a un
+            objeto de tiempo (time).
+
+    Retorna:
+        datetime.time or None: Un objeto de tiempo (time) de Python en caso de éxito en la conversión, 
+                                o None si la transformación no es posible. Si h es una columna, una
+                                pandas.Series (o un numpy.ndarray) con un valor por fila.
+    '''
+    if _es_columna(h):
+        return _como_entrada(h, tiempo.segundos_a_time(tiempo.hora_a_segundos(h)))
+    segundos = tiempo.valor_a_segundos(h)
+    return time(segundos // 3600, segundos // 60 % 60, segundos % 60) if segundos >= 0 else None
+
+def _es_columna(valor):
+    return isinstance(valor, (pd.Series, pd.Index, np.ndarray, list))
+
+def _como_entrada(entrada, valores):
+    # Una Series de entrada devuelve una Series con el mismo índice y nombre
+    if isinstance(entrada, pd.Series):
+        return pd.Series(valores, index=entrada.index, name=entrada.name)
+    return valores
+
+def imputa_valor_frecuente(df, columna):
+    '''
+    Completa los valores ausentes en una columna de un DataFrame utilizando el valor más común.
+
+    Este procedimiento sustituye los valores "SD" con NaN en la columna especificada,
+    posteriormente calcula el valor más frecuente en dicha columna y emplea ese valor
+    para llenar los espacios vacíos (NaN).
+
+    Parámetros:
+        df (pandas.DataFrame): El DataFrame que contiene la columna que se desea completar.
+        columna (str): El nombre de la columna donde se llevará a cabo la imputación.
+
+    Retorna:
+        None
+    '''
+    # Reemplazamos "SD" con NaN e imputamos el valor más frecuente en una sola pasada
+    _, reporte = imputar(df, {columna: "moda"})
+    valor_mas_frecuente = reporte["valores"].iloc[0]
+    print(f"El valor mas frecuente es: {valor_mas_frecuente}")
+    
+def imputa_edad_media_segun_sexo(df):
+    '''
+    Rellena los valores ausentes en la columna 'Edad' utilizando la edad promedio según el género.
+
+    Este proceso sustituye los valores "SD" con NaN en la columna 'Edad', calcula el promedio de edad
+    para cada grupo de género (Femenino y Masculino), muestra los promedios calculados y
+    posteriormente completa los valores faltantes en la columna 'Edad' utilizando el promedio
+    correspondiente al género de cada fila en el DataFrame.
+
+    Parámetros:
+        df (pandas.DataFrame): El DataFrame que contiene la columna 'Edad' que se desea imputar.
+
+    Retorna:
+        None    
+    '''
+    
+    # Reemplazamos "SD" con NaN y llenamos con el promedio correspondiente al género de cada fila
+    _, reporte = imputar(df, {"Edad": ("media", "Sexo")})
+    promedio_por_genero = reporte["valores"].iloc[0]
+    print(f'La edad promedio de Femenino es {round(promedio_por_genero["FEMENINO"])} y de Masculino es {round(promedio_por_genero["MASCULINO"])}')
+
+    # Convertimos a entero
+    df["Edad"] = df["Edad"].astype(int)
+    
+def ver_tipo_datos(df, muestra=None):
+    '''
+    Lleva a cabo un análisis detallado de los tipos de datos y la existencia de valores nulos en un DataFrame.
+
+    Esta función toma un DataFrame como entrada y genera un resumen integral que abarca información sobre
+    los tipos de datos presentes en cada columna, el porcentaje de valores no nulos y nulos, así como la
+    cantidad exacta de valores nulos por columna. Para el perfil completo (centinelas "SD",
+    cardinalidad, mínimo y máximo) ver perfilado.perfilar.
+
+    Parámetros:
+        df (pandas.DataFrame): El DataFrame que será objeto de análisis.
+        muestra (int): Cantidad de filas a muestrear en DataFrames grandes. Por defecto, todas.
+
+    Retorna:
+        pandas.DataFrame: Un DataFrame que proporciona una visión global de cada columna, incluyendo:
+        - "nombre_campo": Denominación de cada columna.
+        - "tipo_datos": Tipos de datos distintos presentes en cada columna.
+        - "no_nulos_%": Porcentaje de valores no nulos en cada columna.
+        - "nulos_%": Porcentaje de valores nulos en cada columna.
+        - "nulos": Cantidad de valores nulos en cada columna.
+    '''
+    df_info = perfilado.perfilar(df, muestra=muestra)[["nombre_campo", "tipo_datos", "no_nulos_%", "nulos_%", "nulos"]]
+        
+    return df_info
+
+
+def cargar_homicidios(ruta, columnas=None, filtros=None):
+    '''
+    Carga el dataset columnar de homicidios (Parquet particionado por "Año") como DataFrame.
+
+    Solo se leen las columnas pedidas y los filtros se aplican antes de leer los datos, de modo
+    que cada gráfico del EDA puede cargar únicamente lo que necesita. Los archivos se abren con
+    memory-map; las columnas categóricas llegan como pandas.Categorical con el diccionario
+    global y los enteros como int8/int16 (ver compactacion.py).
+
+    Parámetros:
+        ruta (str): Carpeta del dataset, por ejemplo "datasets/homicidios_cleaned.parquet".
+        columnas (list): Columnas a cargar. Por defecto, todas.
+        filtros (list): Filtros en la forma de pyarrow, por ejemplo [("Año", ">=", 2019)].
+
+    Retorna:
+        pandas.DataFrame: El DataFrame con las columnas y filas seleccionadas.
+    '''
+    # pyarrow solo se requiere para el dataset columnar
+    import esquema
+
+    return esquema.a_pandas(esquema.leer_parquet(ruta, columnas, filtros))
+
+def categoria_momento_dia(hora):
+  """
+  Devuelve la categoría de tiempo correspondiente a la hora proporcionada.
+
+  La clasificación usa los límites de intervalo de tiempo.LIMITES_MOMENTO_DIA en lugar de una
+  cadena de if/elif. Con una columna completa se clasifica todo en bloque (tiempo.momento_del_dia).
+
+  Parameters:
+    hora: La hora a clasificar (time, datetime, texto "HH:MM:SS" o una columna de ellos).
+
+  Returns:
+    La categoría de tiempo correspondiente, o None si falta la hora. Si hora es una columna,
+    las categorías de cada fila (pandas.Categorical, o pandas.Series si hora es una Series).
+  """
+  if _es_columna(hora):
+    return _como_entrada(hora, tiempo.momento_del_dia(tiempo.hora_a_segundos(hora)))
+  segundos = tiempo.valor_a_segundos(hora)
+  if segundos < 0:
+    return None
+  return tiempo.MOMENTOS_DIA[np.searchsorted(tiempo.LIMITES_MOMENTO_DIA, segundos // 3600, side="right")]
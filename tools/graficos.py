@@ -0,0 +1,711 @@
+## GRÁFICOS DEL EDA
+# Importaciones
+import matplotlib.pyplot as plt
+import pandas as pd
+import seaborn as sns
+
+import cache_figuras
+import derivadas
+import efecto
+import graficos_rapidos
+
+
+def _orden(serie):
+    # Con columnas categóricas (ver compactacion.py) seaborn dibuja todas las categorías del diccionario,
+    # en su orden; devolvemos solo las presentes en orden de aparición, como cuando la columna es texto
+    if not isinstance(serie.dtype, pd.CategoricalDtype):
+        return None
+    codigos = pd.unique(serie.cat.codes.to_numpy())
+    return list(serie.cat.categories[codigos[codigos >= 0]])
+
+
+def _conteo(serie):
+    # value_counts sobre una columna categórica incluye las categorías sin casos y desempata por el orden
+    # del diccionario; contamos como si fuera texto (las presentes, desempatando por orden de aparición)
+    if not isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie.value_counts()
+    conteo = serie.value_counts(sort=False)
+    return conteo.reindex(pd.Index(_orden(serie), name=serie.name)).sort_values(ascending=False, kind="stable")
+
+
+def _rapido(cubo=None):
+    # Con un cubo solo hay agregados: se dibuja siempre con el modo rápido (ver graficos_rapidos.py)
+    return graficos_rapidos.activo() or cubo is not None
+
+
+def _frecuencias(df, cubo, valor, grupos=()):
+    # Conteos por grupos y valor del cubo (que debe tener esas dimensiones) o en una pasada por df
+    if cubo is not None:
+        return cubo.consultar(list(grupos) + [valor])
+    return graficos_rapidos.frecuencias(df, valor, grupos)
+
+
+def _barplot(data, x, y, order=None, palette=None, ax=None):
+    # sns.barplot de datos ya agregados (una fila por barra); en el modo rápido, barras de matplotlib sin
+    # intervalos de confianza (con una fila por barra seaborn tampoco los dibuja)
+    if not graficos_rapidos.activo():
+        return sns.barplot(x=x, y=y, data=data, order=order, palette=palette, ax=ax)
+    ax = plt.gca() if ax is None else ax
+    alturas = data.set_index(x)[y]
+    if order is not None:
+        alturas = alturas.reindex(order)
+    elif pd.api.types.is_numeric_dtype(data[x]):
+        alturas = alturas.sort_index()
+    colores = graficos_rapidos.colores(palette, len(alturas)) if palette is not None \
+        else graficos_rapidos.desaturar(graficos_rapidos.color_siguiente(ax))
+    return graficos_rapidos.barras(ax, list(alturas.index), alturas.to_numpy(), colores, nombre_x=x, nombre_y=y)
+
+
+def _countplot(df, columna, ax, palette):
+    # sns.countplot; en el modo rápido, los conteos en orden de aparición dibujados con matplotlib
+    if not graficos_rapidos.activo():
+        return sns.countplot(data=df, x=columna, order=_orden(df[columna]), ax=ax, palette=palette)
+    conteo = df[columna].value_counts(sort=False)
+    if _orden(df[columna]) is not None:
+        conteo = conteo.reindex(_orden(df[columna]))
+    return graficos_rapidos.barras(ax, list(conteo.index), conteo.to_numpy(),
+                                   graficos_rapidos.colores(palette, len(conteo)), nombre_x=columna, nombre_y="count")
+
+
+@cache_figuras.con_cache("Edad")
+def distribucion_edad(df, cubo=None):
+    '''
+    Genera un gráfico con un histograma y un boxplot que muestran la distribución de la edad de los involucrados en los accidentes.
+
+    Parameters:
+        df: El conjunto de datos de accidentes.
+        cubo (CuboAgregado): Cubo de agregación con la dimensión "Edad" (ver cubo.py). Si se indica, se
+            dibuja con el modo rápido desde los conteos por edad y df puede ser None.
+
+    Returns:
+        Un gráfico con un histograma y un boxplot.
+    '''
+    # creamos una figura con un solo eje x compartido
+    fig, ax = plt.subplots(2, 1, figsize=(12, 6), sharex=True)
+    
+    # Graficamos el histograma de la edad
+    if _rapido(cubo):
+        edades = _frecuencias(df, cubo, "Edad")
+        graficos_rapidos.histograma_densidad(ax[0], edades, color="green", edgecolor="black")
+    else:
+        sns.histplot(df["Edad"], kde=True, ax=ax[0], color="green", edgecolor="black")
+    ax[0].set_title("Histograma de Edad") ; ax[0].set_ylabel("Frecuencia")
+    
+    # Graficamos el boxplot de la edad
+    if _rapido(cubo):
+        graficos_rapidos.cajas(ax[1], [graficos_rapidos.resumen_caja(edades)], [graficos_rapidos.desaturar("skyblue")],
+                               vertical=False)
+    else:
+        sns.boxplot(x=df["Edad"], ax=ax[1], color = "skyblue")
+    ax[1].set_title("Boxplot de Edad") ; ax[1].set_xlabel("Edad")
+    
+    # Ajustamos y mostramos el gráfico
+    plt.tight_layout()
+    plt.show()
+    
+@cache_figuras.con_cache("Año", "Edad")
+def distribucion_edad_por_anio(df, cubo=None):
+    '''
+    Genera un gráfico de boxplot que muestra la distribución de la edad de las víctimas de accidentes por año.
+
+    Parameters:
+        df: El conjunto de datos de accidentes.
+        cubo (CuboAgregado): Cubo de agregación con las dimensiones "Año" y "Edad" (ver cubo.py). Si se
+            indica, se dibuja con el modo rápido y df puede ser None.
+
+    Returns:
+        Un gráfico de boxplot.
+    '''
+    # Creamos el gráfico de boxplot
+    plt.figure(figsize=(12, 6))
+    if _rapido(cubo):
+        graficos_rapidos.cajas_por_grupo(plt.gca(), _frecuencias(df, cubo, "Edad", ["Año"]), "Set3", True, "Año", "Edad")
+    else:
+        sns.boxplot(x="Año", y="Edad", data=df, palette="Set3")
+    
+    plt.title("Boxplot de Edades de Víctimas por Año") ; plt.xlabel("Año") ; plt.ylabel("Edad de las Víctimas")
+     
+
+    plt.show()
+
+@cache_figuras.con_cache("Año", "Edad", "Sexo")
+def accidentes_por_anio_y_sexo(df, cubo=None):
+    '''
+    Genera un gráfico de barras que muestra la cantidad de accidentes por año y sexo.
+
+    En el modo rápido las barras son las medias calculadas desde los conteos por edad y los intervalos
+    del 95% se aproximan con la normal en lugar de remuestrear 1000 veces cada barra.
+
+    Parameters:
+        df: El conjunto de datos de accidentes.
+        cubo (CuboAgregado): Cubo de agregación con las dimensiones "Año", "Sexo" y "Edad" (ver cubo.py).
+            Si se indica, se dibuja con el modo rápido y df puede ser None.
+
+    Returns:
+        Un gráfico de barras.
+    '''
+    # Creamos el gráfico de barras
+    plt.figure(figsize=(12, 4))
+    if _rapido(cubo):
+        graficos_rapidos.medias_por_grupo(plt.gca(), _frecuencias(df, cubo, "Edad", ["Año", "Sexo"]), "coolwarm",
+                                          "Año", "Edad")
+    else:
+        sns.barplot(x="Año", y="Edad", hue="Sexo", data=df, hue_order=_orden(df["Sexo"]), palette="coolwarm")
+    
+    plt.title("Accidentes por Año y Sexo")
+    plt.xlabel("Año") ; plt.ylabel("Edad de las víctimas") ; plt.legend(title="Sexo")
+    
+    plt.show()
+    
+@cache_figuras.con_cache("Año", "Sexo", "Edad")
+def cohen_por_año(df, remuestreos=0, semilla=0):
+    '''
+    Calcula el tamaño del efecto de la d de Cohen para dos grupos para los años del Dataframe.
+
+    Los momentos de cada año se calculan en una sola pasada agrupada (ver efecto.py). Si se
+    indican remuestreos, se grafican además los intervalos de confianza del 95% por bootstrap.
+
+    Parameters:
+        df (pandas.DataFrame): El DataFrame que se va a analizar.
+        remuestreos (int): Cantidad de remuestreos bootstrap. Con 0 no se calculan intervalos.
+        semilla (int): Semilla del generador aleatorio del bootstrap.
+
+    Returns:
+        El tamaño del efecto de la d de Cohen.
+    '''
+    # Calculamos Cohen para todos los años de una vez (MASCULINO frente a FEMENINO)
+    cohen_df = efecto.cohen_por_grupo(df, grupo="Año", comparar="Sexo", niveles=("MASCULINO", "FEMENINO"),
+                                      valor="Edad", remuestreos=remuestreos, semilla=semilla)
+    
+    # Se grafica los valores de Cohen para los años
+    plt.figure(figsize=(8, 4))
+    if remuestreos:
+        errores = [cohen_df["Estadistico de Cohen"] - cohen_df["Inferior"], cohen_df["Superior"] - cohen_df["Estadistico de Cohen"]]
+        plt.bar(cohen_df["Año"], cohen_df['Estadistico de Cohen'], color="LightSalmon", yerr=errores, capsize=4)
+    else:
+        plt.bar(cohen_df["Año"], cohen_df['Estadistico de Cohen'], color="LightSalmon")
+    plt.xlabel("Año") ; plt.ylabel("Estadístico de Cohen") ; plt.title("Estadístico de Cohen por Año")
+    plt.xticks(cohen_df["Año"])
+    plt.show()
+
+    return cohen_df
+
+@cache_figuras.con_cache("Rol", "Edad")
+def edad_y_rol_victimas(df, cubo=None):
+    '''
+    Genera un gráfico de la distribución de la edad de las víctimas por rol.
+
+    Parameters:
+        df (pandas.DataFrame): El DataFrame que se va a analizar.
+        cubo (CuboAgregado): Cubo de agregación con las dimensiones "Rol" y "Edad" (ver cubo.py). Si se
+            indica, se dibuja con el modo rápido y df puede ser None.
+
+    Returns:
+        None
+    '''
+    plt.figure(figsize=(8, 4))
+    if _rapido(cubo):
+        graficos_rapidos.cajas_por_grupo(plt.gca(), _frecuencias(df, cubo, "Edad", ["Rol"]), "tab20", False, "Edad", "Rol")
+    else:
+        sns.boxplot(y="Rol", x="Edad", data=df, order=_orden(df["Rol"]), palette="tab20")
+    plt.title("Edades por Condición")
+    plt.show()
+    
+@cache_figuras.con_cache("Víctima", "Edad")
+def distribucion_edad_por_victima(df, cubo=None):
+    '''
+    Genera un gráfico de la distribución de la edad de las víctimas por tipo de vehículo.
+
+    Parameters:
+        df (pandas.DataFrame): El DataFrame que se va a analizar.
+        cubo (CuboAgregado): Cubo de agregación con las dimensiones "Víctima" y "Edad" (ver cubo.py). Si
+            se indica, se dibuja con el modo rápido y df puede ser None.
+
+    Returns:
+        None
+    '''
+    # Creamos el gráfico de boxplot
+    plt.figure(figsize=(14, 6))
+    if _rapido(cubo):
+        graficos_rapidos.cajas_por_grupo(plt.gca(), _frecuencias(df, cubo, "Edad", ["Víctima"]), "Set2", True, "Víctima",
+                                         "Edad")
+    else:
+        sns.boxplot(x="Víctima", y="Edad", data=df, order=_orden(df["Víctima"]), palette = "Set2")
+    
+    plt.title("Vehículo usado en relación a la edad de la víctima") ; plt.xlabel("Tipo de vehiculo") ; plt.ylabel("Edad")
+     
+    plt.show()
+    
+def _contar_categorias(serie, columnas):
+    # Conteo ordenado por cantidad, sin categorías vacías y con etiquetas de texto
+    data = serie.value_counts().reset_index()
+    data.columns = columnas
+    return data[data[columnas[1]] > 0].astype({columnas[0]: str}).reset_index(drop=True)
+
+@cache_figuras.con_cache("Fecha", "Día semana", "Tipo de día")
+def cant_accidentes_sexo(df):
+    '''
+    Produce un resumen de la cantidad de accidentes por sexo de los conductores.
+
+    Esta función acepta un DataFrame como entrada y produce un resumen que abarca:
+
+    * Un gráfico de barras que representa la cantidad de accidentes por sexo de los conductores en orden descendente.
+    * Un DataFrame que exhibe la cantidad y el porcentaje de accidentes por sexo de los conductores.
+
+    Parámetros:
+        df (pandas.DataFrame): El DataFrame que se analizará.
+
+    Retorna:
+        None
+    '''
+    # Leemos el tipo de día materializado (o lo calculamos sin modificar df)
+    tipo_dia = derivadas.obtener_derivada(df, "Tipo de día")
+    
+    # Contamos la cantidad de accidentes por tipo de día
+    data = _contar_categorias(tipo_dia, ["Tipo de día", "Cantidad de accidentes"])
+    
+    # Creamos el gráfico de barras
+    plt.figure(figsize=(6, 4))
+    ax = _barplot(data, "Tipo de día", "Cantidad de accidentes")
+    
+    ax.set_title("Cantidad de accidentes por tipo de día") ; ax.set_xlabel("Tipo de día") ; ax.set_ylabel("Cantidad de accidentes")
+    
+    # Agregamos las cantidades en las barras
+    for index, row in data.iterrows():
+        ax.annotate(f'{row["Cantidad de accidentes"]}', (index, row["Cantidad de accidentes"]), ha="center", va="bottom")
+    
+    plt.show()
+
+@cache_figuras.con_cache("Sexo", "Rol", "Víctima")
+def victimas_sexo_rol_victima(df, cubo=None):
+    '''
+    Produce un resumen de la cantidad de víctimas por sexo, rol y tipo de vehículo en un accidente de tráfico.
+
+    Esta función acepta un DataFrame como entrada y genera un resumen que incluye:
+
+    * Gráficos de barras que presentan la cantidad de víctimas por sexo, rol y tipo de vehículo en orden descendente.
+    * DataFrames que muestran la cantidad y el porcentaje de víctimas por sexo, rol y tipo de vehículo.
+
+    Parámetros:
+        df (pandas.DataFrame): El DataFrame que será objeto de análisis.
+        cubo (CuboAgregado): Cubo de agregación (ver cubo.py). Si se indica, los conteos se leen del
+            cubo en lugar de recorrer df, que puede ser None.
+
+    Retorna:
+        None
+    '''
+    # Obtenemos los conteos del cubo o, si no se indica, agrupando el DataFrame
+    if cubo is not None:
+        por_sexo = cubo.consultar(["Sexo"])
+        df_rol = cubo.consultar(["Rol", "Sexo"]).unstack(fill_value=0)
+        df_victima = cubo.consultar(["Víctima", "Sexo"]).unstack(fill_value=0)
+    else:
+        por_sexo = df["Sexo"].value_counts(sort=False)
+        if _orden(df["Sexo"]) is not None:
+            por_sexo = por_sexo.reindex(_orden(df["Sexo"]))
+        df_rol = df.groupby(["Rol", "Sexo"]).size().unstack(fill_value=0)
+        df_victima = df.groupby(["Víctima", "Sexo"]).size().unstack(fill_value=0)
+
+    nuevos_colores = ["dodgerblue", "y"]
+    sns.set_palette(sns.color_palette(nuevos_colores))
+    # Creamos el gráfico
+    fig, axes = plt.subplots(1, 3, figsize=(15, 4))
+
+    # Gráfico 1: Sexo
+    if graficos_rapidos.activo():
+        graficos_rapidos.barras(axes[0], list(por_sexo.index.astype(str)), por_sexo.to_numpy(),
+                                graficos_rapidos.desaturar(graficos_rapidos.color_siguiente(axes[0])))
+    else:
+        sns.barplot(x=por_sexo.index.astype(str), y=por_sexo.to_numpy(), ax=axes[0])
+    axes[0].set_xlabel("Sexo")
+    axes[0].set_title("Víctimas por sexo") ; axes[0].set_ylabel("Cantidad de víctimas")
+
+    # Definimos una paleta de colores personalizada (invierte los colores)
+    colores_por_defecto = sns.color_palette()
+    colores_invertidos = [colores_por_defecto[1], colores_por_defecto[0]]
+    
+    # Gráfico 2: Rol
+    df_rol.plot(kind="bar", stacked=True, ax=axes[1], color=colores_invertidos)
+    axes[1].set_title("Víctimas por rol") ; axes[1].set_ylabel("Cantidad de víctimas") ; axes[1].tick_params(axis='x', rotation=45)
+    axes[1].legend().set_visible(False)
+    
+    # Gráfico 3: Tipo de vehículo
+    df_victima.plot(kind="bar", stacked=True, ax=axes[2], color=colores_invertidos)
+    axes[2].set_title("Víctimas por tipo de vehículo") ; axes[2].set_ylabel("Cantidad de víctimas") ; axes[2].tick_params(axis='x', rotation=45)
+    axes[2].legend().set_visible(False)
+
+
+    plt.show()
+    
+
+@cache_figuras.con_cache("Participantes")
+def victimas_participantes(df):
+    '''
+    Produce un resumen de la cantidad de víctimas por número de participantes en un accidente de tráfico.
+
+    Esta función toma un DataFrame como entrada y genera un resumen que incluye:
+
+    * Un gráfico de barras que representa la cantidad de víctimas por número de participantes en orden descendente.
+    * Un DataFrame que exhibe la cantidad y el porcentaje de víctimas por número de participantes.
+
+    Parámetros:
+        df (pandas.DataFrame): El DataFrame que se analizará.
+
+    Retorna:
+        None
+    '''
+    # Ordenamos los datos por "Participantes" en orden descendente por cantidad
+    ordenado = _conteo(df["Participantes"]).reset_index()
+    ordenado = ordenado.rename(columns={"Cantidad": "Participantes"})
+    ordenado = ordenado.sort_values(by="count", ascending=False)
+    
+    plt.figure(figsize=(15, 4))
+    
+    # Creamos el gráfico de barras
+    ax = _barplot(ordenado, "Participantes", "count", order=ordenado["Participantes"], palette="Set3")
+    ax.set_title("Víctimas por participantes")
+    ax.set_ylabel("Cantidad de víctimas")
+    # Rotamos las etiquetas del eje x a 45 grados
+    ax.set_xticklabels(ax.get_xticklabels(), rotation=45, horizontalalignment="right")
+
+    plt.show()
+    
+    
+@cache_figuras.con_cache("Acusado")
+def cantidad_acusados(df):
+    '''
+    Produce un resumen de la cantidad de acusados en un accidente de tráfico.
+
+    Esta función toma un DataFrame como entrada y genera un resumen que abarca:
+
+    * Un gráfico de barras que presenta la cantidad de acusados en orden descendente.
+    * Un DataFrame que exhibe la cantidad y el porcentaje de acusados.
+
+    Parámetros:
+        df (pandas.DataFrame): El DataFrame que será objeto de análisis.
+
+    Retorna:
+        None
+    '''
+    # Ordenamos los datos por 'Participantes' en orden descendente por cantidad
+    ordenado = _conteo(df["Acusado"]).reset_index()
+    ordenado = ordenado.rename(columns={"Cantidad": "Acusado"})
+    ordenado = ordenado.sort_values(by="count", ascending=False)
+    
+    plt.figure(figsize=(15, 4))
+    
+    # Creamos el gráfico de barras
+    ax = _barplot(ordenado, "Acusado", "count", order=ordenado["Acusado"])
+    ax.set_title("Cantidad de acusados en los hechos") ; ax.set_ylabel("Cantidad de acusados") 
+    ax.set_xticklabels(ax.get_xticklabels(), rotation=45, horizontalalignment="right")
+
+    
+    plt.show()
+    
+
+@cache_figuras.con_cache("Tipo de calle", "Cruce")
+def tipo_de_calle(df):
+    '''
+    Produce un resumen de los accidentes de tráfico por tipo de calle y cruce.
+
+    Esta función toma un DataFrame como entrada y genera un resumen que abarca:
+
+    * Un gráfico de barras que exhibe la cantidad de víctimas por tipo de calle.
+    * Un gráfico de barras que muestra la cantidad de víctimas en cruces.
+    * Un DataFrame que presenta la cantidad y el porcentaje de víctimas por tipo de calle.
+    * Un DataFrame que muestra la cantidad y el porcentaje de víctimas en cruces.
+
+    Parámetros:
+        df (pandas.DataFrame): El DataFrame que será objeto de análisis.
+
+    Retorna:
+        None
+    '''
+    # Creamos el gráfico
+    fig, axes = plt.subplots(1, 2, figsize=(10, 4))
+
+    _countplot(df, "Tipo de calle", axes[0], "Set2")
+    axes[0].set_title("Víctimas por tipo de calle") ; axes[0].set_ylabel("Cantidad de víctimas")
+
+    _countplot(df, "Cruce", axes[1], "Set2")
+    axes[1].set_title("Víctimas en cruces") ; axes[1].set_ylabel("Cantidad de víctimas")
+    
+    plt.show()
+    
+    
+
+@cache_figuras.con_cache("Año", "Mes", "Cantidad víctimas")
+def accidentes_mensuales(df, cubo=None):
+    '''
+    Genera gráficos de línea que muestran la cantidad de víctimas de accidentes mensuales por año.
+
+    Esta función toma un DataFrame que incluye datos de accidentes, identifica los años únicos
+    presentes en la columna 'Año', y produce gráficos de línea para visualizar la cantidad de víctimas
+     por mes en cada año. Los gráficos se organizan en una cuadrícula de subgráficos de 2x3.
+
+    Parámetros:
+        df (pandas.DataFrame): El DataFrame que contiene los datos de accidentes, con una columna "Año".
+        cubo (CuboAgregado): Cubo de agregación (ver cubo.py). Si se indica, los conteos se leen del
+            cubo en lugar de recorrer df, que puede ser None.
+
+    Retorna:
+    None
+    '''
+    # Sumamos las víctimas por año y mes (del cubo o agrupando el DataFrame una sola vez)
+    if cubo is not None:
+        mensual = cubo.consultar(["Año", "Mes"], "Cantidad víctimas")
+    else:
+        mensual = df.groupby(["Año", "Mes"])["Cantidad víctimas"].sum()
+
+    # Obtenemos una lista de años únicos
+    años = mensual.index.unique(level="Año")
+
+    # Definimos el número de filas y columnas para la cuadrícula de subgráficos
+    n_filas = 3
+    n_columnas = 2
+
+    # Creamos una figura con subgráficos en una cuadrícula de 2x3
+    fig, axes = plt.subplots(n_filas, n_columnas, figsize=(14, 8))
+
+    # Iteramos a través de los años y creamos un gráfico por año
+    for i, year in enumerate(años):
+        fila = i // n_columnas
+        columna = i % n_columnas
+            
+        # Seleccionamos los meses del año actual
+        data_mensual = mensual.loc[year].to_frame("Cantidad víctimas")
+            
+        # Configuramos el subgráfico actual
+        ax = axes[fila, columna]
+        data_mensual.plot(ax=ax, kind="bar")
+        ax.set_title("Año " + str(year)) ; ax.set_xlabel("Mes") ; ax.set_ylabel("Cantidad de Víctimas")
+        ax.legend_ = None
+            
+    # Mostramos y acomodamos el gráfico
+    plt.tight_layout()
+    plt.show()
+
+@cache_figuras.con_cache("Mes", "Cantidad víctimas")
+def victimas_mensuales(df, cubo=None):
+    '''
+    Genera un gráfico de barras que exhibe la cantidad de víctimas de accidentes por mes.
+
+    Esta función toma un DataFrame con información de accidentes, agrupa los datos por mes,
+    y calcula la suma total de víctimas por mes. Posteriormente, crea un gráfico de barras que
+    representa la cantidad de víctimas para cada mes.
+
+    Parámetros:
+        df (pandas.DataFrame): El DataFrame que contiene los datos de accidentes con una columna 'Mes'.
+        cubo (CuboAgregado): Cubo de agregación (ver cubo.py). Si se indica, los conteos se leen del
+            cubo en lugar de recorrer df, que puede ser None.
+
+    Retorna:
+        None
+    '''
+    # Agrupamos por la cantidad de víctimas por mes
+    if cubo is not None:
+        data = cubo.consultar(["Mes"], "Cantidad víctimas").reset_index()
+    else:
+        data = df.groupby("Mes").agg({"Cantidad víctimas":"sum"}).reset_index()
+    
+    plt.figure(figsize=(6,4))
+    ax = _barplot(data, "Mes", "Cantidad víctimas", palette="Set2")
+    ax.set_title("Cantidad de víctimas mensuales")
+    ax.set_xlabel("Mes") ; ax.set_ylabel("Cantidad de accidentes")
+    
+    
+    print(f"El mes con menor cantidad de víctimas tiene {data['Cantidad víctimas'].min()} víctimas")
+    print(f"El mes con mayor cantidad de víctimas tiene {data['Cantidad víctimas'].max()} víctimas")
+    
+    plt.show()
+
+@cache_figuras.con_cache("Fecha", "Día semana", "Nombre día", "Cantidad víctimas")
+def victimas_por_dia_semana(df, cubo=None):
+    '''
+    Genera un gráfico de barras que ilustra la cantidad de víctimas de accidentes por día de la semana.
+
+    Esta función toma un DataFrame que incluye datos de accidentes y obtiene el nombre del día de la semana
+    desde las variables derivadas (si no están materializadas se calculan a partir de 'Fecha' sin modificar
+    el DataFrame). Luego suma la cantidad de víctimas por día de la semana y crea un gráfico de barras que
+    muestra la cantidad de víctimas para cada día de la semana.
+
+    Parámetros:
+        df (pandas.DataFrame): El DataFrame que contiene los datos de accidentes con una columna 'Fecha'.
+        cubo (CuboAgregado): Cubo de agregación (ver cubo.py). Si se indica, las sumas se leen del
+            cubo en lugar de recorrer df, que puede ser None.
+
+    Retorna:
+        None
+    '''
+    dias_semana = derivadas.DIAS_SEMANA
+
+    # Sumamos las víctimas por día de la semana (del cubo o agrupando el DataFrame)
+    if cubo is not None:
+        por_dia = cubo.consultar(["Día semana"], "Cantidad víctimas")
+        por_dia = por_dia[por_dia.index >= 0]
+        data = pd.DataFrame({"Nombre día": [dias_semana[dia] for dia in por_dia.index],
+                             "Cantidad víctimas": por_dia.to_numpy()})
+    else:
+        # Leemos el nombre del día materializado (o lo calculamos sin modificar df)
+        nombre_dia = derivadas.obtener_derivada(df, "Nombre día")
+        data = (df["Cantidad víctimas"].groupby(nombre_dia.rename("Nombre día"), observed=True)
+                .sum().reset_index().astype({"Nombre día": str}))
+      
+    # Creamos el gráfico de barras
+    plt.figure(figsize=(6, 3))
+    ax = _barplot(data, "Nombre día", "Cantidad víctimas", order=dias_semana, palette="Set3")
+    
+    ax.set_title("Accidentes por Día de la Semana") ; ax.set_xlabel("Día de la Semana") ; ax.set_ylabel("Cantidad de Accidentes")
+    plt.xticks(rotation=45)
+    
+    # Mostramos el resumen de los datos
+    minimo, maximo = data["Cantidad víctimas"].min(), data["Cantidad víctimas"].max()
+    print(f"El día de la semana con menor cantidad de víctimas tiene {minimo} víctimas")
+    print(f"El día de la semana con mayor cantidad de víctimas tiene {maximo} víctimas")
+    print(f"La diferencia porcentual es de {round((maximo - minimo) / minimo * 100,2)}")
+    
+
+    plt.show()
+
+@cache_figuras.con_cache("Hora", "Hora del día", "Categoria tiempo")
+def accidentes_por_tiempo_del_dia(df):
+    '''
+    Calcula la cantidad de accidentes por categoría de tiempo y visualiza un gráfico de barras.
+
+    Esta función toma un DataFrame con una columna 'Hora' y obtiene la variable derivada 'Categoria tiempo'
+    (sin agregarla al DataFrame si no está materializada). Posteriormente, cuenta la cantidad de accidentes para cada
+    categoría de tiempo, calcula los porcentajes y genera un gráfico de barras que ilustra la distribución
+    de accidentes por categoría de tiempo.
+
+    Parámetros:
+        df (pandas.DataFrame): El DataFrame que contiene la información de los accidentes.
+
+    Retorna:
+        None
+    '''
+    # Leemos el momento del día materializado (o lo calculamos sin modificar df)
+    categoria_tiempo = derivadas.obtener_derivada(df, "Categoria tiempo")
+
+    # Contamos la cantidad de accidentes por categoría de tiempo
+    data = _contar_categorias(categoria_tiempo, ["Categoria tiempo", "Cantidad accidentes"])
+
+    # Calculamos los porcentajes
+    total_accidentes = data["Cantidad accidentes"].sum()
+    data["Porcentaje"] = (data["Cantidad accidentes"] / total_accidentes) * 100
+    
+    # Creamos el gráfico de barras
+    plt.figure(figsize=(8, 6))
+    ax = _barplot(data, "Categoria tiempo", "Cantidad accidentes", palette="YlGn")
+
+    ax.set_title("Accidentes por Momento del Día") ; ax.set_xlabel("Momento del día") ; ax.set_ylabel("Cantidad")
+
+    # Agregamos las cantidades en las barras
+    for index, row in data.iterrows():
+        ax.annotate(f'{row["Cantidad accidentes"]}', (index, row["Cantidad accidentes"]), ha="center", va="bottom")
+
+    
+    plt.show()
+
+@cache_figuras.con_cache("Hora", "Hora del día")
+def accidentes_por_horas_del_dia(df, cubo=None):
+    '''
+    Genera un gráfico de barras que muestra la cantidad de accidentes por hora del día.
+
+    Parameters:
+        df: El conjunto de datos de accidentes.
+        cubo (CuboAgregado): Cubo de agregación (ver cubo.py). Si se indica, los conteos se leen del
+            cubo en lugar de recorrer df, que puede ser None.
+
+    Returns:
+        Un gráfico de barras.
+    '''
+    # Contamos la cantidad de accidentes por hora del día (del cubo o de la variable derivada; -1 si falta el dato)
+    if cubo is not None:
+        por_hora = cubo.consultar(["Hora del día"])
+        data = por_hora[por_hora.index >= 0].reset_index()
+    else:
+        # Leemos la hora del día materializada (o la calculamos sin modificar df)
+        hora_del_dia = derivadas.obtener_derivada(df, "Hora del día")
+        data = hora_del_dia[hora_del_dia >= 0].value_counts().reset_index()
+    data.columns = ["Hora del día", "Cantidad de accidentes"]
+
+    # Ordenamos los datos por hora del día
+    data = data.sort_values(by="Hora del día")
+
+    # Creamos el gráfico de barras
+    plt.figure(figsize=(15, 6))
+    ax = _barplot(data, "Hora del día", "Cantidad de accidentes", palette="Set3")
+
+    ax.set_title("Accidentes por Hora del Día") ; ax.set_xlabel("Hora del día") ; ax.set_ylabel("Cantidad de accidentes")
+
+    # Se agrega las cantidades en las barras
+    for index, row in data.iterrows():
+        ax.annotate(f'{row["Cantidad de accidentes"]}', (row["Hora del día"], row["Cantidad de accidentes"]), ha="center", va="bottom")
+
+    # Se muestra el gráfico
+    plt.show()
+
+@cache_figuras.con_cache("Fecha", "Día semana", "Tipo de día")
+def accidentes_fin_de_semana(df):
+    '''
+    Genera un gráfico de barras que muestra la cantidad de accidentes por tipo de día (semana o fin de semana).
+
+    Parameters:
+        df: El conjunto de datos de accidentes.
+
+    Returns:
+        Un gráfico de barras.
+    '''
+    # Leemos el tipo de día materializado (o lo calculamos sin modificar df)
+    tipo_dia = derivadas.obtener_derivada(df, "Tipo de día")
+    
+    # Contamos la cantidad de accidentes por tipo de día
+    data = _contar_categorias(tipo_dia, ["Tipo de día", "Cantidad de accidentes"])
+    
+    # Creamos el gráfico de barras
+    plt.figure(figsize=(6, 4))
+    ax = _barplot(data, "Tipo de día", "Cantidad de accidentes", palette="RdBu")
+    
+    ax.set_title("Accidentes por tipo de día") ; ax.set_xlabel("Tipo de día") ; ax.set_ylabel("Cantidad")
+    
+    # Agregamos las cantidades en las barras
+    for index, row in data.iterrows():
+        ax.annotate(f'{row["Cantidad de accidentes"]}', (index, row["Cantidad de accidentes"]), ha='center', va='bottom')
+    
+    plt.show()
+
+@cache_figuras.con_cache("Pos x", "Pos y")
+def mapa_densidad(df, indice=None, ancho_banda=200):
+    '''
+    Genera un mapa de calor con la densidad de víctimas estimada sobre las coordenadas de los hechos.
+
+    Las filas sin coordenadas (0 en "Pos x" y "Pos y") o fuera de la caja de CABA se excluyen y se
+    informa cuántas son.
+
+    Parámetros:
+        df (pandas.DataFrame): El DataFrame con las columnas 'Pos x' y 'Pos y'.
+        indice (IndiceEspacial): Índice espacial ya construido (ver espacial.py). Si se indica, df
+            puede ser None.
+        ancho_banda (float): Desvío del núcleo gaussiano, en metros.
+
+    Retorna:
+        pandas.DataFrame: Las 10 celdas con mayor densidad.
+    '''
+    import espacial
+
+    if indice is None:
+        indice = espacial.IndiceEspacial.desde_dataframe(df)
+    densidad = indice.densidad(ancho_banda)
+    lon, lat = indice.centros()
+
+    plt.figure(figsize=(7, 7))
+    plt.imshow(densidad, origin="lower", cmap="magma",
+               extent=[lon.min(), lon.max(), lat.min(), lat.max()], aspect="auto")
+    plt.colorbar(label="Víctimas por km²")
+    plt.title("Densidad de víctimas") ; plt.xlabel("Longitud") ; plt.ylabel("Latitud")
+
+    print(f"Se excluyeron {indice.sin_coordenadas} víctimas sin coordenadas o fuera de CABA")
+
+    plt.show()
+
+    return indice.puntos_calientes(10, ancho_banda)